@@ -1,27 +1,51 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import contextlib
+import glob
 import hashlib
 import io
 import json
 import logging
 import pathlib as Path
 import re
+import threading
 import time
+from functools import partial
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from typing import Iterator
+from urllib.parse import urlsplit
 
+# Optional source drivers — each guarded on its own so one missing package
+# does not disable the others.
 with contextlib.suppress(ImportError):
     import boto3
+with contextlib.suppress(ImportError):
     import requests
-    import kafka
+with contextlib.suppress(ImportError):
     import gspread
+with contextlib.suppress(ImportError):
     from sqlalchemy import create_engine
+with contextlib.suppress(ImportError):
     from pymongo import MongoClient
+with contextlib.suppress(ImportError):
     import paho.mqtt.client as mqtt
-    from datetime import datetime
+with contextlib.suppress(ImportError):
     import great_expectations as ge
 
+from .excel_cache import ExcelParquetCache
+from .ge_validation import VALIDATION_MODES, get_suite_runner
+from .ingest_cache import IngestCache, source_fingerprint, source_id
+from .kafka_reader import KafkaBatchReader
+from .micro_batch import MicroBatcher
+from .rest_reader import RestPaginator
+from .schema_registry import SchemaRegistry
+
+with contextlib.suppress(ImportError):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
 # ─── Logging & Directories ─────────────────────────────────────────────────────
 LOG_DIR = Path.Path("logs")
 REPORT_DIR = Path.Path("reports/profiling")
@@ -41,6 +65,13 @@ log = logging.getLogger("collector")
 EMAIL_PATTERN = re.compile(
     r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
 PHONE_PATTERN = re.compile(r"\b\d{10,}\b")
+# Combined screen: one pass tells which cells contain any PII at all.
+PII_PATTERN = re.compile(
+    f"(?:{EMAIL_PATTERN.pattern})|(?:{PHONE_PATTERN.pattern})")
+# Fan string columns out over a process pool only for wide *and* big frames;
+# below that, worker start-up and pickling cost more than the regex work.
+PII_PARALLEL_MIN_COLS = 32
+PII_PARALLEL_MIN_CELLS = 2_000_000
 
 # ─── Supported File Suffixes ───────────────────────────────────────────────────
 SUPPORTED_SUFFIXES = {
@@ -53,37 +84,602 @@ SUPPORTED_SUFFIXES = {
 }
 
 
-def _audit_checksum(df: pd.DataFrame, source: str) -> None:
+_MASK64 = (1 << 64) - 1
+
+
+class RowHashAudit:
+    """
+    Mergeable ingestion audit built from ONE row-hashing pass
+    (pd.util.hash_pandas_object → uint64 per row). Tracks:
+      - checksum    : order-sensitive (polynomial rolling hash over row hashes)
+      - fingerprint : order-insensitive (sum of row hashes mod 2**64)
+      - duplicates  : duplicate-row count across everything seen so far
+    update(df) appends a chunk; merge(other) appends another audit's rows
+    after ours, so per-chunk / per-file audits combine exactly.
+    """
+    BASE = 0x100000001B3  # 64-bit FNV prime
+    COMPACT_EVERY = 32    # fold pending hash parts into one sorted array
+
+    def __init__(self):
+        self.rows = 0
+        self.columns: list[str] | None = None
+        self._ordered = 0         # Σ h_i · BASE^(rows-1-i)  mod 2**64
+        self._shift = 1           # BASE^rows                mod 2**64
+        self._unordered = 0       # Σ h_i                    mod 2**64
+        self._dups = 0            # duplicates already folded into _parts[0]
+        self._parts: list[np.ndarray] = []
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "RowHashAudit":
+        audit = cls()
+        audit.update(df)
+        return audit
+
+    def update(self, df: pd.DataFrame) -> "RowHashAudit":
+        if self.columns is None:
+            self.columns = [str(c) for c in df.columns]
+        h = pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+        n = len(h)
+        if n:
+            # BASE^(n-1-i) for i = 0..n-1 (uint64 arithmetic wraps mod 2**64)
+            powers = np.cumprod(np.full(n, self.BASE, dtype=np.uint64))
+            powers = np.concatenate(([np.uint64(1)], powers[:-1]))[::-1]
+            part_ordered = int((h * powers).sum(dtype=np.uint64))
+            part_shift = int(powers[0]) * self.BASE & _MASK64
+            self._ordered = (self._ordered * part_shift + part_ordered) & _MASK64
+            self._shift = self._shift * part_shift & _MASK64
+            self._unordered = (self._unordered + int(h.sum(dtype=np.uint64))) & _MASK64
+            self._parts.append(h)
+            self.rows += n
+            if len(self._parts) > self.COMPACT_EVERY:
+                self._compact()
+        return self
+
+    def merge(self, other: "RowHashAudit") -> "RowHashAudit":
+        if self.columns is None:
+            self.columns = other.columns
+        self._ordered = (self._ordered * other._shift + other._ordered) & _MASK64
+        self._shift = self._shift * other._shift & _MASK64
+        self._unordered = (self._unordered + other._unordered) & _MASK64
+        self._dups += other._dups
+        self._parts.extend(other._parts)
+        self.rows += other.rows
+        self._compact()
+        return self
+
+    def _compact(self) -> None:
+        if not self._parts:
+            return
+        hashes = np.concatenate(self._parts)
+        unique = np.unique(hashes)
+        self._dups += len(hashes) - len(unique)
+        self._parts = [unique]
+
+    @property
+    def duplicates(self) -> int:
+        self._compact()
+        return self._dups
+
+    @property
+    def checksum(self) -> str:
+        """Short SHA256 over header, row count and the ordered row hash."""
+        header = ",".join(self.columns or [])
+        token = f"{header}|{self.rows}|{self._ordered:016x}"
+        return hashlib.sha256(token.encode()).hexdigest()[:12]
+
+    @property
+    def fingerprint(self) -> str:
+        """Content fingerprint that ignores row order."""
+        return f"{self._unordered:016x}"
+
+    @property
+    def summary(self) -> dict:
+        """Plain-dict form of the audit (what the audit log line reports)."""
+        return {"rows": self.rows, "duplicates": self.duplicates,
+                "sha256": self.checksum, "fingerprint": self.fingerprint}
+
+
+def _audit_checksum(df: pd.DataFrame | RowHashAudit, source: str) -> RowHashAudit:
     """
-    Compute a short SHA256 checksum of the DataFrame (csv string),
-    and log row count + checksum.
+    Row-hash the DataFrame once (or reuse a finished RowHashAudit) and log
+    duplicates + row count + checksum + content fingerprint.
     """
-    sha256 = hashlib.sha256(df.to_csv(index=False).encode()).hexdigest()[:12]
-    log.info(f"{source:15} | rows={len(df):7,} | sha256={sha256}")
+    audit = df if isinstance(df, RowHashAudit) else RowHashAudit.from_frame(df)
+    _log_duplicates(source, audit.duplicates)
+    _log_audit(source, audit.rows, audit.checksum, audit.fingerprint)
+    return audit
 
 
-def _mask_pii(df: pd.DataFrame) -> pd.DataFrame:
+def _log_audit_summary(source: str, summary: dict) -> None:
+    """Re-log a stored RowHashAudit.summary (e.g. on an ingest-cache hit)."""
+    _log_duplicates(source, summary["duplicates"])
+    _log_audit(source, summary["rows"], summary["sha256"], summary["fingerprint"])
+
+
+def _log_audit(source: str, rows: int, sha256: str, fingerprint: str) -> None:
+    """
+    Single audit log line shared by the batch and the streaming paths.
+    """
+    log.info(f"{source:15} | rows={rows:7,} | sha256={sha256} | fingerprint={fingerprint}")
+
+
+def _log_duplicates(source: str, dup_count: int) -> None:
+    if dup_count:
+        log.warning(
+            f"{source:15} | duplicates={dup_count} rows (logged, not dropped).")
+
+
+# ─── Projection / Predicate Pushdown ───────────────────────────────────────────
+_FILTER_OPS = {
+    "=": lambda s, v: s == v,
+    "==": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    "<": lambda s, v: s < v,
+    "<=": lambda s, v: s <= v,
+    ">": lambda s, v: s > v,
+    ">=": lambda s, v: s >= v,
+    "in": lambda s, v: s.isin(v),
+    "not in": lambda s, v: ~s.isin(v),
+}
+
+
+def _dnf(filters) -> list[list[tuple]]:
+    """Normalise pyarrow-style filters (AND list or OR-of-AND lists) to DNF."""
+    if not filters:
+        return []
+    if not isinstance(filters, list):
+        raise ValueError(
+            "Only list-of-tuples filters are supported for non-Parquet files.")
+    return [filters] if isinstance(filters[0], tuple) else filters
+
+
+def _filter_columns(filters) -> list[str]:
+    return list(dict.fromkeys(col for conj in _dnf(filters) for col, _, _ in conj))
+
+
+def _apply_filters(df: pd.DataFrame, filters=None,
+                   columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Row filter + projection for formats without native pushdown (CSV/TSV/
+    Excel), using the same DNF filter syntax as pyarrow.
+    """
+    if filters:
+        mask = np.zeros(len(df), dtype=bool)
+        for conj in _dnf(filters):
+            keep = np.ones(len(df), dtype=bool)
+            for col, op, val in conj:
+                if op not in _FILTER_OPS:
+                    raise ValueError(f"Unsupported filter operator: {op}")
+                keep &= _FILTER_OPS[op](df[col], val).to_numpy(dtype=bool)
+            mask |= keep
+        df = df[mask].reset_index(drop=True)
+    return df[columns] if columns is not None else df
+
+
+def _read_columns(columns: list[str] | None, filters) -> list[str] | None:
+    """Columns a non-Parquet reader must load to evaluate `filters` too."""
+    if columns is None:
+        return None
+    return list(dict.fromkeys([*columns, *_filter_columns(filters)]))
+
+
+def _read_parquet(source, columns: list[str] | None = None, filters=None,
+                  filesystem=None) -> pd.DataFrame:
+    """
+    Parquet through pyarrow with projection + predicate pushdown: only the
+    requested column chunks of row groups whose statistics can match
+    `filters` are fetched and decoded. `source` may be a local path, an
+    s3:// URI (filesystem inferred) or a file-like object.
+    """
+    import pyarrow.parquet as pq
+    return pq.read_table(source, columns=columns, filters=filters,
+                         filesystem=filesystem).to_pandas()
+
+
+def _iter_parquet(path: str, chunk_rows: int, columns: list[str] | None = None,
+                  filters=None, filesystem=None) -> Iterator[pd.DataFrame]:
+    """Batch-wise Parquet scan (pyarrow dataset) with the same pushdown."""
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    if isinstance(filters, list):
+        filters = pq.filters_to_expression(filters) if filters else None
+    dataset = ds.dataset(path, format="parquet", filesystem=filesystem)
+    for batch in dataset.to_batches(columns=columns, filter=filters,
+                                    batch_size=chunk_rows):
+        yield batch.to_pandas()
+
+
+def _to_arrow(df: pd.DataFrame) -> "pa.Table":
+    """pandas → Arrow; object columns with mixed types are stringified."""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        mixed = {c: "string" for c in df.columns
+                 if pd.api.types.is_object_dtype(df[c])}
+        return pa.Table.from_pandas(df.astype(mixed), preserve_index=False)
+
+
+def _stream_schema(schema: "pa.Schema") -> "pa.Schema":
+    """
+    Arrow schema a whole stream is written with, fixed from its first batch:
+    dictionary (category) columns get int32 indices, since pandas picks int8
+    codes for a small first chunk and later chunks may hold more categories;
+    all-null columns are typed as strings.
+    """
+    fields = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            field = field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+        elif pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+AUDIT_SLICE_ROWS = 65_536       # rows per pandas slice when auditing an Arrow table
+
+
+def _audit_table(table: "pa.Table") -> RowHashAudit:
+    """
+    Row-hash audit of an Arrow table, converted to pandas AUDIT_SLICE_ROWS
+    rows at a time instead of as a whole. Slices are cast to the dtypes a
+    whole-table to_pandas() gives (int / bool columns with a null anywhere
+    → float64 / object), so the checksum does not depend on the slicing.
+    """
+    widened = {}
+    for name, col in zip(table.column_names, table.columns):
+        if col.null_count and pa.types.is_integer(col.type):
+            widened[name] = np.float64
+        elif col.null_count and pa.types.is_boolean(col.type):
+            widened[name] = object
+    audit = RowHashAudit()
+    for start in range(0, max(table.num_rows, 1), AUDIT_SLICE_ROWS):
+        frame = table.slice(start, AUDIT_SLICE_ROWS).to_pandas()
+        audit.update(frame.astype(widened) if widened else frame)
+    return audit
+
+
+def _unify_schemas(tables: list["pa.Table"], source: str) -> list["pa.Table"]:
+    """
+    Make per-file tables concatenable: a column whose non-null Arrow types
+    differ across files, other than a mix of integer / float widths, is cast
+    to string in every file (logged). The rest is left to the permissive
+    concatenation (missing columns → null, numeric types widened).
+    """
+    types: dict[str, set] = {}
+    for table in tables:
+        for field in table.schema:
+            if not pa.types.is_null(field.type):
+                types.setdefault(field.name, set()).add(field.type)
+    conflicts = {name: ts for name, ts in types.items() if len(ts) > 1
+                 and not all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in ts)}
+    if not conflicts:
+        return tables
+    log.warning(f"{source:15} | conflicting column types cast to string: "
+                + ", ".join(f"{name} ({' / '.join(sorted(map(str, ts)))})"
+                            for name, ts in conflicts.items()))
+    out = []
+    for table in tables:
+        for name in conflicts.keys() & set(table.column_names):
+            i = table.schema.get_field_index(name)
+            table = table.set_column(i, name, pc.cast(table.column(i), pa.string()))
+        out.append(table)
+    return out
+
+
+def _read_one_file(path: str, columns: list[str] | None = None, filters=None,
+                   storage_opts: dict | None = None,
+                   engine: str | None = None) -> tuple["pa.Table", dict]:
+    """
+    read_many worker: load one file (no post-processing) as an Arrow table and
+    audit its raw rows. Top-level so it can run in a process pool. Parquet is
+    audited straight from the Arrow table, slice by slice, so the file is
+    never held as a full pandas copy next to the table.
+    """
+    ftype = DataCollector._file_type(path)
+    if ftype == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns, filters=filters)
+        audit = _audit_table(table)
+    else:
+        buffer, _ = DataCollector._open_source(path, **(storage_opts or {}))
+        usecols = _read_columns(columns, filters)
+        if ftype == "excel":
+            frame = pd.read_excel(buffer, usecols=usecols, engine=engine)
+        else:
+            frame = pd.read_csv(buffer, sep="\t" if ftype == "tsv" else ",",
+                                usecols=usecols)
+        frame = _apply_filters(frame, filters, columns)
+        table = _to_arrow(frame)
+        audit = RowHashAudit.from_frame(frame)
+    return table, {"path": path, "rows": audit.rows,
+                   "sha256": audit.checksum, "fingerprint": audit.fingerprint}
+
+
+# ─── Source Names ──────────────────────────────────────────────────────────────
+# `source` names the input in logs, profiling reports and the schema registry,
+# so two different queries / endpoints / topics must not share one.
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\n".join(map(str, parts)).encode()).hexdigest()[:12]
+
+
+def _sql_source(dsn: str, query) -> str:
+    """sql:<digest of DSN + query> (the DSN may carry credentials)."""
+    return f"sql:{_digest(dsn, query)}"
+
+
+def _rest_source(url: str) -> str:
+    """rest:<host/path> of the endpoint (query strings may carry tokens)."""
+    parts = urlsplit(url)
+    return f"rest:{parts.netloc}{parts.path.rstrip('/')}"
+
+
+# ─── SQL Engine Pool ───────────────────────────────────────────────────────────
+_ENGINES: dict[str, object] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def _get_engine(dsn: str):
+    """
+    One SQLAlchemy engine (and connection pool) per DSN for the whole process
+    instead of a new engine on every read_sql call.
+    """
+    with _ENGINES_LOCK:
+        if dsn not in _ENGINES:
+            _ENGINES[dsn] = create_engine(dsn, pool_pre_ping=True)
+        return _ENGINES[dsn]
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection (e.g. before forking workers)."""
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+
+def _mask_pii_column(series: pd.Series) -> tuple[pd.Series, int]:
+    """
+    Mask one string column. Cells are screened with the combined PII regex and
+    only the hits are rewritten (email first, then phone, as before); other
+    cells — including non-strings — are left untouched. Runs on pyarrow
+    compute kernels when the column converts to an Arrow string array.
+    Returns (masked series, number of cells that contained PII).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cats = series.cat.categories.to_series()
+        masked, _ = _mask_pii_column(cats)
+        if masked.equals(cats):
+            return series, 0
+        hits = int(series.isin(cats[masked != cats].index).sum())
+        return series.map(dict(zip(cats, masked))), hits
+
+    if "pc" in globals():
+        rows = np.arange(len(series))
+        try:
+            arr = pa.array(series, type=pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # mixed-type column → scan only the cells that are strings
+            rows = np.flatnonzero(series.map(type).eq(str).to_numpy())
+            arr = pa.array(series.iloc[rows], type=pa.string())
+        hit = pc.match_substring_regex(
+            arr, PII_PATTERN.pattern).fill_null(False)
+        n_hits = pc.sum(hit).as_py() or 0
+        if n_hits:
+            masked = pc.replace_substring_regex(
+                arr.filter(hit), EMAIL_PATTERN.pattern, "[email]")
+            masked = pc.replace_substring_regex(
+                masked, PHONE_PATTERN.pattern, "[phone]")
+            series = series.copy()
+            series.iloc[rows[hit.to_numpy(zero_copy_only=False)]] = \
+                masked.to_numpy(zero_copy_only=False)
+        return series, n_hits
+
+    try:
+        hit = series.str.contains(PII_PATTERN, na=False)
+    except AttributeError:  # object column without any strings
+        return series, 0
+    n_hits = int(hit.sum())
+    if n_hits:
+        series = series.copy()
+        series[hit] = (series[hit]
+                       .str.replace(EMAIL_PATTERN, "[email]", regex=True)
+                       .str.replace(PHONE_PATTERN, "[phone]", regex=True))
+    return series, n_hits
+
+
+def _mask_pii(df: pd.DataFrame, n_jobs: int = 1) -> tuple[pd.DataFrame, dict[str, int]]:
     """
     Redact obvious PII (emails & 10+ digit numbers) by replacing them with [email] and [phone].
+    Only string-typed columns are scanned; wide frames are masked column-parallel
+    in a process pool. Returns the masked frame and per-column hit counts.
+    """
+    str_cols = [c for c in df.columns
+                if pd.api.types.is_object_dtype(df[c])
+                or pd.api.types.is_string_dtype(df[c])
+                or isinstance(df[c].dtype, pd.CategoricalDtype)]
+    if not str_cols:
+        return df, {}
+
+    if n_jobs != 1 and len(str_cols) >= PII_PARALLEL_MIN_COLS \
+            and len(df) * len(str_cols) >= PII_PARALLEL_MIN_CELLS:
+        from joblib import Parallel, delayed
+        results = Parallel(n_jobs=n_jobs, prefer="processes")(
+            delayed(_mask_pii_column)(df[c]) for c in str_cols)
+    else:
+        results = [_mask_pii_column(df[c]) for c in str_cols]
+
+    hits = {col: n_hits for col, (_, n_hits) in zip(str_cols, results) if n_hits}
+    if hits:
+        df = df.copy()
+        for col, (masked, _) in zip(str_cols, results):
+            if col in hits:
+                df[col] = masked
+    return df, hits
+
+
+# ─── Semantic Type Inference ───────────────────────────────────────────────────
+# Columns with more distinct values than this are profiled on a stratified
+# sample; below it every distinct value is tested once, weighted by its count,
+# which gives exactly the same fractions as testing every cell.
+PROFILE_SAMPLE_ROWS = 20_000
+PROFILE_STRATA = 10
+# Slow (per-element fallback) parsers are first tried on this many values and
+# skipped when fewer than half of them parse.
+PROFILE_PROBE_ROWS = 256
+PROFILE_DRIFT_ROWS = 1_000     # sample size of the schema-registry conformance check
+
+BOOL_MAP = {"true": True, "false": False, "1": True,
+            "0": False, "yes": True, "no": False}
+TIME_ONLY_REGEX = r"^\d{1,2}:\d{2}(:\d{2})?(\s?[APMapm]{2})?$"
+ZIP_REGEX = r"^\d{5}(-\d{4})?$"
+CURRENCY_REGEX = r"^\s*[$₹€£]?[0-9,]+(\.\d{2})?\s*$"
+EMAIL_REGEX = r"^[^@]+@[^@]+\.[^@]+$"
+URL_REGEX = r"^(http://|https://|www\.)"
+
+
+def _stratified_sample(values: pd.Series, n: int, strata: int = PROFILE_STRATA,
+                       seed: int = 0) -> pd.Series:
+    """
+    Draw ~n rows spread evenly over `strata` positional blocks so that files
+    sorted by time/source are represented end to end. Original order is kept.
+    """
+    rng = np.random.default_rng(seed)
+    bounds = np.linspace(0, len(values), strata + 1).astype(int)
+    per = max(n // strata, 1)
+    picks = [
+        rng.choice(np.arange(lo, hi), size=min(per, hi - lo), replace=False)
+        for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo
+    ]
+    return values.iloc[np.sort(np.concatenate(picks))]
+
+
+def _infer_semantic_vectorized(series: pd.Series,
+                               sample_rows: int = PROFILE_SAMPLE_ROWS) -> str:
+    """
+    Decide the semantic type of one column with vectorized kernels.
+
+    Cardinality checks use one full-column value_counts(). Pattern checks run
+    on the distinct values weighted by their counts (exact) or, for columns
+    with more than `sample_rows` distinct values, on a stratified sample.
+    The decision chain and thresholds mirror _infer_semantic_percell.
     """
-    def _scrub(cell):
-        if not isinstance(cell, str):
-            return cell
-        return PHONE_PATTERN.sub("[phone]", EMAIL_PATTERN.sub("[email]", cell))
-    return df.applymap(_scrub)
+    n = len(series)
+    counts = series.value_counts(dropna=True)
+    counts = counts[counts > 0]                 # unused categories
+    n_null = int(series.isna().sum())
+    n_unique = len(counts)
+    n_unique_all = n_unique + (n_null > 0)      # == nunique(dropna=False)
+    is_unique = n_unique_all == n
+
+    if n_unique_all == 1:
+        return "Constant / Redundant"
+    if n_unique == n:
+        return "ID-like Field"
+
+    if n_unique <= sample_rows:
+        vals = pd.Series(counts.index, dtype=series.dtype)
+        w = counts.to_numpy(dtype=float)
+    else:
+        vals = _stratified_sample(series.dropna(), sample_rows)
+        w = np.ones(len(vals))
+    nonnull_share = (n - n_null) / n
+
+    def frac(mask) -> float:
+        """Share of non-null cells for which `mask` holds."""
+        mask = np.asarray(mask, dtype=bool)
+        return float((mask * w).sum() / w.sum()) if w.sum() else 0.0
+
+    def frac_all(mask) -> float:
+        """Share over *all* cells (nulls count as misses)."""
+        return frac(mask) * nonnull_share
+
+    def parsed_share(parser) -> float:
+        """frac_all() of values `parser` accepts, screened on a small probe."""
+        if len(vals) > PROFILE_PROBE_ROWS and \
+                parser(vals.iloc[:PROFILE_PROBE_ROWS]).notna().mean() < 0.5:
+            return 0.0
+        return frac_all(parser(vals).notna())
+
+    as_str = vals.astype(str)
+
+    if as_str.str.lower().isin(BOOL_MAP.keys()).all():
+        return "Boolean"
+
+    # Numeric BEFORE datetime to avoid false conversions. The old
+    # "str(x).replace('.', '', 1).isdigit()" fallback only accepts values that
+    # to_numeric parses as well, so the coercion check alone is sufficient.
+    if pd.api.types.is_numeric_dtype(series):
+        return "Numeric"
+    try:
+        coerced = pd.to_numeric(vals, errors="coerce")
+    except (TypeError, ValueError):
+        coerced = pd.to_numeric(as_str, errors="coerce")
+    if frac(coerced.notna()) > 0.9:
+        return "Numeric"
+
+    if parsed_share(partial(pd.to_datetime, errors="coerce")) > 0.9:
+        return "Datetime"
+    stripped = as_str.str.strip()
+    if frac(stripped.str.match(TIME_ONLY_REGEX)) > 0.9:
+        return "Time Only"
+    try:
+        if parsed_share(partial(pd.to_timedelta, errors="coerce")) > 0.9:
+            return "Duration / Timedelta"
+    except (TypeError, ValueError):
+        pass
+    if frac(as_str.str.match(ZIP_REGEX)) > 0.9:
+        return "ZIP Code"
+    if frac(as_str.str.match(CURRENCY_REGEX)) > 0.9:
+        return "Currency"
+    if frac(as_str.str.contains(EMAIL_REGEX)) > 0.9:
+        return "Email"
+    if frac(as_str.str.contains(URL_REGEX)) > 0.9:
+        return "URL"
+    if frac(stripped.str.startswith("{")) > 0.9:
+        return "JSON / Dict-like"
+    try:
+        fv = vals.astype(float)
+        if frac_all((fv >= -180) & (fv <= 180)) > 0.9:
+            return "Geolocation"
+    except (TypeError, ValueError):
+        pass
+    if n_unique_all / n < 0.05:
+        return "Categorical"
+    if series.dtype == "object" and n_unique_all / n > 0.5 and not is_unique:
+        return "High Cardinality Categorical"
+
+    try:
+        long_text = vals.astype(object).str.len() > 50
+    except AttributeError:  # no strings at all
+        long_text = np.zeros(len(vals), dtype=bool)
+    if frac(long_text) > 0.9:
+        return "Text Paragraph"
+    return "String / Text"
+
+
+def _hashable_cell(value):
+    """
+    Hashable stand-in for a nested cell (list / dict / set, e.g. from JSON
+    sources) that compares equal by value, as value_counts() counts them.
+    """
+    if isinstance(value, dict):
+        return dict, frozenset((k, _hashable_cell(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_hashable_cell(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset, frozenset(value)
+    return value
 
 
-def _semantic_type_profile(df: pd.DataFrame, source: str) -> pd.DataFrame:
+def _infer_semantic_percell(series: pd.Series) -> str:
     """
-    Simple semantic‐type profiler. Detects:
-      - constant, ID-like, boolean, datetime, time-only, duration, ZIP code, currency,
-      - email, URL, JSON-like, geolocation, categorical, high-cardinality categorical,
-      - integer, float, text‐paragraph, or string/text.
-    Saves a JSON report to REPORT_DIR.
-    Returns a “cleaned” DataFrame (with conversions to bool, datetime, numeric, etc.).
+    Reference implementation: the original per-cell predicate chain.
+    Kept for benchmarking and regression checks against the vectorized engine.
+    Cardinality checks run on hashable stand-ins of nested cells, so list /
+    dict columns are counted like the vectorized engine counts them.
     """
-    report: dict[str, dict] = {}
-    df_clean = df.copy()
+    keys = series.map(_hashable_cell) if series.dtype == object else series
 
     def is_boolean(series: pd.Series) -> bool:
         vals = set(series.dropna().astype(str).str.lower())
@@ -103,14 +699,13 @@ def _semantic_type_profile(df: pd.DataFrame, source: str) -> pd.DataFrame:
 
     def is_datetime(series: pd.Series) -> bool:
         try:
-            parsed = pd.to_datetime(
-                series, errors="coerce", infer_datetime_format=True)
+            parsed = pd.to_datetime(series, errors="coerce")
             return parsed.notna().mean() > 0.9
         except:
             return False
 
     def is_time_only(series: pd.Series) -> bool:
-        pattern = re.compile(r"^\d{1,2}:\d{2}(:\d{2})?(\s?[APMapm]{2})?$")
+        pattern = re.compile(TIME_ONLY_REGEX)
         vals = series.dropna().astype(str).str.strip()
         return (vals.apply(lambda x: bool(pattern.match(x))).mean() > 0.9)
 
@@ -123,19 +718,19 @@ def _semantic_type_profile(df: pd.DataFrame, source: str) -> pd.DataFrame:
 
     def is_zip(series: pd.Series) -> bool:
         vals = series.dropna().astype(str)
-        return (vals.str.match(r"^\d{5}(-\d{4})?$").mean() > 0.9)
+        return (vals.str.match(ZIP_REGEX).mean() > 0.9)
 
     def is_currency(series: pd.Series) -> bool:
         vals = series.dropna().astype(str)
-        return (vals.str.match(r"^\s*[$₹€£]?[0-9,]+(\.\d{2})?\s*$").mean() > 0.9)
+        return (vals.str.match(CURRENCY_REGEX).mean() > 0.9)
 
     def is_email(series: pd.Series) -> bool:
         vals = series.dropna().astype(str)
-        return (vals.str.contains(r"^[^@]+@[^@]+\.[^@]+$").mean() > 0.9)
+        return (vals.str.contains(EMAIL_REGEX).mean() > 0.9)
 
     def is_url(series: pd.Series) -> bool:
         vals = series.dropna().astype(str)
-        return (vals.str.contains(r"^(http://|https://|www\.)").mean() > 0.9)
+        return (vals.str.contains(URL_REGEX).mean() > 0.9)
 
     def is_json_like(series: pd.Series) -> bool:
         vals = series.dropna().astype(str)
@@ -160,108 +755,353 @@ def _semantic_type_profile(df: pd.DataFrame, source: str) -> pd.DataFrame:
     def is_high_card_cat(series: pd.Series) -> bool:
         return (series.dtype == "object") and (series.nunique(dropna=False) / len(series) > 0.5) and (not series.is_unique)
 
-    for col in df.columns:
-        series = df[col]
-        orig_dtype = str(series.dtype)
-        converted = False
-        semantic = "Unknown"
-
-        # Pre-clean copy of column
-        col_clean = series.copy()
-
-        if is_constant(series):
-            semantic = "Constant / Redundant"
-
-        elif is_id_like(series):
-            semantic = "ID-like Field"
-
-        elif is_boolean(series):
-            semantic = "Boolean"
-            df_clean[col] = (
-                series.astype(str).str.lower().map(
-                    {"true": True, "false": False, "1": True,
-                        "0": False, "yes": True, "no": False}
-                )
-            )
-            converted = True
-
-        # --- Handle Numeric BEFORE datetime to avoid false conversions ---
-        elif is_numeric(series) or series.dropna().map(lambda x: isinstance(x, (int, float)) or str(x).replace(".", "", 1).isdigit()).mean() > 0.9:
-            num_series = pd.to_numeric(series, errors="coerce")
-
-            if num_series.dropna().map(float.is_integer).mean() > 0.9:
-                semantic = "Integer"
-                df_clean[col] = num_series.astype("Int64")  # nullable integer
-            else:
-                semantic = "Float"
-                df_clean[col] = num_series.astype("float")
-            converted = True
-
-        elif is_datetime(series):
-            semantic = "Datetime"
-            df_clean[col] = pd.to_datetime(series, errors="coerce")
-            converted = True
-
-        elif is_time_only(series):
-            semantic = "Time Only"
-
-        elif is_duration(series):
-            semantic = "Duration / Timedelta"
-            df_clean[col] = pd.to_timedelta(series, errors="coerce")
-            converted = True
-
-        elif is_zip(series):
-            semantic = "ZIP Code"
+    if is_constant(keys):
+        return "Constant / Redundant"
+    if is_id_like(keys):
+        return "ID-like Field"
+    if is_boolean(series):
+        return "Boolean"
+    if is_numeric(series) or series.dropna().map(lambda x: isinstance(x, (int, float)) or str(x).replace(".", "", 1).isdigit()).mean() > 0.9:
+        return "Numeric"
+    if is_datetime(series):
+        return "Datetime"
+    if is_time_only(series):
+        return "Time Only"
+    if is_duration(series):
+        return "Duration / Timedelta"
+    if is_zip(series):
+        return "ZIP Code"
+    if is_currency(series):
+        return "Currency"
+    if is_email(series):
+        return "Email"
+    if is_url(series):
+        return "URL"
+    if is_json_like(series):
+        return "JSON / Dict-like"
+    if is_geo(series):
+        return "Geolocation"
+    if is_categorical(keys):
+        return "Categorical"
+    if is_high_card_cat(keys):
+        return "High Cardinality Categorical"
+    textmask = series.dropna().map(lambda x: isinstance(x, str) and len(x) > 50)
+    if textmask.mean() > 0.9:
+        return "Text Paragraph"
+    return "String / Text"
+
+
+def _apply_semantic(series: pd.Series, semantic: str) -> tuple[pd.Series, str, bool]:
+    """
+    Convert a full column according to its semantic type in one pass.
+    "Numeric" is resolved here into Integer / Float.
+    Returns (converted series, final semantic label, converted flag).
+    """
+    if semantic == "Boolean":
+        return series.astype(str).str.lower().map(BOOL_MAP), semantic, True
+    if semantic == "Integer":                     # registry recipes
+        return pd.to_numeric(series, errors="coerce").astype("Int64"), semantic, True
+    if semantic == "Float":
+        return pd.to_numeric(series, errors="coerce").astype("float"), semantic, True
+    if semantic == "Numeric":
+        num_series = pd.to_numeric(series, errors="coerce")
+        vals = num_series.dropna().to_numpy(dtype=float)
+        integral = np.isfinite(vals) & (vals == np.floor(vals))
+        if len(vals) and integral.mean() > 0.9:
+            return num_series.astype("Int64"), "Integer", True  # nullable integer
+        return num_series.astype("float"), "Float", True
+    if semantic == "Datetime":
+        return pd.to_datetime(series, errors="coerce"), semantic, True
+    if semantic == "Duration / Timedelta":
+        return pd.to_timedelta(series, errors="coerce"), semantic, True
+    if semantic == "Currency":
+        return series.replace(r"[^\d.]", "", regex=True).astype(float), semantic, True
+    if semantic == "Categorical":
+        try:
+            return series.astype("category"), semantic, True
+        except TypeError:                         # list / dict cells: unhashable
+            return series, semantic, False
+    return series, semantic, False
 
-        elif is_currency(series):
-            semantic = "Currency"
-            df_clean[col] = series.replace(
-                r"[^\d.]", "", regex=True).astype(float)
-            converted = True
 
-        elif is_email(series):
-            semantic = "Email"
+def _conforms(series: pd.Series, recipe: dict) -> bool:
+    """
+    Cheap drift check of a registry recipe: the column still has the raw dtype
+    it was profiled with and, on a sample of ≤ PROFILE_DRIFT_ROWS non-null
+    values, still passes its type's test at the inference threshold (0.9).
+    """
+    if str(series.dtype) != recipe["original_dtype"]:
+        return False
+    if recipe["semantic_type"] in CARDINALITY_TYPES:
+        return _cardinality_conforms(series, recipe["semantic_type"])
+    vals = series.dropna()
+    if vals.empty:
+        return True
+    if len(vals) > PROFILE_DRIFT_ROWS:
+        vals = _stratified_sample(vals, PROFILE_DRIFT_ROWS)
+    semantic = recipe["semantic_type"]
+    as_str = vals.astype(str)
+    try:
+        if semantic == "Boolean":
+            return bool(as_str.str.lower().isin(BOOL_MAP.keys()).all())
+        if semantic in ("Integer", "Float"):
+            num = pd.to_numeric(vals, errors="coerce")
+            ok = num.notna().mean() > 0.9
+            if semantic == "Integer":
+                num = num.dropna().to_numpy(dtype=float)
+                ok &= bool(len(num)) and (np.isfinite(num) & (num == np.floor(num))).all()
+            return bool(ok)
+        if semantic == "Datetime":
+            return pd.to_datetime(vals, errors="coerce").notna().mean() > 0.9
+        if semantic == "Duration / Timedelta":
+            return pd.to_timedelta(vals, errors="coerce").notna().mean() > 0.9
+        if semantic == "Currency":
+            return as_str.str.match(CURRENCY_REGEX).mean() > 0.9
+    except (TypeError, ValueError):
+        return False
+    if semantic == "Time Only":
+        return as_str.str.strip().str.match(TIME_ONLY_REGEX).mean() > 0.9
+    pattern = {"ZIP Code": ZIP_REGEX, "Email": EMAIL_REGEX,
+               "URL": URL_REGEX}.get(semantic)       # all ^-anchored
+    if pattern is not None:
+        return as_str.str.match(pattern).mean() > 0.9
+    if semantic == "JSON / Dict-like":
+        return as_str.str.strip().str.startswith("{").mean() > 0.9
+    if semantic == "Geolocation":
+        fv = pd.to_numeric(vals, errors="coerce")
+        return ((fv >= -180) & (fv <= 180)).mean() > 0.9
+    if semantic == "Text Paragraph":
+        return (as_str.str.len() > 50).mean() > 0.9
+    return True  # String / Text: the fallback label, nothing to re-check
+
+
+CARDINALITY_TYPES = ("Constant / Redundant", "ID-like Field", "Categorical",
+                     "High Cardinality Categorical")
+
+
+def _distinct_estimate(sample: pd.Series, n: int) -> float:
+    """
+    Distinct values (null counted as one) of an n-row column, from a sample
+    of it: exact when the sample is the whole column, otherwise the
+    bias-corrected Chao1 estimate d + f1·(f1 − 1) / (2·(f2 + 1)) from the
+    sample's singletons f1 and doubletons f2, capped at n.
+    """
+    counts = sample.value_counts(dropna=False)
+    if len(sample) == n:
+        return float(len(counts))
+    f1, f2 = int((counts == 1).sum()), int((counts == 2).sum())
+    return min(len(counts) + f1 * (f1 - 1) / (2 * (f2 + 1)), n)
 
-        elif is_url(series):
-            semantic = "URL"
 
-        elif is_json_like(series):
-            semantic = "JSON / Dict-like"
+def _cardinality_conforms(series: pd.Series, semantic: str) -> bool:
+    """
+    Re-check a cardinality label on a ≤ PROFILE_DRIFT_ROWS sample (nulls
+    included). A second value or a duplicate in the sample is conclusive for
+    constant / ID-like columns; the categorical ratios use the column's
+    estimated distinct count. On short columns every check is exact.
+    """
+    n = len(series)
+    if n == 0:
+        return True
+    sample = series if n <= PROFILE_DRIFT_ROWS else \
+        _stratified_sample(series, PROFILE_DRIFT_ROWS)
+    if semantic == "Constant / Redundant":
+        return sample.nunique(dropna=False) == 1
+    if semantic == "ID-like Field":
+        return sample.is_unique and not sample.isna().any()
+    distinct = _distinct_estimate(sample, n)
+    if semantic == "Categorical":
+        return distinct / n < 0.05
+    # High Cardinality Categorical: > 50 % distinct, but not fully unique
+    return distinct / n > 0.5 and not (len(sample) == n and distinct == n)
+
+
+SEMANTIC_ENGINES = {
+    "vectorized": _infer_semantic_vectorized,
+    "percell": _infer_semantic_percell,
+}
 
-        elif is_geo(series):
-            semantic = "Geolocation"
 
-        elif is_categorical(series):
-            semantic = "Categorical"
-            df_clean[col] = series.astype("category")
-            converted = True
+def _profile_columns(df: pd.DataFrame, engine: str = "vectorized",
+                     recipes: dict[str, dict] | None = None
+                     ) -> tuple[pd.DataFrame, dict[str, dict]]:
+    """
+    Run semantic inference + conversion over every column.
+    Returns the cleaned frame and the per-column report.
 
-        elif is_high_card_cat(series):
-            semantic = "High Cardinality Categorical"
+    With `recipes` (a schema-registry entry), a column whose recipe still
+    conforms is converted straight from it; only new or drifted columns go
+    through inference. The report then flags each column's `from_registry`.
+    """
+    if engine not in SEMANTIC_ENGINES:
+        raise ValueError(f"Unknown semantic engine: {engine}")
+    infer = SEMANTIC_ENGINES[engine]
+    report: dict[str, dict] = {}
+    df_clean = df.copy()
 
-        else:
-            # Last fallback
-            textmask = series.dropna().map(lambda x: isinstance(x, str) and len(x) > 50)
-            if textmask.mean() > 0.9:
-                semantic = "Text Paragraph"
-            else:
-                semantic = "String / Text"
+    for col in df.columns:
+        series = df[col]
+        orig_dtype = str(series.dtype)
+        recipe = (recipes or {}).get(col)
+        reused = recipe is not None and _conforms(series, recipe)
+        if reused:
+            try:
+                converted_series, semantic, converted = _apply_semantic(
+                    series, recipe["semantic_type"])
+            except (TypeError, ValueError):   # drift outside the sample
+                reused = False
+        if not reused:
+            converted_series, semantic, converted = _apply_semantic(
+                series, infer(series))
+        if converted:
+            df_clean[col] = converted_series
+
+        report[col] = {
+            "original_dtype": orig_dtype,
+            "semantic_type": semantic,
+            "converted": converted,
+            "final_dtype": str(df_clean[col].dtype) if converted else orig_dtype,
+        }
+        if recipes is not None:
+            report[col]["from_registry"] = reused
+    return df_clean, report
+
+
+def _semantic_type_profile(df: pd.DataFrame, source: str,
+                           write_report: bool = True,
+                           engine: str = "vectorized") -> pd.DataFrame:
+    """
+    Simple semantic‐type profiler. Detects:
+      - constant, ID-like, boolean, datetime, time-only, duration, ZIP code, currency,
+      - email, URL, JSON-like, geolocation, categorical, high-cardinality categorical,
+      - integer, float, text‐paragraph, or string/text.
+    Types are decided by the vectorized, sample-driven engine (engine="percell"
+    selects the original per-cell predicates) and applied to full columns.
+    Saves a JSON report to REPORT_DIR (unless write_report=False).
+    Returns a “cleaned” DataFrame (with conversions to bool, datetime, numeric, etc.).
+    """
+    df_clean, report = _profile_columns(df, engine)
+    if write_report:
+        _write_profile_report(report, source)
+    return df_clean
 
-    report[col] = {
-        "original_dtype": orig_dtype,
-        "semantic_type": semantic,
-        "converted": converted,
-        "final_dtype": str(df_clean[col].dtype) if converted else orig_dtype,
-    }
 
+def _write_profile_report(report: dict[str, dict], source: str) -> None:
     # Write JSON report
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    outpath = REPORT_DIR / f"{source}_{timestamp}.json"
+    name = re.sub(r"[^\w.:-]", "_", source)        # rest:/mqtt: keys contain "/"
+    outpath = REPORT_DIR / f"{name}_{timestamp}.json"
     with open(outpath, "w") as f:
         json.dump(report, f, indent=2)
     log.info(f"Semantic profiling → {outpath}")
 
-    return df_clean
+
+# ─── Dtype Compaction ──────────────────────────────────────────────────────────
+# Optional last stage of _postprocess: lossless numeric downcasts and compact
+# string storage, so every downstream copy (imputer, outlier, encoder) is smaller.
+COMPACT_CAT_RATIO = 0.5         # ≤ 50 % distinct values (of non-null) → category
+COMPACT_MAX_CATEGORIES = 10_000
+
+
+def _compact_column(series: pd.Series, arrow_strings: bool = False,
+                    numeric: bool = True) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer") if numeric else series
+    if pd.api.types.is_float_dtype(series) and series.dtype == np.float64:
+        if not numeric:
+            return series
+        values = series.to_numpy()
+        with np.errstate(over="ignore", invalid="ignore"):
+            as32 = values.astype(np.float32)            # out of range → inf
+            lossless = np.array_equal(as32.astype(np.float64), values, equal_nan=True)
+        return series.astype(np.float32) if lossless else series
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        nonnull = series.dropna()
+        if not len(nonnull) or not nonnull.map(type).eq(str).all():
+            return series                     # mixed objects stay as they are
+        n_unique = nonnull.nunique()
+        if n_unique <= COMPACT_MAX_CATEGORIES and n_unique <= COMPACT_CAT_RATIO * len(nonnull):
+            return series.astype("category")
+        if arrow_strings and "pa" in globals():
+            return series.astype("string[pyarrow]")
+    return series
+
+
+def _compact_dtypes(df: pd.DataFrame, arrow_strings: bool = False,
+                    numeric: bool = True) -> tuple[pd.DataFrame, dict[str, dict]]:
+    """
+    Downcast every column where it is lossless:
+      - int64 / Int64 → smallest integer type holding min..max
+      - float64 → float32 when every value round-trips exactly
+      - all-string columns with few distinct values → category,
+        other all-string columns → string[pyarrow] (arrow_strings=True)
+    numeric=False skips the first two, whose result depends on the values
+    (streams: a later chunk may not fit the first chunk's range).
+    Returns the compacted frame and {column: {from, to, bytes_before, bytes_after}}
+    for the columns that changed.
+    """
+    before = df.memory_usage(index=False, deep=True)
+    out = df.copy(deep=False)
+    report: dict[str, dict] = {}
+    for col in df.columns:
+        compacted = _compact_column(df[col], arrow_strings, numeric)
+        if compacted.dtype == df[col].dtype:
+            continue
+        out[col] = compacted
+        report[col] = {"from": str(df[col].dtype), "to": str(compacted.dtype),
+                       "bytes_before": int(before[col]),
+                       "bytes_after": int(compacted.memory_usage(index=False, deep=True))}
+    return out, report
+
+
+# ─── Stream Recipes ────────────────────────────────────────────────────────────
+# A stream is profiled once, on its first chunk; every later chunk is
+# converted with the same semantic recipe and pinned to the same dtype, so
+# all chunks agree (and row hashes of equal rows match across chunks).
+def _stream_dtype(semantic: str, dtype):
+    """dtype a stream pins a column to: nullable ints / bools, since a later chunk may hold nulls."""
+    if semantic == "Boolean" or pd.api.types.is_bool_dtype(dtype):
+        return pd.BooleanDtype()
+    if pd.api.types.is_integer_dtype(dtype):
+        return pd.Int64Dtype()
+    return dtype
+
+
+def _as_categories(series: pd.Series, dtype: pd.CategoricalDtype
+                   ) -> tuple[pd.Series, pd.CategoricalDtype]:
+    """
+    Cast to a stream's category set. A value first seen in this chunk is
+    appended to the set (never re-ordered), so known categories keep their
+    codes from chunk to chunk; returns the (possibly grown) dtype.
+    """
+    values = series.astype(object) if isinstance(series.dtype, pd.CategoricalDtype) else series
+    new = pd.Index(values.dropna().unique()).difference(dtype.categories)
+    if len(new):
+        dtype = pd.CategoricalDtype(dtype.categories.append(new), ordered=dtype.ordered)
+    return values.astype(dtype), dtype
+
+
+def _pin_dtypes(df: pd.DataFrame, dtypes: dict, source: str) -> pd.DataFrame:
+    """Cast columns to their stream dtypes (`dtypes` is updated when a category set grows)."""
+    out = df.copy(deep=False)
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if isinstance(dtype, pd.CategoricalDtype):
+            out[col], grown = _as_categories(series, dtype)
+            if len(grown.categories) > len(dtype.categories):
+                log.warning(f"{source:15} | {col}: {len(grown.categories) - len(dtype.categories)} "
+                            f"new categories after the first chunk (appended)")
+                dtypes[col] = grown
+        elif series.dtype != dtype:
+            try:
+                out[col] = series.astype(dtype)
+            except (TypeError, ValueError) as e:
+                log.warning(f"{source:15} | {col}: chunk does not fit {dtype} ({e}); kept {series.dtype}")
+    return out
 
 
 class DataCollector:
@@ -270,138 +1110,709 @@ class DataCollector:
     checksum logging, and optional Great Expectations validation.
     """
 
-    def __init__(self, pii_mask: bool = True, validate: bool = True, suite_name: str = "default_suite"):
+    def __init__(self, pii_mask: bool = True, validate: bool = True, suite_name: str = "default_suite",
+                 n_jobs: int = -1, cache: IngestCache | str | None = None,
+                 compact: bool = False, arrow_strings: bool = False,
+                 validate_mode: str = "full", validate_sample_rows: int = 100_000,
+                 excel_cache: ExcelParquetCache | str | None = None,
+                 schema_registry: SchemaRegistry | str | None = None,
+                 pii_n_jobs: int = 1):
+        if validate_mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode: {validate_mode}")
         self.pii_mask = pii_mask
         self.validate = validate
         self.suite_name = suite_name
-
-    def _validate_df(self, df: pd.DataFrame, source: str) -> None:
+        self.validate_mode = validate_mode
+        self.validate_sample_rows = validate_sample_rows
+        self.validation_report: dict = {}
+        self.n_jobs = n_jobs
+        self.pii_n_jobs = pii_n_jobs    # masking pool; only used past the PII_PARALLEL_* sizes
+        self.cache = IngestCache(cache) if isinstance(cache, str) else cache
+        self.excel_cache = ExcelParquetCache(excel_cache) \
+            if isinstance(excel_cache, str) else excel_cache
+        self.schema_registry = SchemaRegistry(schema_registry) \
+            if isinstance(schema_registry, str) else schema_registry
+        self.compact = compact
+        self.arrow_strings = arrow_strings
+        self.compact_report: dict[str, dict] = {}
+        self.pii_hits: dict[str, int] = {}
+        self.profile_report: dict[str, dict] = {}
+        self.audit_report: dict = {}
+        self._kafka_readers: dict[tuple, tuple[KafkaBatchReader, dict]] = {}
+
+    @property
+    def settings(self) -> dict:
+        """Collector settings that change the post-processed output."""
+        registry = self.schema_registry
+        return {"pii_mask": self.pii_mask, "validate": self.validate,
+                "suite_name": self.suite_name, "validate_mode": self.validate_mode,
+                "validate_sample_rows": self.validate_sample_rows,
+                "compact": self.compact, "arrow_strings": self.arrow_strings,
+                "schema_registry": None if registry is None else str(registry.dir.resolve())}
+
+    def _cache_settings(self, source: str, read_opts: dict) -> dict:
+        """
+        Ingest-cache key settings of one read: collector settings, read
+        options, and the source's schema-registry version (the recipes the
+        frame was converted with), so a registry update misses the cache.
+        """
+        version = None if self.schema_registry is None \
+            else self.schema_registry.version(source)
+        return {**self.settings, **read_opts, "schema_version": version}
+
+    def invalidate_cache(self, path: str) -> int:
+        """Drop every cached ingest of `path`; returns the number removed."""
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate_source(source_id(path))
+
+    def _validate_df(self, df: pd.DataFrame, source: str,
+                     check_row_count: bool = True) -> None:
         """
         If validate=True and Great Expectations is installed, run a suite.
         Otherwise, skip with a warning.
+        The context and suite are cached per suite_name (ge_validation);
+        row-level expectations run on the full frame, a sample, or parallel
+        chunks (validate_mode), aggregate ones always on the full frame.
         """
         if not self.validate:
             return
-        if "great_expectations" not in globals():
+        if "ge" not in globals():
             log.warning(
                 "Great Expectations not installed—skipping validation.")
             return
         try:
-            ctx = ge.DataContext()
-            suite = ctx.get_expectation_suite(self.suite_name)
-            validator = ge.from_pandas(df)
-            result = validator.validate(expectation_suite=suite)
-            if not result.success:
-                raise ValueError(f"GE validation failed for '{source}'")
-            log.info(
-                f"GE validation ✓ ({sum(m.success for m in result.results)}/{len(result.results)})")
+            runner = get_suite_runner(self.suite_name)
+            self.validation_report = runner.validate(
+                df, mode=self.validate_mode, sample_rows=self.validate_sample_rows,
+                n_jobs=self.n_jobs, check_row_count=check_row_count)
+            self._log_validation(source)
         except Exception as e:
             log.warning(f"GE validation exception: {e}")
 
-    def _postprocess(self, df: pd.DataFrame, source: str) -> pd.DataFrame:
+    def _validate_row_count(self, n_rows: int, source: str) -> None:
+        """Row-count expectations of a stream, checked once on the total."""
+        if not self.validate or "ge" not in globals():
+            return
+        try:
+            results = get_suite_runner(self.suite_name).check_row_count(n_rows)
+            if results:
+                self.validation_report = {"success": all(r["success"] for r in results),
+                                          "mode": "row_count", "rows_validated": n_rows,
+                                          "results": results}
+                self._log_validation(source)
+        except Exception as e:
+            log.warning(f"GE validation exception: {e}")
+
+    def _log_validation(self, source: str) -> None:
+        report = self.validation_report
+        results = report["results"]
+        if not report["success"]:
+            raise ValueError(f"GE validation failed for '{source}'")
+        sampled = f", row-level on {report['rows_validated']:,} sampled rows" \
+            if any(r["scope"] == "sample" for r in results) else ""
+        log.info(f"GE validation ✓ ({sum(r['success'] for r in results)}/"
+                 f"{len(results)}, {report['mode']}{sampled})")
+
+    def _transform(self, df: pd.DataFrame, source: str,
+                   write_report: bool = True, partial: bool = False,
+                   recipes: dict | None = None) -> pd.DataFrame:
         """
-        1) PII mask (if requested)
-        2) GE validation (if installed)
-        3) Semantic profiling → JSON report & type conversions
-        4) Check for emptiness
-        5) Check for duplicates (log but do not drop)
-        6) Audit checksum/logging
+        Per-frame part of the post-processing (steps 1–4 of _postprocess).
+        Shared by the batch path and the per-chunk streaming path
+        (partial=True: row-count expectations are left for the stream total
+        and PII hits are added to the stream's running pii_hits). With a
+        stream's `recipes` (see _postprocess_iter), step 3 applies them
+        instead of profiling the chunk.
         """
         if self.pii_mask:
-            df = _mask_pii(df)
+            df, hits = _mask_pii(df, n_jobs=self.pii_n_jobs)
+            if partial:
+                for col, n in hits.items():
+                    self.pii_hits[col] = self.pii_hits.get(col, 0) + n
+            else:
+                self.pii_hits = hits
+            if hits:
+                log.info(f"{source:15} | pii_hits={hits}")
 
-        self._validate_df(df, source)
-        df = _semantic_type_profile(df, source)
+        self._validate_df(df, source, check_row_count=not partial)
+        if recipes is not None:
+            df = self._apply_recipes(df, source, recipes)
+        else:
+            df, self.profile_report = self._profile(df, source)
+            if write_report:
+                _write_profile_report(self.profile_report, source)
 
         if df is None or df.empty:
             raise ValueError(f"Loaded data from '{source}' is empty.")
-        # Log duplicates
-        dup_count = df.duplicated().sum()
-        if dup_count:
-            log.warning(
-                f"{source:15} | duplicates={dup_count} rows (logged, not dropped).")
-        _audit_checksum(df, source)
         return df
 
-    def read_file(self, path: str, **storage_opts) -> pd.DataFrame:
+    def _profile(self, df: pd.DataFrame, source: str) -> tuple[pd.DataFrame, dict]:
         """
-        Read from local file or S3. Supported suffixes: csv, tsv, parquet, excel.
+        Semantic profiling (step 3), reusing the source's registered recipes
+        when a schema registry is configured.
+        """
+        if self.schema_registry is None:
+            return _profile_columns(df)
+        recipes = self.schema_registry.get(source)
+        df, report = _profile_columns(df, recipes=recipes or {})
+        inferred = [c for c, r in report.items() if not r["from_registry"]]
+        if inferred:
+            version = self.schema_registry.put(source, report)
+            if recipes:
+                log.info(f"{source:15} | schema drift → re-inferred {inferred} (v{version})")
+        return df, report
+
+    def _apply_recipes(self, df: pd.DataFrame, source: str, recipes: dict) -> pd.DataFrame:
+        """
+        Step 3 for a later chunk of a stream: convert every known column with
+        its recipe (no inference, no conformance check) and pin it to the
+        stream's dtype. Columns first seen in this chunk are profiled once
+        and join the recipes.
+        """
+        semantics, dtypes = recipes["semantic"], recipes["dtype"]
+        new = [c for c in df.columns if c not in semantics]
+        if new:
+            profiled, report = _profile_columns(df[new])
+            for col in new:
+                semantics[col] = report[col]["semantic_type"]
+                dtypes[col] = _stream_dtype(semantics[col], profiled[col].dtype)
+            log.info(f"{source:15} | new columns mid-stream → inferred {new}")
+        out = df.copy()
+        for col in df.columns:
+            try:
+                out[col], _, _ = _apply_semantic(df[col], semantics[col])
+            except (TypeError, ValueError) as e:
+                log.warning(f"{source:15} | {col}: {semantics[col]} recipe failed "
+                            f"on this chunk ({e}); kept raw values")
+        return _pin_dtypes(out, dtypes, source)
+
+    def _postprocess(self, df: pd.DataFrame, source: str) -> pd.DataFrame:
+        """
+        1) PII mask (if requested)
+        2) GE validation (if installed)
+        3) Semantic profiling → JSON report & type conversions
+        4) Check for emptiness
+        5) Row-hash audit: duplicates (logged, not dropped), checksum and
+           content fingerprint from one hash_pandas_object pass
+        6) Dtype compaction (if compact=True) – after the audit, so checksums
+           do not depend on the storage dtypes
         """
+        df = self._transform(df, source)
+        # Log duplicates + checksum from a single row-hash pass
+        self.audit_report = _audit_checksum(df, source).summary
+        return self._compact(df, source)
+
+    def _compact(self, df: pd.DataFrame, source: str, numeric: bool = True) -> pd.DataFrame:
+        """Step 6 of _postprocess; logs before/after memory per changed column."""
+        if not self.compact:
+            return df
+        df, self.compact_report = _compact_dtypes(df, self.arrow_strings, numeric)
+        for col, r in self.compact_report.items():
+            log.info(f"{source:15} | compact {col}: {r['from']} → {r['to']} "
+                     f"({r['bytes_before']:,} → {r['bytes_after']:,} B)")
+        before = sum(r["bytes_before"] for r in self.compact_report.values())
+        after = sum(r["bytes_after"] for r in self.compact_report.values())
+        if before:
+            log.info(f"{source:15} | compact {len(self.compact_report)} cols: "
+                     f"{before / 2**20:,.1f} → {after / 2**20:,.1f} MiB")
+        return df
+
+    @staticmethod
+    def _file_type(path: str) -> str:
+        suffix = Path.Path(path.split("s3://", 1)[-1]).suffix.lower()
+        if suffix not in SUPPORTED_SUFFIXES:
+            raise ValueError(f"Unsupported file extension: {suffix}")
+        return SUPPORTED_SUFFIXES[suffix]
+
+    @classmethod
+    def _open_source(cls, path: str, stream: bool = False, **storage_opts):
+        """
+        Resolve a local path or s3:// URI into (buffer, file type).
+        With stream=True an S3 body is handed over as a file-like object
+        instead of being read into memory first (row-oriented formats only).
+        """
+        ftype = cls._file_type(path)
         if path.startswith("s3://"):
             bucket_key = path.split("s3://", 1)[1]
             bucket, key = bucket_key.split("/", 1)
             obj = boto3.client("s3").get_object(
                 Bucket=bucket, Key=key, **storage_opts)
-            buffer = io.BytesIO(obj["Body"].read())
-            suffix = Path.Path(key).suffix.lower()
+            if stream and ftype in {"csv", "tsv"}:
+                buffer = obj["Body"]
+            else:
+                buffer = io.BytesIO(obj["Body"].read())
         else:
             buffer = path
-            suffix = Path.Path(path).suffix.lower()
+        return buffer, ftype
 
-        if suffix not in SUPPORTED_SUFFIXES:
-            raise ValueError(f"Unsupported file extension: {suffix}")
-        ftype = SUPPORTED_SUFFIXES[suffix]
+    def read_file(self, path: str, columns: list[str] | None = None, filters=None,
+                  filesystem=None, sheet: int | str = 0, engine: str | None = None,
+                  **storage_opts) -> pd.DataFrame:
+        """
+        Read from local file or S3. Supported suffixes: csv, tsv, parquet, excel.
 
-        if ftype == "csv":
-            df = pd.read_csv(buffer)
-        elif ftype == "tsv":
-            df = pd.read_csv(buffer, sep="\t")
+        columns / filters select the data actually needed. Filters use the
+        pyarrow DNF syntax, e.g. [("country", "=", "IN"), ("amount", ">", 0)].
+        Parquet (local or s3://) goes through pyarrow so only matching row
+        groups and requested column chunks are fetched and decoded; pass a
+        pyarrow `filesystem` (e.g. S3FileSystem(endpoint_override=...)) to
+        target MinIO or custom credentials. Other formats load the projected
+        columns and filter in pandas; storage_opts go to boto3 for them.
+
+        `sheet` (index or name) picks the Excel sheet and `engine` the
+        pd.read_excel engine (None → pandas' default; excel_cache.excel_engine()
+        names the fastest installed one). With an excel_cache configured, each
+        sheet is converted to Parquet once (keyed by the workbook's content
+        hash) and later reads take the Parquet pushdown path.
+
+        With an ingest cache configured, an unchanged source (same fingerprint,
+        collector settings and schema-registry version) is served from the
+        cache without re-running _postprocess.
+        """
+        source = f"flat:{Path.Path(path).name}"
+        ftype = self._file_type(path)
+        if self.cache is not None:
+            fingerprint = source_fingerprint(path, **storage_opts)
+            read_opts = {"columns": columns, "filters": repr(filters),
+                         **({"sheet": sheet, "engine": engine} if ftype == "excel" else {})}
+            key = self.cache.key(fingerprint, self._cache_settings(source, read_opts))
+            hit = self.cache.get(key)
+            if hit is not None:
+                df, self.profile_report = hit
+                log.info(f"{source:15} | rows={len(df):7,} | ingest cache hit {key[:12]}")
+                self.audit_report = self.cache.audit(key) or {}
+                if self.audit_report:
+                    _log_audit_summary(source, self.audit_report)
+                return df
+
+        if ftype == "parquet":
+            df = _read_parquet(path, columns, filters, filesystem)
+        elif ftype == "excel" and self.excel_cache is not None:
+            df = _read_parquet(
+                str(self.excel_cache.sheet_path(path, sheet, engine, **storage_opts)),
+                columns, filters)
+        else:
+            buffer, _ = self._open_source(path, **storage_opts)
+            usecols = _read_columns(columns, filters)
+            if ftype == "csv":
+                df = pd.read_csv(buffer, usecols=usecols)
+            elif ftype == "tsv":
+                df = pd.read_csv(buffer, sep="\t", usecols=usecols)
+            elif ftype == "excel":  # excel
+                df = pd.read_excel(buffer, sheet_name=sheet, usecols=usecols,
+                                   engine=engine)
+            else:
+                raise ValueError(f"Unsupported file type: {ftype}")
+            df = _apply_filters(df, filters, columns)
+        df = self._postprocess(df, source)
+        if self.cache is not None:
+            # stored under the registry version this ingest left behind
+            key = self.cache.key(fingerprint, self._cache_settings(source, read_opts))
+            self.cache.put(key, df, self.profile_report, source=source_id(path),
+                           audit=self.audit_report)
+        return df
+
+    def read_file_iter(self, path: str, chunk_rows: int = 100_000,
+                       columns: list[str] | None = None, filters=None,
+                       filesystem=None, **storage_opts) -> Iterator[pd.DataFrame]:
+        """
+        Streaming variant of read_file: yields post-processed batches of at
+        most ``chunk_rows`` rows so peak memory is bounded by the chunk size.
+
+        CSV/TSV are read with chunked parsing, Parquet batch by batch from its
+        row groups. PII masking and validation run per chunk; semantic types
+        are inferred on the first chunk only (which also gets the JSON
+        profiling report) and applied with the same dtypes to every later one.
+        Duplicate count and checksum are aggregated over all chunks and logged
+        once, in the same format as the batch path, after the last chunk.
+        columns / filters / filesystem behave as in read_file.
+        """
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be a positive integer")
+        ftype = self._file_type(path)
+        source = f"flat:{Path.Path(path).name}"
+
+        if ftype in {"csv", "tsv"}:
+            buffer, _ = self._open_source(path, stream=True, **storage_opts)
+            sep = "\t" if ftype == "tsv" else ","
+            chunks = (_apply_filters(chunk, filters, columns) for chunk in
+                      pd.read_csv(buffer, sep=sep, chunksize=chunk_rows,
+                                  usecols=_read_columns(columns, filters)))
         elif ftype == "parquet":
-            df = pd.read_parquet(buffer)
-        elif ftype == "excel":  # excel
-            df = pd.read_excel(buffer)
+            chunks = _iter_parquet(path, chunk_rows, columns, filters, filesystem)
         else:
-            raise ValueError(f"Unsupported file type: {ftype}")
-        return self._postprocess(df, f"flat:{Path.Path(path).name}")
+            raise ValueError(
+                f"Streaming is not supported for '{ftype}' files; use read_file.")
+
+        yield from self._postprocess_iter(chunks, source)
+
+    def _postprocess_iter(self, chunks: Iterator[pd.DataFrame],
+                          source: str) -> Iterator[pd.DataFrame]:
+        """
+        Streaming counterpart of _postprocess: transform chunk by chunk and
+        log one aggregated audit line once the input is exhausted.
+
+        The recipes are fixed on the first chunk: it is profiled as in the
+        batch path (schema registry included), and every later chunk gets the
+        same semantic conversions, pinned to the first chunk's dtypes
+        (ints / bools as nullable Int64 / boolean). Category sets start as the
+        first chunk's; a value first seen later is appended (logged), so
+        known categories keep their codes. With compact=True the compaction
+        plan is fixed the same way and limited to string columns (→ category
+        / string[pyarrow]); numeric downcasts are skipped, since a later
+        chunk may not fit the first chunk's range.
+        """
+        audit = RowHashAudit()
+        self.pii_hits = {}
+        recipes: dict | None = None
+        compacted: dict | None = None
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            chunk = self._transform(chunk, source, write_report=recipes is None,
+                                    partial=True, recipes=recipes)
+            if recipes is None:
+                semantic = {c: r["semantic_type"] for c, r in self.profile_report.items()}
+                recipes = {"semantic": semantic,
+                           "dtype": {c: _stream_dtype(semantic[c], chunk[c].dtype)
+                                     for c in chunk.columns}}
+                chunk = _pin_dtypes(chunk, recipes["dtype"], source)
+            audit.update(chunk)
+            if self.compact and compacted is None:
+                chunk = self._compact(chunk, source, numeric=False)
+                compacted = {c: chunk[c].dtype for c in self.compact_report}
+            elif compacted:
+                chunk = _pin_dtypes(chunk, compacted, source)
+            yield chunk
+
+        if audit.rows == 0:
+            raise ValueError(f"Loaded data from '{source}' is empty.")
+        if self.pii_hits:
+            log.info(f"{source:15} | pii_hits total={self.pii_hits}")
+        self.audit_report = _audit_checksum(audit, source).summary
+        self._validate_row_count(audit.rows, source)
+
+    def read_many(self, paths: str | list[str], n_jobs: int | None = None,
+                  columns: list[str] | None = None, filters=None,
+                  engine: str | None = None, **storage_opts) -> pd.DataFrame:
+        """
+        Read many files (a local glob pattern or an explicit list, s3:// URIs
+        allowed) into ONE post-processed frame.
+
+        Files are read concurrently — CSV/TSV/Excel parsing in a process pool,
+        Parquet in threads (pyarrow releases the GIL) — into Arrow tables.
+        Schemas are reconciled on a single Arrow concatenation (missing
+        columns become null, numeric types are widened, columns whose types
+        otherwise conflict across files are cast to string), converted to pandas
+        once, and _postprocess runs once on the combined result. Per-file row
+        counts and checksums go to the audit log. `engine` is the Excel
+        engine, as in read_file.
+        """
+        from joblib import Parallel, delayed
 
-    def read_sql(self, dsn: str, query: str) -> pd.DataFrame:
-        df = pd.read_sql(query, create_engine(dsn))
-        return self._postprocess(df, "sql")
+        if isinstance(paths, str):
+            files = sorted(glob.glob(paths)) if glob.has_magic(paths) else [paths]
+        else:
+            files = list(paths)
+        if not files:
+            raise ValueError(f"No files matched '{paths}'.")
+        source = f"many:{len(files)}_files"
+        n_jobs = n_jobs or self.n_jobs
+
+        def run(idx: list[int], prefer: str) -> dict[int, tuple]:
+            if not idx:
+                return {}
+            out = Parallel(n_jobs=n_jobs, prefer=prefer)(
+                delayed(_read_one_file)(files[i], columns, filters, storage_opts, engine)
+                for i in idx)
+            return dict(zip(idx, out))
+
+        is_parquet = [self._file_type(f) == "parquet" for f in files]
+        results = {
+            **run([i for i, pq_ in enumerate(is_parquet) if not pq_], "processes"),
+            **run([i for i, pq_ in enumerate(is_parquet) if pq_], "threads"),
+        }
+
+        tables = []
+        for i in range(len(files)):
+            table, info = results[i]
+            _log_audit(f"file:{Path.Path(info['path']).name}", info["rows"],
+                       info["sha256"], info["fingerprint"])
+            tables.append(table)
+        combined = pa.concat_tables(_unify_schemas(tables, source),
+                                    promote_options="permissive")
+        log.info(f"{source:15} | files={len(files)} | rows={combined.num_rows:7,}")
+        df = combined.to_pandas()
+        del tables, combined, results
+        return self._postprocess(df, source)
+
+    def read_sql(self, dsn: str, query: str, params=None) -> pd.DataFrame:
+        with _get_engine(dsn).connect() as conn:
+            df = pd.read_sql(query, conn, params=params)
+        return self._postprocess(df, _sql_source(dsn, query))
+
+    def read_sql_iter(self, dsn: str, query: str, chunksize: int = 50_000,
+                      params=None) -> Iterator[pd.DataFrame]:
+        """
+        Stream a query through a server-side cursor (stream_results=True) in
+        `chunksize`-row batches, yielding post-processed frames; memory stays
+        proportional to the batch, not the result set. Uses the pooled engine.
+        """
+        with _get_engine(dsn).connect() as conn:
+            conn = conn.execution_options(stream_results=True,
+                                          max_row_buffer=chunksize)
+            chunks = pd.read_sql(query, conn, params=params, chunksize=chunksize)
+            yield from self._postprocess_iter(chunks, _sql_source(dsn, query))
+
+    def read_sql_to_parquet(self, dsn: str, query: str, out_path: str,
+                            chunksize: int = 50_000, params=None) -> int:
+        """
+        Stream a query straight into one Parquet file, batch by batch.
+        The file schema is fixed once, from the first batch (_stream_schema),
+        and every batch is cast to it. Returns the number of rows written.
+        """
+        import pyarrow.parquet as pq
+        writer, schema, rows = None, None, 0
+        source = _sql_source(dsn, query)
+        try:
+            for chunk in self.read_sql_iter(dsn, query, chunksize, params):
+                table = _to_arrow(chunk)
+                if writer is None:
+                    schema = _stream_schema(table.schema)
+                    writer = pq.ParquetWriter(out_path, schema)
+                try:
+                    table = table.select(schema.names).cast(schema)
+                except (KeyError, pa.ArrowInvalid, pa.ArrowTypeError,
+                        pa.ArrowNotImplementedError) as e:
+                    raise ValueError(
+                        f"Batch after row {rows} does not fit the Parquet "
+                        f"schema of the first batch: {e}") from e
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        log.info(f"{source:15} | parquet → {out_path} ({rows:,} rows)")
+        return rows
+
+    def _mongo_batches(self, uri: str, db: str, coll: str, query: dict | None,
+                       projection: dict | list | None, batch: int,
+                       max_ms: int) -> Iterator[pd.DataFrame]:
+        """Raw Mongo frames of ≤ `batch` documents, fetched `batch` at a time."""
+        client = MongoClient(uri)
+        cursor = client[db][coll].find(query or {}, projection, batch_size=batch)
+        batcher = MicroBatcher.from_iterable(
+            cursor, max_records=batch, max_ms=max_ms, capacity=2 * batch)
+        try:
+            for df in batcher.frames():
+                yield df.drop(columns="_id", errors="ignore")
+        finally:
+            batcher.stop()          # the feeder may still be inside the cursor
+            cursor.close()
+            client.close()
+
+    def read_mongo(self, uri: str, db: str, coll: str, query: dict | None = None,
+                   projection: dict | list | None = None, batch: int = 10_000) -> pd.DataFrame:
+        """
+        `projection` is pushed down to find(); documents are pulled `batch` at
+        a time and built into one frame per batch, concatenated once.
+        """
+        frames = list(self._mongo_batches(uri, db, coll, query, projection, batch, 1_000))
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return self._postprocess(df, f"mongo:{db}.{coll}")
 
-    def read_mongo(self, uri: str, db: str, coll: str, query: dict | None = None) -> pd.DataFrame:
-        cursor = MongoClient(uri)[db][coll].find(query or {})
-        df = pd.DataFrame(list(cursor)).drop(columns="_id", errors="ignore")
-        return self._postprocess(df, "mongo")
+    def read_mongo_iter(self, uri: str, db: str, coll: str, query: dict | None = None,
+                        projection: dict | list | None = None, batch: int = 10_000,
+                        max_ms: int = 1_000) -> Iterator[pd.DataFrame]:
+        """
+        Yield post-processed frames of ≤ `batch` documents. At most two
+        batches are buffered ahead of the consumer, so memory ∝ batch.
+        """
+        yield from self._postprocess_iter(
+            self._mongo_batches(uri, db, coll, query, projection, batch, max_ms),
+            f"mongo:{db}.{coll}")
 
     def read_rest(self, url: str, *, params=None, headers=None) -> pd.DataFrame:
         payload = requests.get(
             url, params=params, headers=headers, timeout=20).json()
         df = pd.json_normalize(payload)
-        return self._postprocess(df, "rest")
-
-    def read_kafka(self, topic: str, bootstrap: str, batch: int = 10, group_id: str = "collector") -> pd.DataFrame:
-        rows = []
-        consumer = kafka.KafkaConsumer(
-            topic,
-            bootstrap_servers=bootstrap,
-            group_id=group_id,
-            auto_offset_reset="latest",
-            enable_auto_commit=False,
-            value_deserializer=lambda b: json.loads(b.decode()),
-        )
-        for _ in range(batch):
-            rows.append(next(consumer).value)
-        df = pd.DataFrame(rows)
-        return self._postprocess(df, "kafka")
+        return self._postprocess(df, _rest_source(url))
+
+    def read_rest_paginated(self, url: str, *, strategy: str = "offset",
+                            concurrency: int = 8, **paging) -> pd.DataFrame:
+        """
+        Walk every page of a paginated JSON API and post-process the result once.
+
+            collector.read_rest_paginated(
+                "https://api/x", strategy="offset", records_path="data",
+                page_size=500, total_path="meta.total", concurrency=16)
+
+        `paging` is forwarded to RestPaginator (params, headers, records_path,
+        page_size, max_pages, *_param names, cursor_path, total_path, retries,
+        backoff, timeout). Offset/page strategies fetch up to `concurrency`
+        pages at once over one pooled session; cursor pagination is sequential.
+        """
+        pager = RestPaginator(url, strategy=strategy, concurrency=concurrency, **paging)
+        frames = [f for f in pager.run() if not f.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        s = pager.stats
+        log.info(f"{'rest':15} | pages={s['pages']} | records={s['records']:,} "
+                 f"| retries={s['retries']} | {s['seconds']}s")
+        return self._postprocess(df, _rest_source(url))
+
+    def kafka_reader(self, topic: str, bootstrap: str, group_id: str = "collector",
+                     **reader_kw) -> KafkaBatchReader:
+        """
+        Long-lived reader per (topic, bootstrap, group), reused across reads.
+        A call with different `reader_kw` closes the cached reader and builds
+        a new one with them.
+        """
+        key = (topic, bootstrap, group_id)
+        cached = self._kafka_readers.get(key)
+        if cached is not None and cached[1] != reader_kw:
+            log.info(f"{'kafka:' + topic:15} | reader options changed → new consumer")
+            cached[0].close()
+            cached = None
+        if cached is None:
+            cached = (KafkaBatchReader(topic, bootstrap, group_id=group_id, **reader_kw),
+                      dict(reader_kw))
+            self._kafka_readers[key] = cached
+        return cached[0]
+
+    def read_kafka(self, topic: str, bootstrap: str, batch: int = 5_000, group_id: str = "collector",
+                   timeout: float | None = None, **reader_kw) -> pd.DataFrame:
+        """
+        Poll up to `batch` records in bulk, post-process them, and only then
+        commit the consumer offsets (a failed _postprocess re-delivers).
+        An idle topic keeps being polled for up to `timeout` seconds (default:
+        one poll round); if nothing arrives, an empty frame is returned.
+        """
+        reader = self.kafka_reader(topic, bootstrap, group_id, **reader_kw)
+        deadline = time.monotonic() + (timeout or 0)
+        raw = reader.poll_frame(batch)
+        while raw.empty and time.monotonic() < deadline:
+            raw = reader.poll_frame(batch)
+        if raw.empty:
+            log.info(f"{'kafka':15} | no records on '{topic}' → empty frame")
+            return raw
+        try:
+            df = self._postprocess(raw, f"kafka:{topic}")
+        except Exception:
+            reader.rollback()
+            raise
+        reader.commit()
+        log.info(f"{'kafka':15} | records={reader.metrics['records']:,} "
+                 f"| {reader.records_per_sec:,.0f} rec/s")
+        return df
+
+    def read_kafka_iter(self, topic: str, bootstrap: str, batch: int = 5_000,
+                        group_id: str = "collector", max_batches: int | None = None,
+                        **reader_kw) -> Iterator[pd.DataFrame]:
+        """
+        Yield post-processed batches until the topic goes idle (an empty poll)
+        or `max_batches` is reached. Batches go through _postprocess_iter, so
+        they share the first batch's recipes and one aggregated audit; each
+        is committed once processed, and a failure rewinds to the last commit.
+        """
+        if max_batches == 0:
+            return
+        reader = self.kafka_reader(topic, bootstrap, group_id, **reader_kw)
+        first = reader.poll_frame(batch)
+        if first.empty:
+            log.info(f"{'kafka':15} | batches=0 | topic idle")
+            return
+
+        def batches() -> Iterator[pd.DataFrame]:
+            df, n = first, 0
+            while True:
+                yield df
+                n += 1
+                if max_batches is not None and n >= max_batches:
+                    return                      # don't poll what won't be committed
+                df = reader.poll_frame(batch)
+                if df.empty:
+                    return
+
+        n = 0
+        try:
+            for df in self._postprocess_iter(batches(), f"kafka:{topic}"):
+                reader.commit()
+                n += 1
+                yield df
+        except Exception:
+            reader.rollback()
+            raise
+        log.info(f"{'kafka':15} | batches={n} | records={reader.metrics['records']:,} "
+                 f"| {reader.records_per_sec:,.0f} rec/s")
 
     def read_gsheet(self, sheet_key: str, creds_json: str) -> pd.DataFrame:
         sheet = gspread.service_account(
             filename=creds_json).open_by_key(sheet_key).sheet1
         df = pd.DataFrame(sheet.get_all_records())
-        return self._postprocess(df, "gsheet")
-
-    def read_mqtt(self, broker: str, topic: str, timeout: int = 5) -> pd.DataFrame:
-        rows = []
-        def on_msg(client, _, msg): rows.append(json.loads(msg.payload))
+        return self._postprocess(df, f"gsheet:{sheet_key}")
+
+    def _mqtt_batches(self, broker: str, topic: str, batch: int, max_ms: int,
+                      duration: float | None, capacity: int | None,
+                      overflow: str) -> Iterator[pd.DataFrame]:
+        """Raw MQTT frames flushed every `batch` messages or `max_ms` ms."""
+        batcher = MicroBatcher(max_records=batch, max_ms=max_ms,
+                               capacity=capacity, overflow=overflow)
+        def on_msg(client, _, msg): batcher.put(json.loads(msg.payload))
         client = mqtt.Client()
+        client.on_message = on_msg
         client.connect(broker)
         client.subscribe(topic)
-        client.on_message = on_msg
         client.loop_start()
-        time.sleep(timeout)
-        client.loop_stop()
-        df = pd.DataFrame(rows)
-        return self._postprocess(df, "mqtt")
+        timer = None
+        if duration is not None:
+            timer = threading.Timer(duration, batcher.close)
+            timer.daemon = True
+            timer.start()
+        try:
+            yield from batcher.frames()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            batcher.close()
+            client.loop_stop()
+            client.disconnect()
+            m = batcher.metrics
+            log.info(f"{'mqtt':15} | messages={m['records']:,} | batches={m['batches']} "
+                     f"| dropped={m['dropped']:,} | blocked={m['blocked_seconds']:.2f}s")
+
+    def read_mqtt(self, broker: str, topic: str, timeout: int = 5,
+                  max_records: int | None = None) -> pd.DataFrame:
+        """
+        Collect messages for `timeout` seconds, or stop as soon as
+        `max_records` messages have arrived.
+        """
+        frames, n = [], 0
+        for df in self._mqtt_batches(broker, topic, max_records or 5_000, 1_000,
+                                     timeout, None, "block"):
+            frames.append(df)
+            n += len(df)
+            if max_records and n >= max_records:
+                break
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if max_records:
+            df = df.head(max_records)
+        return self._postprocess(df, f"mqtt:{topic}")
+
+    def read_mqtt_iter(self, broker: str, topic: str, batch: int = 1_000,
+                       max_ms: int = 500, duration: float | None = None,
+                       capacity: int | None = None,
+                       overflow: str = "block") -> Iterator[pd.DataFrame]:
+        """
+        Yield post-processed micro-batches: a batch is flushed at `batch`
+        messages or `max_ms` ms after its first message, whichever comes first.
+        At most `capacity` messages (default 4×batch) are buffered. When full,
+        "block" stalls the client loop and "drop_oldest" overwrites.
+        Runs until `duration` seconds have passed, or until the caller stops.
+        """
+        yield from self._postprocess_iter(
+            self._mqtt_batches(broker, topic, batch, max_ms, duration,
+                               capacity, overflow), f"mqtt:{topic}")
 
 
 """
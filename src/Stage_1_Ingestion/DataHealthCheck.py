@@ -1,13 +1,21 @@
+import time
+
 import pandas as pd
-import numpy as np
 import scipy.stats as ss
-from itertools import combinations
-from statsmodels.stats.outliers_influence import variance_inflation_factor
 from functools import partial
 
+from .collinearity import correlated_pairs, vif_scores
+from .column_stats import fused_column_stats
+from .detector_pool import run_detectors
+from .sketches import DEFAULT_SAMPLE_ROWS, HealthSketch
+
 # TODO: ADD Constant from .yaml file from config.basic.DATASET_TARGET_COLUMN_NAME
 DATASET_TARGET_COLUMN_NAME = "label"
 
+DETECTORS = ["dimensionality", "missingness", "dtypes", "skew_scale",
+             "categorical_cardinality", "outliers", "collinearity", "vif",
+             "imbalance", "date_issues", "batch_summary"]
+
 
 class DataHealthCheck:
     def __init__(self, df: pd.DataFrame,
@@ -22,6 +30,36 @@ class DataHealthCheck:
         self.batch_col = batch_col
         self.datetime_cols = datetime_cols or []
         self.results = {}
+        self.timings = {}
+        self._stats = None
+
+    @classmethod
+    def from_sketch(cls, sketch: HealthSketch, **kwargs) -> "DataHealthCheck":
+        """
+        Health check over data that never sat in memory as one frame: the
+        per-column detectors use the sketch estimates (see sketches.py for
+        error bounds), the rest run on the sketch's row sample.
+        """
+        check = cls(sketch.sample, **kwargs)
+        check.n_rows = check.n = sketch.n_rows
+        check._stats = sketch.stats()
+        return check
+
+    @classmethod
+    def from_chunks(cls, chunks, sample_rows: int = DEFAULT_SAMPLE_ROWS,
+                    **kwargs) -> "DataHealthCheck":
+        """e.g. DataHealthCheck.from_chunks(collector.read_file_iter("big.csv"))"""
+        sketch = HealthSketch(sample_rows=sample_rows)
+        for chunk in chunks:
+            sketch.update(chunk)
+        return cls.from_sketch(sketch, **kwargs)
+
+    @property
+    def stats(self) -> pd.DataFrame:
+        """Per-column statistics from one fused pass, shared by the detectors."""
+        if self._stats is None:
+            self._stats = fused_column_stats(self.df)
+        return self._stats
 
     def detect_dimensionality(self):
         ratio = self.p / self.n
@@ -35,7 +73,7 @@ class DataHealthCheck:
         }
 
     def detect_missingness(self):
-        miss = self.df.isna().mean().sort_values(ascending=False)
+        miss = self.stats['null_pct'].sort_values(ascending=False)
         self.results['missingness'] = {
             'overall_pct': miss.mean(),
             'top_missing_cols': miss.head(10).to_dict()
@@ -46,45 +84,36 @@ class DataHealthCheck:
         self.results['dtypes'] = counts
 
     def detect_skew_scale(self):
-        num = self.df.select_dtypes(include=[np.number])
-        skew = num.skew().sort_values(ascending=False).head(10).to_dict()
+        num = self.stats[self.stats['numeric']]
+        skew = num['skew'].sort_values(ascending=False).head(10).to_dict()
         self.results['skewness'] = skew
 
     def detect_categorical_cardinality(self):
-        cats = self.df.select_dtypes(include=['object', 'category'])
-        card = {c: cats[c].nunique() for c in cats.columns}
+        cats = self.df.head(0).select_dtypes(include=['object', 'category'])
+        card = self.stats.loc[cats.columns, 'distinct'].to_dict()
         card = dict(
             sorted(card.items(), key=lambda kv: kv[1], reverse=True)[:10])
         self.results['cardinality'] = card
 
     def detect_outliers(self):
-        out = {}
-        num = self.df.select_dtypes(include=[np.number])
-        for col in num.columns[:50]:  # limit to first 50 for speed
-            q1, q3 = np.nanpercentile(num[col], [25, 75])
-            iqr = q3 - q1
-            low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
-            out[col] = int(((num[col] < low) | (num[col] > high)).sum())
+        # IQR fences for every numeric column, from the fused quartiles
+        out = self.stats.loc[self.stats['numeric'], 'iqr_outliers'].to_dict()
         # top 10 outlier counts
         self.results['outliers'] = dict(
             sorted(out.items(), key=lambda kv: kv[1], reverse=True)[:10])
 
+    def _numeric_columns(self) -> pd.Index:
+        return self.stats.index[self.stats['numeric']]
+
     def detect_collinearity(self, thresh=0.9):
-        num = self.df.select_dtypes(
-            include=[np.number]).iloc[:, :200]  # cap for performance
-        corr = num.corr().abs()
-        pairs = [(i, j, corr.loc[i, j]) for i, j in combinations(
-            corr.columns, 2) if corr.loc[i, j] > thresh]
-        pairs = sorted(pairs, key=lambda x: x[2], reverse=True)[:10]
+        # blocked correlation over all numeric columns, |r| > thresh only
+        pairs = correlated_pairs(self.df[self._numeric_columns()], thresh)[:10]
         self.results['collinearity'] = [
-            {'pair': (i, j), 'corr': f"{c:.2f}"} for i, j, c in pairs]
+            {'pair': (i, j), 'corr': f"{abs(c):.2f}"} for i, j, c in pairs]
 
     def detect_vif(self):
-        num = self.df.select_dtypes(
-            include=[np.number]).dropna().iloc[:, :20]  # small subset
-        X = num.values
-        vifs = {num.columns[i]: variance_inflation_factor(
-            X, i) for i in range(X.shape[1])}
+        # diag of the inverse correlation matrix (centred VIF): one factorization
+        vifs = vif_scores(self.df[self._numeric_columns()]).dropna().to_dict()
         self.results['vif'] = dict(
             sorted(vifs.items(), key=lambda kv: kv[1], reverse=True)[:10])
 
@@ -120,62 +149,72 @@ class DataHealthCheck:
                 '</style></head><body>']
         html.append(f"<h1>DataFrame Health Report</h1>")
         # Dimensionality
-        d = self.results['dimensionality']
-        html.append("<h2>1. Dimensionality</h2>")
-        html.append(
-            f"<p>Rows: {d['n_rows']}, Columns: {d['n_cols']} &nbsp; (<strong>{d['regime']}</strong>, ratio={d['ratio']})</p>")
+        if 'dimensionality' in self.results:
+            d = self.results['dimensionality']
+            html.append("<h2>1. Dimensionality</h2>")
+            html.append(
+                f"<p>Rows: {d['n_rows']}, Columns: {d['n_cols']} &nbsp; (<strong>{d['regime']}</strong>, ratio={d['ratio']})</p>")
 
         # Missingness
-        m = self.results['missingness']
-        html.append("<h2>2. Missingness</h2>")
-        html.append(f"<p>Overall missing: {m['overall_pct']*100:.2f}%</p>")
-        html.append("<table><tr><th>Column</th><th>% Missing</th></tr>")
-        for col, pct in m['top_missing_cols'].items():
-            html.append(f"<tr><td>{col}</td><td>{pct*100:.1f}%</td></tr>")
-        html.append("</table>")
+        if 'missingness' in self.results:
+            m = self.results['missingness']
+            html.append("<h2>2. Missingness</h2>")
+            html.append(f"<p>Overall missing: {m['overall_pct']*100:.2f}%</p>")
+            html.append("<table><tr><th>Column</th><th>% Missing</th></tr>")
+            for col, pct in m['top_missing_cols'].items():
+                html.append(f"<tr><td>{col}</td><td>{pct*100:.1f}%</td></tr>")
+            html.append("</table>")
 
         # dtypes
-        html.append(
-            "<h2>3. Data Types</h2><table><tr><th>dtype</th><th>count</th></tr>")
-        for dt, cnt in self.results['dtypes'].items():
-            html.append(f"<tr><td>{dt}</td><td>{cnt}</td></tr>")
-        html.append("</table>")
+        if 'dtypes' in self.results:
+            html.append(
+                "<h2>3. Data Types</h2><table><tr><th>dtype</th><th>count</th></tr>")
+            for dt, cnt in self.results['dtypes'].items():
+                html.append(f"<tr><td>{dt}</td><td>{cnt}</td></tr>")
+            html.append("</table>")
 
         # Skewness
-        html.append(
-            "<h2>4. Top Skewed Numeric Features</h2><table><tr><th>Feature</th><th>Skew</th></tr>")
-        for col, sk in self.results['skewness'].items():
-            html.append(f"<tr><td>{col}</td><td>{sk:.2f}</td></tr>")
-        html.append("</table>")
+        if 'skewness' in self.results:
+            html.append(
+                "<h2>4. Top Skewed Numeric Features</h2><table><tr><th>Feature</th><th>Skew</th></tr>")
+            for col, sk in self.results['skewness'].items():
+                html.append(f"<tr><td>{col}</td><td>{sk:.2f}</td></tr>")
+            html.append("</table>")
 
         # Cardinality
-        html.append(
-            "<h2>5. Categorical Cardinality (Top 10)</h2><table><tr><th>Feature</th><th>#Levels</th></tr>")
-        for col, lvl in self.results['cardinality'].items():
-            html.append(f"<tr><td>{col}</td><td>{lvl}</td></tr>")
-        html.append("</table>")
+        if 'cardinality' in self.results:
+            html.append(
+                "<h2>5. Categorical Cardinality (Top 10)</h2><table><tr><th>Feature</th><th>#Levels</th></tr>")
+            for col, lvl in self.results['cardinality'].items():
+                html.append(f"<tr><td>{col}</td><td>{lvl}</td></tr>")
+            html.append("</table>")
 
         # Outliers
-        html.append(
-            "<h2>6. Univariate Outlier Counts (Top 10)</h2><table><tr><th>Feature</th><th>Outliers</th></tr>")
-        for col, cnt in self.results['outliers'].items():
-            html.append(f"<tr><td>{col}</td><td>{cnt}</td></tr>")
-        html.append("</table>")
+        if 'outliers' in self.results:
+            html.append(
+                "<h2>6. Univariate Outlier Counts (Top 10)</h2><table><tr><th>Feature</th><th>Outliers</th></tr>")
+            for col, cnt in self.results['outliers'].items():
+                html.append(f"<tr><td>{col}</td><td>{cnt}</td></tr>")
+            html.append("</table>")
 
         # Collinearity
-        html.append(
-            "<h2>7. Strongly Correlated Pairs (r>0.9)</h2><table><tr><th>Pair</th><th>Correlation</th></tr>")
-        for rec in self.results['collinearity']:
+        if 'collinearity' in self.results:
             html.append(
-                f"<tr><td>{rec['pair']}</td><td>{rec['corr']}</td></tr>")
-        html.append("</table>")
+                "<h2>7. Strongly Correlated Pairs (r>0.9)</h2><table><tr><th>Pair</th><th>Correlation</th></tr>")
+            for rec in self.results['collinearity']:
+                html.append(
+                    f"<tr><td>{rec['pair']}</td><td>{rec['corr']}</td></tr>")
+            html.append("</table>")
 
         # VIF
-        html.append(
-            "<h2>8. VIF (Top 10)</h2><table><tr><th>Feature</th><th>VIF</th></tr>")
-        for col, v in self.results['vif'].items():
-            html.append(f"<tr><td>{col}</td><td>{v:.2f}</td></tr>")
-        html.append("</table>")
+        if 'vif' in self.results:
+            html.append(
+                "<h2>8. VIF (Top 10)</h2>"
+                "<p>Centred VIF: each column regressed on the others with an intercept.</p>"
+                "<table><tr><th>Feature</th><th>VIF</th></tr>")
+            for col, v in self.results['vif'].items():
+                html.append(f"<tr><td>{col}</td><td>{v:.2f}</td></tr>")
+            html.append("</table>")
 
         # Imbalance
         if 'imbalance' in self.results:
@@ -202,36 +241,56 @@ class DataHealthCheck:
                 html.append(f"<tr><td>{b}</td><td>{pct*100:.1f}%</td></tr>")
             html.append("</table>")
 
+        # Detector timings
+        if self.timings:
+            html.append("<h2>12. Detector Timings</h2><table><tr><th>Detector</th>"
+                        "<th>Wall-clock (s)</th><th>Peak memory (MB)</th><th>Mode</th></tr>")
+            for name, t in self.timings.items():
+                mem = "–" if t['peak_mb'] is None else f"{t['peak_mb']:.1f}"
+                mode = f"failed: {t['error']}" if t['mode'] == 'failed' else t['mode']
+                html.append(f"<tr><td>{name}</td><td>{t['seconds']:.2f}</td>"
+                            f"<td>{mem}</td><td>{mode}</td></tr>")
+            html.append("</table>")
+
         html.append("</body></html>")
         html_report = "\n".join(html)
         with open("DataHealthReport.html", "w") as f:
             f.write(html_report)
         return html_report
 
-    def run_all_checks(self):
-        """Run all health checks and generate a report."""
+    def _sampled(self, sample_rows: int) -> "DataHealthCheck":
+        """Down-sampled copy for detectors that overrun their time budget."""
+        check = DataHealthCheck(self.df.sample(n=sample_rows, random_state=0),
+                                self.target_col, self.batch_col, self.datetime_cols)
+        check.n_rows = check.n = self.n_rows
+        check.stats                     # build once, before workers fork
+        return check
+
+    def run_all_checks(self, n_jobs: int = None, budget: float = None,
+                       backend: str = None, sample_rows: int = DEFAULT_SAMPLE_ROWS,
+                       track_memory: bool = True):
+        """
+        Run all health checks concurrently and generate a report.
+
+        n_jobs       detectors in flight at once (default: one per CPU)
+        budget       seconds per detector; an overrun is re-run on a
+                     `sample_rows` row sample (mode "sampled" in the report)
+        backend      "process" (forked, default where available) or "thread"
+        """
         print("Running data health checks...")
-        self.detect_dimensionality()
-        print("Running data health detect_dimensionality...")
-        self.detect_missingness()
-        print("Running data health detect_missingness...")
-        self.detect_dtypes()
-        print("Running data health detect_dtypes...")
-        self.detect_skew_scale()
-        print("Running data health detect_skew_scale...")
-        self.detect_categorical_cardinality()
-        print("Running data health detect_categorical_cardinality...")
-        self.detect_outliers()
-        print("Running data health detect_outliers...")
-        self.detect_collinearity()
-        print("Running data health detect_collinearity...")
-        self.detect_vif()
-        print("Running data health detect_multi_Collinearity...")
-        self.detect_imbalance()
-        print("Running data health detect_imbalance...")
-        self.detect_date_issues()
-        print("Running data health detect_date_issues...")
-        self.detect_batch_summary()
-        print("Running data health detect_batch_summary...")
+        t0 = time.perf_counter()
+        self.stats                      # shared table, built before fan-out
+        self.timings = {"column_stats": {
+            "seconds": time.perf_counter() - t0, "peak_mb": None, "mode": "full"}}
+        sampled = partial(self._sampled, sample_rows) \
+            if len(self.df) > sample_rows else None
+        results, timings = run_detectors(
+            self, DETECTORS, n_jobs=n_jobs, budget=budget, backend=backend,
+            sampled=sampled, track_memory=track_memory)
+        self.results.update(results)
+        self.timings.update(timings)
+        for name, t in timings.items():
+            print(f"Running data health detect_{name}... "
+                  f"{t['seconds']:.2f}s ({t['mode']})")
         print("Generating HTML report...")
         return self.generate_report()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+benchmarks.py – micro-benchmarks for the Phase 1 ingestion engines
+
+Usage:
+    python -m src.Stage_1_Ingestion.benchmarks semantic --rows 1000000 --cols 100
+    python -m src.Stage_1_Ingestion.benchmarks pushdown --rows 200000 --cols 300
+    python -m src.Stage_1_Ingestion.benchmarks sketch --rows 1000000 --cols 12
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from .column_stats import fused_column_stats
+from .DataCollector import _profile_columns, _read_parquet
+from .sketches import KLL_RANK_ERROR, HealthSketch, HyperLogLog
+
+
+def make_mixed_frame(n_rows: int, n_cols: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic raw extract: every column arrives as strings/objects the way a
+    CSV reader would hand them over, cycling through the semantic types the
+    profiler knows about (plus ~2 % nulls).
+    """
+    rng = np.random.default_rng(seed)
+    levels = np.array(["red", "green", "blue", "amber"], dtype=object)
+    days = pd.date_range("2020-01-01", periods=2_000, freq="D").strftime("%Y-%m-%d")
+    makers = [
+        lambda: rng.normal(size=n_rows).round(3).astype(str),
+        lambda: rng.integers(0, 10_000, n_rows).astype(str),
+        lambda: levels[rng.integers(0, len(levels), n_rows)],
+        lambda: np.asarray(days)[rng.integers(0, len(days), n_rows)],
+        lambda: np.char.add(rng.integers(0, 50_000, n_rows).astype(str), "@mail.com"),
+        lambda: np.char.zfill(rng.integers(0, 99_999, n_rows).astype(str), 5),
+        lambda: np.char.add("$", rng.integers(1, 999, n_rows).astype(str)),
+        lambda: np.array(["yes", "no"], dtype=object)[rng.integers(0, 2, n_rows)],
+    ]
+    cols = {}
+    for i in range(n_cols):
+        values = pd.Series(makers[i % len(makers)](), dtype=object)
+        values[rng.random(n_rows) < 0.02] = None
+        cols[f"c{i:03d}"] = values
+    return pd.DataFrame(cols)
+
+
+def benchmark_semantic_profile(n_rows: int = 1_000_000, n_cols: int = 100,
+                               seed: int = 0) -> dict:
+    """
+    Time the vectorized semantic engine against the per-cell reference on the
+    same frame and check that both produce the same profiling report.
+    """
+    df = make_mixed_frame(n_rows, n_cols, seed)
+    timings, reports = {}, {}
+    for engine in ("vectorized", "percell"):
+        t0 = time.perf_counter()
+        _, reports[engine] = _profile_columns(df, engine)
+        timings[engine] = round(time.perf_counter() - t0, 3)
+
+    mismatched = [c for c in df.columns
+                  if reports["vectorized"][c] != reports["percell"][c]]
+    return {
+        "rows": n_rows,
+        "cols": n_cols,
+        "seconds": timings,
+        "speedup": round(timings["percell"] / max(timings["vectorized"], 1e-9), 1),
+        "report_identical": not mismatched,
+        "mismatched_columns": mismatched,
+    }
+
+
+class _CountingFile(io.FileIO):
+    """Local file that records how many bytes the reader actually pulled."""
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer):
+        n = super().readinto(buffer)
+        self.bytes_read += n or 0
+        return n
+
+
+def benchmark_parquet_pushdown(n_rows: int = 200_000, n_cols: int = 300,
+                               keep_cols: int = 20, keep_frac: float = 0.1,
+                               path: str = "bench_pushdown.parquet") -> dict:
+    """
+    Bytes read + decode time for a Parquet source: the old whole-object path
+    (BytesIO of the full file → pd.read_parquet) versus projection/predicate
+    pushdown through _read_parquet. Rows are sorted on `k` so row-group
+    statistics can prune, as they would on a time-partitioned extract.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(n_rows, n_cols)),
+                      columns=[f"c{i:03d}" for i in range(n_cols)])
+    df["k"] = np.arange(n_rows)
+    df.to_parquet(path, index=False, row_group_size=max(n_rows // 20, 1))
+    columns = list(df.columns[:keep_cols])
+    filters = [("k", ">=", int(n_rows * (1 - keep_frac)))]
+    del df
+
+    t0 = time.perf_counter()
+    with open(path, "rb") as f:
+        blob = f.read()
+    full = pd.read_parquet(io.BytesIO(blob))
+    t_full = time.perf_counter() - t0
+    bytes_full = len(blob)
+    del full, blob
+
+    t0 = time.perf_counter()
+    with _CountingFile(path, "rb") as f:
+        part = _read_parquet(f, columns, filters)
+        bytes_part = f.bytes_read
+    t_part = time.perf_counter() - t0
+
+    os.remove(path)
+    return {
+        "rows": n_rows,
+        "cols": n_cols,
+        "selected": {"cols": keep_cols, "rows": len(part)},
+        "bytes_read": {"full": bytes_full, "pushdown": bytes_part},
+        "seconds": {"full": round(t_full, 3), "pushdown": round(t_part, 3)},
+    }
+
+
+def benchmark_sketch_accuracy(n_rows: int = 1_000_000, n_cols: int = 12,
+                              n_chunks: int = 20, n_workers: int = 4) -> dict:
+    """
+    Sketch estimates against fused_column_stats on the same frame. The frame
+    is fed in `n_chunks` chunks to `n_workers` sketches, which are pickled
+    (as if returned from worker processes) and merged. Reports the worst
+    error per statistic next to its documented bound.
+    """
+    rng = np.random.default_rng(0)
+    makers = [
+        lambda: rng.normal(size=n_rows),
+        lambda: rng.lognormal(size=n_rows),
+        lambda: rng.integers(0, 5_000, n_rows),
+        lambda: rng.exponential(size=n_rows).round(2),
+        lambda: rng.choice(["a", "b", "c", "d"], n_rows),
+        lambda: rng.integers(0, n_rows // 3, n_rows).astype(str),
+    ]
+    df = pd.DataFrame({f"c{i:03d}": makers[i % len(makers)]() for i in range(n_cols)})
+    df.iloc[rng.random(n_rows) < 0.05, 0] = np.nan
+
+    t0 = time.perf_counter()
+    exact = fused_column_stats(df)
+    t_exact = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    workers = []
+    for w, part in enumerate(np.array_split(np.arange(n_rows), n_workers)):
+        sketch = HealthSketch(seed=w)
+        for rows in np.array_split(part, max(n_chunks // n_workers, 1)):
+            sketch.update(df.iloc[rows])
+        workers.append(pickle.loads(pickle.dumps(sketch)))
+    merged = workers[0]
+    for sketch in workers[1:]:
+        merged.merge(sketch)
+    est = merged.stats()
+    t_sketch = time.perf_counter() - t0
+
+    num = exact.index[exact["numeric"]]
+    rank_err = 0.0
+    for col in num:
+        values = np.sort(df[col].dropna().to_numpy(dtype=np.float64))
+        for q, stat in ((0.25, "q1"), (0.5, "median"), (0.75, "q3")):
+            lo = np.searchsorted(values, est.loc[col, stat], "left")
+            hi = np.searchsorted(values, est.loc[col, stat], "right")
+            target = q * (len(values) - 1)
+            rank_err = max(rank_err, max(lo - target - 1, target - hi, 0) / len(values))
+    rel = lambda a, b: float(np.nanmax(np.abs(a - b) / np.maximum(np.abs(b), 1e-12)))
+    errors = {
+        "quartile_rank": round(rank_err, 5),
+        "iqr_outliers_over_n": round(float(
+            (np.abs(est.loc[num, "iqr_outliers"] - exact.loc[num, "iqr_outliers"])
+             / exact.loc[num, "count"]).max()), 5),
+        "distinct_relative": round(rel(est["distinct"], exact["distinct"]), 5),
+        "moments_relative": rel(est.loc[num, ["mean", "std", "skew"]].to_numpy(),
+                                exact.loc[num, ["mean", "std", "skew"]].to_numpy()),
+        "nulls_exact": bool((est["nulls"] == exact["nulls"]).all()),
+        "min_max_exact": bool(np.allclose(est.loc[num, ["min", "max"]],
+                                          exact.loc[num, ["min", "max"]], rtol=0, atol=0)),
+    }
+    bounds = {
+        "quartile_rank": KLL_RANK_ERROR,
+        "iqr_outliers_over_n": 2 * KLL_RANK_ERROR,
+        "distinct_relative": 3 * HyperLogLog().relative_error,
+        "moments_relative": 1e-9,
+    }
+    return {
+        "rows": n_rows,
+        "cols": n_cols,
+        "chunks": n_chunks,
+        "workers": n_workers,
+        "seconds": {"exact": round(t_exact, 3), "sketch": round(t_sketch, 3)},
+        "sketch_bytes": len(pickle.dumps({c: s for c, s in merged.columns.items()})),
+        "errors": errors,
+        "bounds": bounds,
+        "within_bounds": all(errors[k] <= v for k, v in bounds.items())
+        and errors["nulls_exact"] and errors["min_max_exact"],
+    }
+
+
+BENCHMARKS = {
+    "semantic": benchmark_semantic_profile,
+    "pushdown": benchmark_parquet_pushdown,
+    "sketch": benchmark_sketch_accuracy,
+}
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Phase 1 ingestion benchmarks")
+    p.add_argument("name", choices=sorted(BENCHMARKS))
+    p.add_argument("--rows", type=int, help="n_rows (benchmark default if omitted)")
+    p.add_argument("--cols", type=int, help="n_cols (benchmark default if omitted)")
+    args = p.parse_args()
+    kwargs = {k: v for k, v in (("n_rows", args.rows), ("n_cols", args.cols))
+              if v is not None}
+    print(json.dumps(BENCHMARKS[args.name](**kwargs), indent=2))
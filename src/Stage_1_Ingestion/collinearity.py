@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+collinearity.py – blocked correlation thresholding and closed-form VIF
+
+correlation_matrix(df)
+    The full Pearson matrix in one matrix product (DataFrame.corr() values).
+correlated_pairs(df, thresh)
+    Pearson r for every column pair, computed block by block with matrix
+    products. Only pairs with |r| > thresh are kept, so no p × p matrix is
+    built: besides the centred n × p copy of the data (with nulls, also its
+    validity mask and squares: three n × p float64 arrays), each step holds
+    one block × block result. Columns with nulls use pairwise-complete
+    observations, like DataFrame.corr().
+vif_scores(df)
+    Variance inflation factors for all columns from ONE factorization:
+    VIF_i = (R⁻¹)_ii for the correlation matrix R of the complete rows,
+    which equals 1 / (1 − R²_i) of regressing column i (with intercept) on
+    the others, i.e. statsmodels' variance_inflation_factor on
+    add_constant(X). R comes from the centred Gram matrix, accumulated over
+    row blocks (memory O(ROW_BLOCK × p + p²)). NB: statsmodels < 0.15 called
+    on the raw matrix, as DataHealthCheck / EDAnalyzer used to, regresses
+    without an intercept (unless X has a constant column) and reports an
+    uncentred R², so columns with a nonzero mean got larger VIFs there. A singular R falls back to an
+    eigen-decomposition pseudo-inverse; columns lying in its null space get
+    VIF = inf.
+centered(df)
+    The shared preprocessing step: column-centred values + validity mask,
+    as n × p float64 copies (also used by associations.AssociationEngine.correlation_ratio).
+
+They serve DataHealthCheck (detect_collinearity / detect_vif) and
+EDAnalyzer (bivariate / multivariate).
+"""
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import linalg
+
+BLOCK_SIZE = 1_024
+ROW_BLOCK = 65_536          # rows per step when accumulating the VIF Gram matrix
+
+
+def centered(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Column-centred float64 matrix with NaNs set to 0, plus the validity mask
+    (None if complete). Constant columns become exactly 0, so their r and
+    VIF come out NaN instead of rounding noise.
+    """
+    x = df.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(x)
+    complete = valid.all()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        constant = ~(np.nanmax(x, axis=0) > np.nanmin(x, axis=0))
+        x = x - (x.mean(axis=0) if complete else np.nanmean(x, axis=0))
+    x[:, constant] = 0.0
+    if complete:
+        return x, None
+    x[~valid] = 0.0
+    return x, valid.astype(np.float64)
+
+
+def _corr_block(x: np.ndarray, mask: np.ndarray | None, sq: np.ndarray,
+                a: slice, b: slice) -> np.ndarray:
+    """
+    Pearson r between column blocks a and b. `sq` is the per-column sum of
+    squares for complete data, otherwise the elementwise x² matrix.
+    """
+    xa, xb = x[:, a], x[:, b]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if mask is None:
+            r = (xa.T @ xb) / np.sqrt(np.outer(sq[a], sq[b]))
+        else:
+            ma, mb = mask[:, a], mask[:, b]
+            qa, qb = sq[:, a], sq[:, b]
+            n = ma.T @ mb                                # pairwise-complete counts
+            sx, sy = xa.T @ mb, ma.T @ xb
+            cov = xa.T @ xb - sx * sy / n
+            var_x = qa.T @ mb - sx * sx / n
+            var_y = ma.T @ qb - sy * sy / n
+            r = cov / np.sqrt(var_x * var_y)
+            r[n < 2] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def correlation_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """Pearson r of all column pairs, pairwise-complete; NaN for constant columns."""
+    x, mask = centered(df)
+    sq = (x * x).sum(axis=0) if mask is None else x * x
+    every = slice(0, x.shape[1])
+    r = _corr_block(x, mask, sq, every, every)
+    np.fill_diagonal(r, np.where(np.isnan(np.diag(r)), np.nan, 1.0))
+    return pd.DataFrame(r, index=df.columns, columns=df.columns)
+
+
+def correlated_pairs(df: pd.DataFrame, thresh: float = 0.9,
+                     block_size: int = BLOCK_SIZE) -> list[tuple[str, str, float]]:
+    """(col_i, col_j, r) for every pair with |r| > thresh, strongest first."""
+    x, mask = centered(df)
+    sq = (x * x).sum(axis=0) if mask is None else x * x
+    p = x.shape[1]
+    rows, cols, vals = [], [], []
+    for a0 in range(0, p, block_size):
+        a = slice(a0, min(a0 + block_size, p))
+        for b0 in range(a0, p, block_size):
+            b = slice(b0, min(b0 + block_size, p))
+            r = _corr_block(x, mask, sq, a, b)
+            hit = np.abs(r) > thresh
+            if a0 == b0:
+                hit = np.triu(hit, k=1)
+            i, j = np.nonzero(hit)
+            rows.append(i + a0)
+            cols.append(j + b0)
+            vals.append(r[i, j])
+    if not rows:
+        return []
+    i, j, r = np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)
+    order = np.lexsort((j, i, -np.abs(r)))
+    names = df.columns
+    return [(names[i[k]], names[j[k]], float(r[k])) for k in order]
+
+
+def _inverse_diagonal(corr: np.ndarray) -> np.ndarray:
+    """diag(R⁻¹) via Cholesky; eigen pseudo-inverse if R is singular."""
+    try:
+        chol = linalg.cholesky(corr, lower=True)
+        inv_chol = linalg.solve_triangular(chol, np.eye(len(corr)), lower=True)
+        return (inv_chol * inv_chol).sum(axis=0)
+    except linalg.LinAlgError:
+        w, v = np.linalg.eigh(corr)
+        keep = w > w.max() * len(w) * np.finfo(np.float64).eps
+        diag = (v[:, keep] ** 2 / w[keep]).sum(axis=1)
+        # any weight on a zero-eigenvalue direction → exact linear dependence
+        diag[(v[:, ~keep] ** 2).sum(axis=1) > 1e-8] = np.inf
+        return diag
+
+
+def _complete_blocks(df: pd.DataFrame):
+    """Row blocks of df as float64, rows with any null dropped."""
+    for start in range(0, len(df), ROW_BLOCK):
+        x = df.iloc[start:start + ROW_BLOCK].to_numpy(dtype=np.float64, na_value=np.nan)
+        yield x[~np.isnan(x).any(axis=1)]
+
+
+def _gram(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Centred XᵀX of the complete rows (two passes over row blocks: column
+    means and ranges, then the products), plus the constant-column mask.
+    """
+    p = df.shape[1]
+    total, n = np.zeros(p), 0
+    lo, hi = np.full(p, np.inf), np.full(p, -np.inf)
+    for x in _complete_blocks(df):
+        if len(x):
+            total += x.sum(axis=0)
+            n += len(x)
+            lo, hi = np.minimum(lo, x.min(axis=0)), np.maximum(hi, x.max(axis=0))
+    mean = total / max(n, 1)
+    gram = np.zeros((p, p))
+    for x in _complete_blocks(df):
+        x = x - mean
+        gram += x.T @ x
+    return gram, ~(hi > lo)
+
+
+def vif_scores(df: pd.DataFrame) -> pd.Series:
+    """VIF per column on the complete rows; NaN for constant columns."""
+    gram, constant = _gram(df)
+    vif = pd.Series(np.nan, index=df.columns, dtype=np.float64)
+    ok = ~constant & (np.diag(gram) > 0)
+    if ok.sum() == 0:
+        return vif
+    g = gram[np.ix_(ok, ok)]
+    scale = np.sqrt(np.diag(g))
+    corr = g / np.outer(scale, scale)
+    np.fill_diagonal(corr, 1.0)
+    vif[ok] = _inverse_diagonal(corr)
+    return vif
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+column_stats.py – fused single-pass column statistics for DataHealthCheck
+
+fused_column_stats(df) computes, for every column at once:
+    dtype, numeric, count, nulls, null_pct, distinct
+and for the numeric block (one float64 matrix, one row-wise sort):
+    mean, std, skew, min, q1, median, q3, max, iqr_outliers
+
+The detectors (missingness, skew, cardinality, outliers) read this table
+instead of rescanning the frame. Skew matches DataFrame.skew(), quartiles
+match np.nanpercentile(..., method="linear"), and distinct matches nunique().
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+STATS_COLUMNS = ["dtype", "numeric", "count", "nulls", "null_pct", "distinct",
+                 "mean", "std", "skew", "min", "q1", "median", "q3", "max",
+                 "iqr_outliers"]
+
+
+def _sorted_quantiles(sorted_x: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Row-wise linear-interpolated quantile of a NaN-last sorted matrix."""
+    pos = q * np.maximum(counts - 1, 0)
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, np.maximum(counts - 1, 0))
+    rows = np.arange(sorted_x.shape[0])
+    a, b = sorted_x[rows, lo], sorted_x[rows, hi]
+    t = pos - lo
+    diff = b - a
+    # same two-sided lerp as numpy, so results are bit-identical
+    out = np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+    return np.where(counts > 0, out, np.nan)
+
+
+def _numeric_block_stats(xt: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Statistics of a C-contiguous (n_columns, n_rows) float64 block – the
+    layout pandas itself keeps numeric blocks in, so every reduction runs
+    along contiguous memory (and sums pairwise, exactly like DataFrame.skew).
+    """
+    n_cols, n_rows = xt.shape
+    valid = ~np.isnan(xt)
+    count = valid.sum(axis=1)
+    complete = bool(count.min(initial=n_rows) == n_rows)   # no NaN anywhere
+    with np.errstate(invalid="ignore", divide="ignore"):
+        filled = xt if complete else np.where(valid, xt, 0.0)
+        mean = np.where(count > 0, filled.sum(axis=1) / count, np.nan)
+        centered = filled - mean[:, None]
+        if not complete:
+            centered[~valid] = 0.0
+        del filled
+        work = centered * centered
+        m2 = work.sum(axis=1)
+        work *= centered                              # as nanskew; ** 3 is slow
+        m3 = work.sum(axis=1)
+        std = np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan)
+        # DataFrame.skew(): adjusted Fisher–Pearson, 0 for constant columns
+        m2 = np.where(np.abs(m2) < 1e-14, 0.0, m2)
+        m3 = np.where(np.abs(m3) < 1e-14, 0.0, m3)
+        skew = count * (count - 1) ** 0.5 / (count - 2) * (m3 / m2 ** 1.5)
+        skew = np.where(m2 == 0, 0.0, skew)
+        skew = np.where(count < 3, np.nan, skew)
+    del valid, centered, work
+
+    sorted_x = np.sort(xt, axis=1) if n_rows else np.full((n_cols, 1), np.nan)  # NaNs last
+    q1 = _sorted_quantiles(sorted_x, count, 0.25)
+    median = _sorted_quantiles(sorted_x, count, 0.5)
+    q3 = _sorted_quantiles(sorted_x, count, 0.75)
+    rows = np.arange(n_cols)
+    lo_val = np.where(count > 0, sorted_x[:, 0], np.nan)
+    hi_val = np.where(count > 0, sorted_x[rows, np.maximum(count - 1, 0)], np.nan)
+
+    # value changes between neighbours; the NaN tail (NaN != anything) adds
+    # exactly `nulls` spurious changes, which are subtracted again
+    changes = (sorted_x[:, 1:] != sorted_x[:, :-1]).sum(axis=1)
+    distinct = np.where(count > 0, changes - (n_rows - count) + 1, 0)
+
+    # IQR fences: two binary searches per column on the sorted values
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    outliers = np.zeros(n_cols, dtype=np.int64)
+    for j in np.flatnonzero(count):
+        col = sorted_x[j, :count[j]]
+        outliers[j] = np.searchsorted(col, low[j], "left") + \
+            count[j] - np.searchsorted(col, high[j], "right")
+    return {"count": count, "nulls": n_rows - count, "distinct": distinct,
+            "mean": mean, "std": std, "skew": skew, "min": lo_val, "q1": q1,
+            "median": median, "q3": q3, "max": hi_val, "iqr_outliers": outliers}
+
+
+def fused_column_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per column of `df` (same order), columns = STATS_COLUMNS."""
+    n_rows = len(df)
+    # same selection as df.select_dtypes(include=[np.number]), without the copy
+    num_cols = df.head(0).select_dtypes(include=[np.number]).columns
+    stats = {}
+    if len(num_cols):
+        block = df if len(num_cols) == df.shape[1] else df[num_cols]
+        if all(isinstance(dt, np.dtype) for dt in block.dtypes):
+            x = block.to_numpy(dtype=np.float64)  # a view for one float64 block
+        else:                                     # nullable Int64 / Float64 …
+            x = block.to_numpy(dtype=np.float64, na_value=np.nan)
+        stats = pd.DataFrame(_numeric_block_stats(np.ascontiguousarray(x.T)),
+                             index=num_cols)
+        del block, x
+
+    other = df.columns.difference(num_cols, sort=False)
+    rows = {}
+    for col in other:
+        nulls = int(df[col].isna().sum())
+        rows[col] = {"count": n_rows - nulls, "nulls": nulls,
+                     "distinct": df[col].nunique(), "iqr_outliers": 0}
+    table = pd.concat([pd.DataFrame(stats), pd.DataFrame.from_dict(rows, orient="index")])
+    table = table.reindex(index=df.columns, columns=STATS_COLUMNS)
+    table["dtype"] = df.dtypes.astype(str)
+    table["numeric"] = table.index.isin(num_cols)
+    table["null_pct"] = table["nulls"] / n_rows if n_rows else np.nan
+    table[["count", "nulls", "distinct", "iqr_outliers"]] = \
+        table[["count", "nulls", "distinct", "iqr_outliers"]].astype("int64")
+    return table
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+detector_pool.py – concurrent DataHealthCheck detectors with time budgets
+
+run_detectors() runs at most `n_jobs` detectors at a time, each on its own
+results dict, and measures wall-clock and peak traced memory (tracemalloc)
+per detector. A detector still running after `budget` seconds is abandoned
+and re-run on a down-sampled checker, so a slow check cannot hold up the
+whole report.
+
+    results, timings = run_detectors(check, ["missingness", "vif"],
+                                     n_jobs=4, budget=30, sampled=make_sample)
+
+Backends:
+  · "process"  one forked process per detector – the frame is inherited, not
+               pickled; a budget overrun is terminated; memory is exact
+  · "thread"   one thread per detector – an abandoned run cannot be stopped and
+               finishes in the background (its result is dropped); no memory
+               figures, since tracemalloc cannot tell threads apart
+"""
+from __future__ import annotations
+
+import copy
+import multiprocessing as mp
+import os
+import threading
+import time
+import tracemalloc
+from typing import Callable
+
+BACKENDS = ("process", "thread")
+POLL_SECONDS = 0.02
+
+
+def default_backend() -> str:
+    return "process" if "fork" in mp.get_all_start_methods() else "thread"
+
+
+def _run(check, name: str, track_memory: bool) -> dict:
+    """One detector on a private results dict → {results | error, seconds, peak_bytes}."""
+    check = copy.copy(check)          # shares df / stats, not results
+    check.results = {}
+    if track_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        getattr(check, f"detect_{name}")()
+        out = {"results": check.results}
+    except Exception as e:
+        out = {"error": f"{type(e).__name__}: {e}"}
+    out["seconds"] = time.perf_counter() - t0
+    out["peak_bytes"] = None
+    if track_memory:
+        out["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return out
+
+
+def _child(send, check, name: str, track_memory: bool) -> None:
+    send.send(_run(check, name, track_memory))
+    send.close()
+
+
+class _ProcessTask:
+    def __init__(self, check, name: str, track_memory: bool):
+        ctx = mp.get_context("fork")
+        self._recv, send = ctx.Pipe(duplex=False)
+        self._proc = ctx.Process(target=_child, args=(send, check, name, track_memory),
+                                 daemon=True)
+        self._proc.start()
+        send.close()
+
+    def poll(self) -> dict | None:
+        if self._recv.poll():
+            out = self._recv.recv()
+            self._proc.join()
+            return out
+        if not self._proc.is_alive() and not self._recv.poll():
+            return {"error": f"worker exited with code {self._proc.exitcode}",
+                    "seconds": 0.0, "peak_bytes": None}
+        return None
+
+    def cancel(self) -> None:
+        self._proc.terminate()
+        self._proc.join()
+
+
+class _ThreadTask:
+    def __init__(self, check, name: str, track_memory: bool):
+        self._out = None
+        self._thread = threading.Thread(
+            target=self._target, args=(check, name, track_memory), daemon=True)
+        self._thread.start()
+
+    def _target(self, check, name, track_memory):
+        self._out = _run(check, name, track_memory)
+
+    def poll(self) -> dict | None:
+        return self._out
+
+    def cancel(self) -> None:
+        pass                          # cannot interrupt a thread; result is dropped
+
+
+def run_detectors(check, names: list[str], n_jobs: int | None = None,
+                  budget: float | None = None, backend: str | None = None,
+                  sampled: Callable | None = None,
+                  track_memory: bool = True) -> tuple[dict, dict]:
+    """
+    Run check.detect_<name>() for every name. `sampled` builds the fallback
+    checker on first use (None → no fallback, overruns just keep running).
+    Returns (merged results, {name: {seconds, peak_mb, mode[, error]}}), where
+    seconds is wall-clock from first start, including an abandoned full run.
+    """
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    n_jobs = n_jobs or min(len(names), os.cpu_count() or 1)
+    task_cls = _ProcessTask if backend == "process" else _ThreadTask
+    track = track_memory and backend == "process"
+
+    queue = [(name, False) for name in names]
+    running: dict[str, tuple] = {}
+    first_start: dict[str, float] = {}
+    results, timings = {}, {}
+    sample_check = None
+    while queue or running:
+        while queue and len(running) < n_jobs:
+            name, is_sampled = queue.pop(0)
+            started = time.perf_counter()
+            first_start.setdefault(name, started)
+            task = task_cls(sample_check if is_sampled else check, name, track)
+            running[name] = (task, started, is_sampled)
+        time.sleep(POLL_SECONDS)
+        for name, (task, started, is_sampled) in list(running.items()):
+            out = task.poll()
+            if out is not None:
+                del running[name]
+                peak = out["peak_bytes"]
+                timings[name] = {
+                    "seconds": time.perf_counter() - first_start[name],
+                    "peak_mb": None if peak is None else peak / 2 ** 20,
+                    "mode": "sampled" if is_sampled else "full"}
+                if "error" in out:
+                    timings[name].update(mode="failed", error=out["error"])
+                else:
+                    results.update(out["results"])
+            elif (budget is not None and not is_sampled and sampled is not None
+                  and time.perf_counter() - started > budget):
+                task.cancel()
+                del running[name]
+                if sample_check is None:
+                    sample_check = sampled()
+                queue.insert(0, (name, True))
+    return results, {name: timings[name] for name in names}
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+excel_cache.py – one-time Excel → Parquet conversion for DataCollector
+
+Parsing a large workbook through pd.read_excel takes minutes; reading the same
+sheet back from Parquet takes well under a second and supports projection /
+predicate pushdown. Each requested sheet is converted once and stored under
+
+    <cache_dir>/<content hash>/<sheet>.parquet
+
+The content hash is the SHA-256 of a local file, or the ETag of an S3 object.
+An edited workbook gets a new hash and is converted again. The workbook is
+parsed with pandas' default engine (openpyxl / xlrd) unless an `engine` is
+given; excel_engine() names the fastest installed one (python-calamine).
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import logging
+import re
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+
+with contextlib.suppress(ImportError):
+    import boto3
+with contextlib.suppress(ImportError):
+    import python_calamine  # noqa: F401  (enables pd.read_excel(engine="calamine"))
+with contextlib.suppress(ImportError):
+    import pyarrow as pa
+
+log = logging.getLogger("collector")
+
+DEFAULT_EXCEL_CACHE_DIR = Path("cache/excel")
+
+
+def excel_engine() -> str | None:
+    """
+    Fastest installed pd.read_excel engine (None → pandas' default), for
+    callers that opt in: read_file(path, engine=excel_engine()).
+    """
+    return "calamine" if "python_calamine" in globals() else None
+
+
+def excel_hash(path: str, **storage_opts) -> str:
+    """Content hash of a workbook: SHA-256 locally, ETag on S3 (no download)."""
+    if path.startswith("s3://"):
+        bucket, key = path.split("s3://", 1)[1].split("/", 1)
+        head = boto3.client("s3").head_object(Bucket=bucket, Key=key, **storage_opts)
+        return "etag-" + head["ETag"].strip('"').replace("-", "_")
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExcelParquetCache:
+    """
+        cache = ExcelParquetCache("cache/excel", engine=None)   # None: pandas' default
+        pq_path = cache.sheet_path("book.xlsx", sheet="Orders")   # converts on miss
+        df = pd.read_parquet(pq_path, columns=["id", "amount"])
+    """
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_EXCEL_CACHE_DIR,
+                 engine: str | None = None):
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.engine = engine
+
+    @staticmethod
+    def _sheet_file(sheet: int | str) -> str:
+        # sheet 0 and a sheet *named* "0" must not collide
+        if isinstance(sheet, int):
+            return f"idx_{sheet}.parquet"
+        return "name_" + re.sub(r"[^\w.-]", "_", sheet) + ".parquet"
+
+    def sheet_path(self, path: str, sheet: int | str = 0, engine: str | None = None,
+                   **storage_opts) -> Path:
+        """
+        Parquet copy of one sheet; parses the workbook only on a cache miss,
+        with `engine` (default: the cache's engine).
+        """
+        target = self.dir / excel_hash(path, **storage_opts) / self._sheet_file(sheet)
+        if not target.exists():
+            self._convert(path, sheet, target, engine or self.engine, **storage_opts)
+        return target
+
+    def _convert(self, path: str, sheet: int | str, target: Path,
+                 engine: str | None = None, **storage_opts) -> None:
+        t0 = time.perf_counter()
+        source = path
+        if path.startswith("s3://"):
+            bucket, key = path.split("s3://", 1)[1].split("/", 1)
+            obj = boto3.client("s3").get_object(Bucket=bucket, Key=key, **storage_opts)
+            source = io.BytesIO(obj["Body"].read())
+        df = pd.read_excel(source, sheet_name=sheet, engine=engine)
+        tmp = target.with_suffix(".parquet.tmp")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            df.to_parquet(tmp, index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # mixed-type object columns cannot be stored as-is → strings
+            mixed = {c: "string" for c in df.columns
+                     if pd.api.types.is_object_dtype(df[c])}
+            df.astype(mixed).to_parquet(tmp, index=False)
+        tmp.replace(target)
+        log.info(f"Excel → Parquet {path} [{sheet}] ({len(df):,} rows, "
+                 f"engine={engine or 'default'}, "
+                 f"{time.perf_counter() - t0:.2f}s) → {target}")
+
+    def invalidate(self, path: str, **storage_opts) -> bool:
+        """Drop every converted sheet of the workbook's current content."""
+        entry = self.dir / excel_hash(path, **storage_opts)
+        existed = entry.exists()
+        shutil.rmtree(entry, ignore_errors=True)
+        return existed
+
+    def clear(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self.dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+ge_validation.py – cached Great Expectations suites and scalable validation
+
+The data context and each expectation suite are loaded once per suite_name
+and split into three groups:
+  · row-count expectations   – checked exactly from the row count (also works
+                               for streams, where only the final total counts)
+  · aggregate expectations   – table/column-level (column set, mean, …) and
+                               cross-row ones (unique, increasing / decreasing),
+                               always validated on the full frame
+  · row-level expectations   – expect_column_values_* and friends, validated in
+                               one of three modes:
+        "full"     whole frame in one GE call (the original behaviour)
+        "sample"   uniform random sample of `sample_rows` rows
+        "chunked"  row chunks validated in parallel, unexpected counts summed
+                   and `mostly` re-applied → same verdict as "full"
+"""
+from __future__ import annotations
+
+import contextlib
+import copy
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+
+with contextlib.suppress(ImportError):
+    import great_expectations as ge
+
+log = logging.getLogger("collector")
+
+VALIDATION_MODES = ("full", "sample", "chunked")
+ROW_COUNT_EXPECTATIONS = {"expect_table_row_count_to_be_between",
+                          "expect_table_row_count_to_equal"}
+ROW_LEVEL_PREFIXES = ("expect_column_values_to_", "expect_column_pair_values_",
+                      "expect_multicolumn_values_", "expect_select_column_values_")
+# map-style by name, but a duplicate can sit in another chunk / outside a sample,
+# and monotonicity compares adjacent rows (a chunk boundary, a shuffled sample)
+CROSS_ROW_EXPECTATIONS = {"expect_column_values_to_be_unique",
+                          "expect_compound_columns_to_be_unique",
+                          "expect_multicolumn_values_to_be_unique",
+                          "expect_column_values_to_be_increasing",
+                          "expect_column_values_to_be_decreasing"}
+
+_CONTEXT = None
+_RUNNERS: dict[str, "SuiteRunner"] = {}
+_LOCK = threading.Lock()
+
+
+def _is_row_level(expectation_type: str) -> bool:
+    return expectation_type.startswith(ROW_LEVEL_PREFIXES) \
+        and expectation_type not in CROSS_ROW_EXPECTATIONS
+
+
+def get_suite_runner(suite_name: str) -> "SuiteRunner":
+    """Data context + compiled suite, built on first use and then reused."""
+    global _CONTEXT
+    with _LOCK:
+        if suite_name not in _RUNNERS:
+            if _CONTEXT is None:
+                _CONTEXT = ge.DataContext()
+            _RUNNERS[suite_name] = SuiteRunner(
+                suite_name, _CONTEXT.get_expectation_suite(suite_name))
+        return _RUNNERS[suite_name]
+
+
+def clear_suite_cache() -> None:
+    """Forget cached suites (e.g. after editing them); the context is rebuilt too."""
+    global _CONTEXT
+    with _LOCK:
+        _RUNNERS.clear()
+        _CONTEXT = None
+
+
+def _row_count_ok(expectation: dict, n_rows: int) -> bool:
+    kw = expectation["kwargs"]
+    if expectation["expectation_type"] == "expect_table_row_count_to_equal":
+        return n_rows == kw["value"]
+    lo, hi = kw.get("min_value"), kw.get("max_value")
+    return (lo is None or n_rows >= lo) and (hi is None or n_rows <= hi)
+
+
+def _validate_part(df: pd.DataFrame, suite: dict) -> list[dict]:
+    """One GE call; results flattened to plain (picklable) dicts, in suite order."""
+    result = ge.from_pandas(df).validate(expectation_suite=suite)
+    out = []
+    for r in result.results:
+        counts = r.result or {}
+        out.append({
+            "expectation_type": r.expectation_config.expectation_type,
+            "kwargs": dict(r.expectation_config.kwargs),
+            "success": bool(r.success),
+            "element_count": counts.get("element_count"),
+            "missing_count": counts.get("missing_count") or 0,
+            "unexpected_count": counts.get("unexpected_count"),
+        })
+    return out
+
+
+def _merge_chunk_results(parts: list[list[dict]]) -> list[dict]:
+    """
+    Combine per-chunk results of the same suite. For map expectations the
+    verdict is recomputed from the summed counts, exactly as GE does for a
+    single frame: (non-null − unexpected) / non-null ≥ mostly.
+    """
+    merged = []
+    for per_chunk in zip(*parts):
+        r = dict(per_chunk[0])
+        if any(p["unexpected_count"] is None for p in per_chunk):
+            r["success"] = all(p["success"] for p in per_chunk)
+            merged.append(r)
+            continue
+        elements = sum(p["element_count"] for p in per_chunk)
+        missing = sum(p["missing_count"] for p in per_chunk)
+        unexpected = sum(p["unexpected_count"] for p in per_chunk)
+        nonnull = elements - missing
+        mostly = r["kwargs"].get("mostly")
+        mostly = 1.0 if mostly is None else mostly     # GE: mostly=None ≡ all rows
+        r.update(element_count=elements, missing_count=missing,
+                 unexpected_count=unexpected,
+                 success=nonnull == 0 or (nonnull - unexpected) / nonnull >= mostly)
+        merged.append(r)
+    return merged
+
+
+class SuiteRunner:
+    """
+    runner = get_suite_runner("default_suite")
+    report = runner.validate(df, mode="chunked", n_jobs=8)
+    report["success"], report["results"]
+    """
+
+    def __init__(self, suite_name: str, suite):
+        self.suite_name = suite_name
+        suite_dict = suite if isinstance(suite, dict) else suite.to_json_dict()
+        groups: dict[str, list[dict]] = {"row_count": [], "aggregate": [], "row_level": []}
+        for e in suite_dict.get("expectations", []):
+            etype = e["expectation_type"]
+            group = "row_count" if etype in ROW_COUNT_EXPECTATIONS else \
+                "row_level" if _is_row_level(etype) else "aggregate"
+            groups[group].append(e)
+        self.row_count = groups["row_count"]
+        self.aggregate = self._sub_suite(suite_dict, groups["aggregate"])
+        self.row_level = self._sub_suite(suite_dict, groups["row_level"])
+
+    @staticmethod
+    def _sub_suite(suite_dict: dict, expectations: list[dict]) -> dict:
+        sub = copy.deepcopy({k: v for k, v in suite_dict.items() if k != "expectations"})
+        sub["expectations"] = expectations
+        return sub
+
+    def check_row_count(self, n_rows: int) -> list[dict]:
+        return [{"expectation_type": e["expectation_type"], "kwargs": e["kwargs"],
+                 "success": _row_count_ok(e, n_rows), "scope": "exact"}
+                for e in self.row_count]
+
+    def validate(self, df: pd.DataFrame, mode: str = "full",
+                 sample_rows: int = 100_000, n_jobs: int = 1,
+                 check_row_count: bool = True) -> dict:
+        """
+        Returns {"success", "mode", "rows_validated", "results": [...]}; each
+        result carries a `scope` of "exact" or "sample".
+        """
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode: {mode}")
+        results = self.check_row_count(len(df)) if check_row_count else []
+
+        if self.aggregate["expectations"]:
+            results += [{**r, "scope": "exact"}
+                        for r in _validate_part(df, self.aggregate)]
+
+        rows_validated = len(df)
+        if self.row_level["expectations"]:
+            scope = "exact"
+            if mode == "sample" and len(df) > sample_rows:
+                part = _validate_part(df.sample(n=sample_rows, random_state=0),
+                                      self.row_level)
+                rows_validated, scope = sample_rows, "sample"
+            elif mode == "chunked" and n_jobs != 1 and len(df) > 1:
+                n_chunks = min(len(df), effective_n_jobs(n_jobs))
+                bounds = np.linspace(0, len(df), n_chunks + 1, dtype=int)
+                parts = Parallel(n_jobs=n_jobs)(
+                    delayed(_validate_part)(df.iloc[a:b], self.row_level)
+                    for a, b in zip(bounds[:-1], bounds[1:]))
+                part = _merge_chunk_results(parts)
+            else:
+                part = _validate_part(df, self.row_level)
+            results += [{**r, "scope": scope} for r in part]
+
+        return {"success": all(r["success"] for r in results), "mode": mode,
+                "rows_validated": rows_validated, "results": results}
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+ingest_cache.py – content-addressed on-disk cache for DataCollector
+
+A cache entry is the *post-processed* frame (Parquet) plus its semantic
+profiling report (JSON) and row-hash audit (index), keyed by
+    source fingerprint  (source_id + size + mtime locally, ETag + size on S3)
+  + collector settings  (pii_mask, validate, validate_mode, schema registry, …)
+  + schema version      (the source's registry version the frame was converted with)
+  + CACHE_VERSION       (bump when _postprocess semantics change)
+
+Eviction is LRU by total bytes on disk; invalidate()/invalidate_source()/
+clear() drop entries explicitly. Entries are recorded under source_id(path)
+(resolved local path or S3 URI), so "data.csv", "./data.csv" and the
+absolute path all name the same source.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+with contextlib.suppress(ImportError):
+    import boto3
+
+log = logging.getLogger("collector")
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = Path("cache/ingest")
+DEFAULT_MAX_BYTES = 5 * 2**30  # 5 GiB
+
+
+def source_id(path: str) -> str:
+    """Normalized name of a source: the S3 URI, or the resolved local path."""
+    return path if path.startswith("s3://") else str(Path(path).resolve())
+
+
+def source_fingerprint(path: str, **storage_opts) -> str:
+    """
+    Cheap identity of a source without reading it: size + mtime for local
+    files, ETag (content hash) + size for S3 objects.
+    """
+    if path.startswith("s3://"):
+        bucket, key = path.split("s3://", 1)[1].split("/", 1)
+        head = boto3.client("s3").head_object(
+            Bucket=bucket, Key=key, **storage_opts)
+        return f"{path}|{head['ContentLength']}|{head['ETag'].strip(chr(34))}"
+    stat = os.stat(path)
+    return f"{source_id(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+class IngestCache:
+    """
+    On-disk LRU cache of post-processed ingests.
+
+        cache = IngestCache("cache/ingest", max_bytes=2 * 2**30)
+        key = cache.key(source_fingerprint("data.csv"), settings)
+        hit = cache.get(key)             # (df, report) or None
+        cache.audit(key)                 # {rows, duplicates, sha256, fingerprint}
+        cache.put(key, df, report, source=source_id("data.csv"), audit=audit)
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._index = self._load_index()
+
+    # ---------------------------------------------------------------- keys
+    @staticmethod
+    def key(fingerprint: str, settings: dict) -> str:
+        payload = json.dumps({"source": fingerprint, "settings": settings,
+                              "version": CACHE_VERSION}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.dir / f"{key}.parquet", self.dir / f"{key}.json"
+
+    # --------------------------------------------------------------- index
+    def _load_index(self) -> dict[str, dict]:
+        path = self.dir / self.INDEX
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text())
+        except json.JSONDecodeError:
+            log.warning(f"Ingest cache index corrupt → starting empty ({path})")
+            return {}
+
+    def _save_index(self) -> None:
+        tmp = self.dir / f"{self.INDEX}.tmp"
+        tmp.write_text(json.dumps(self._index, indent=2))
+        tmp.replace(self.dir / self.INDEX)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(e["bytes"] for e in self._index.values())
+
+    # ----------------------------------------------------------------- API
+    def get(self, key: str) -> tuple[pd.DataFrame, dict] | None:
+        entry = self._index.get(key)
+        data_path, report_path = self._paths(key)
+        if entry is None or not data_path.exists():
+            if entry is not None:  # files vanished underneath us
+                self.invalidate(key)
+            return None
+        df = pd.read_parquet(data_path)
+        report = json.loads(report_path.read_text()) if report_path.exists() else {}
+        entry["last_used"] = time.time()
+        self._save_index()
+        return df, report
+
+    def audit(self, key: str) -> dict | None:
+        """Row-hash audit stored with the entry (None if absent)."""
+        return (self._index.get(key) or {}).get("audit")
+
+    def put(self, key: str, df: pd.DataFrame, report: dict, source: str = "",
+            audit: dict | None = None) -> bool:
+        """
+        Store a post-processed frame (and the audit of its ingest, logged
+        again on a hit). Returns False (and caches nothing) when the frame
+        cannot be written as Parquet, e.g. non-string column names.
+        """
+        data_path, report_path = self._paths(key)
+        tmp = data_path.with_suffix(".parquet.tmp")
+        try:
+            df.to_parquet(tmp, index=False)
+        except (ValueError, TypeError, ImportError) as e:
+            log.warning(f"Ingest cache skipped for '{source}': {e}")
+            tmp.unlink(missing_ok=True)
+            return False
+        tmp.replace(data_path)
+        report_path.write_text(json.dumps(report, indent=2, default=str))
+
+        self._index[key] = {
+            "source": source,
+            "bytes": data_path.stat().st_size + report_path.stat().st_size,
+            "rows": len(df),
+            "audit": audit,
+            "created": time.time(),
+            "last_used": time.time(),
+        }
+        self._evict()
+        self._save_index()
+        return True
+
+    def invalidate(self, key: str) -> bool:
+        """Drop one entry. Returns True if something was removed."""
+        existed = self._index.pop(key, None) is not None
+        for p in self._paths(key):
+            existed |= p.exists()
+            p.unlink(missing_ok=True)
+        self._save_index()
+        return existed
+
+    def invalidate_source(self, source: str) -> int:
+        """Drop every entry (any settings / version) recorded for `source`."""
+        keys = [k for k, e in self._index.items() if e["source"] == source]
+        for k in keys:
+            self.invalidate(k)
+        return len(keys)
+
+    def clear(self) -> None:
+        for k in list(self._index):
+            self.invalidate(k)
+
+    def _evict(self) -> None:
+        """Least-recently-used entries go first until we fit into max_bytes."""
+        by_age = sorted(self._index, key=lambda k: self._index[k]["last_used"])
+        while by_age and self.total_bytes > self.max_bytes:
+            victim = by_age.pop(0)
+            log.info(f"Ingest cache evict {victim[:12]} "
+                     f"({self._index[victim]['source']})")
+            self.invalidate(victim)
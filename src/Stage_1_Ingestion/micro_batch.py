@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+micro_batch.py – bounded micro-batching for push (MQTT) and pull (Mongo) sources
+
+A MicroBatcher sits between a producer and DataCollector._postprocess:
+  · ring buffer of at most `capacity` records → memory is bounded
+  · a batch is flushed as soon as it holds `max_records` records or
+    `max_ms` milliseconds have passed since its first record
+  · overflow="block" stalls the producer when the buffer is full (back-pressure);
+    overflow="drop_oldest" overwrites the oldest buffered record instead
+Push sources call put() from their callback thread; pull sources are wrapped
+with MicroBatcher.from_iterable(), which drains the iterable on a feeder thread
+(stop() joins it before the iterable, e.g. a cursor, is closed).
+
+    batcher = MicroBatcher(max_records=1_000, max_ms=500)
+    client.on_message = lambda c, u, msg: batcher.put(json.loads(msg.payload))
+    for df in batcher.frames():
+        ...
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+import pandas as pd
+
+log = logging.getLogger("collector")
+
+
+class MicroBatcher:
+    def __init__(self, max_records: int = 1_000, max_ms: int = 500,
+                 capacity: int | None = None, overflow: str = "block"):
+        if overflow not in {"block", "drop_oldest"}:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.max_records = max(int(max_records), 1)
+        self.max_ms = max_ms
+        self.capacity = max(capacity or 4 * self.max_records, self.max_records)
+        self.overflow = overflow
+        self._buf: deque = deque()            # (arrival time, record)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._error: BaseException | None = None
+        self._feeder: threading.Thread | None = None
+        self.metrics = {"records": 0, "batches": 0, "dropped": 0, "blocked_seconds": 0.0}
+
+    # ------------------------------------------------------------ producer
+    def put(self, record) -> bool:
+        """Buffer one record. Returns False if the batcher is already closed."""
+        with self._cond:
+            if len(self._buf) >= self.capacity and self.overflow == "block":
+                t0 = time.perf_counter()
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._buf) < self.capacity)
+                self.metrics["blocked_seconds"] += time.perf_counter() - t0
+            if self._closed:
+                return False
+            if len(self._buf) >= self.capacity:        # drop_oldest
+                self._buf.popleft()
+                if not self.metrics["dropped"]:
+                    log.warning(f"Micro-batch buffer full ({self.capacity:,}) "
+                                f"→ dropping oldest records")
+                self.metrics["dropped"] += 1
+            self._buf.append((time.monotonic(), record))
+            self.metrics["records"] += 1
+            if len(self._buf) in (1, self.max_records):   # arms the T timer / size flush
+                self._cond.notify_all()
+            return True
+
+    def close(self, error: BaseException | None = None) -> None:
+        """No more records; pending ones are still flushed. `error` is re-raised
+        on the consumer side."""
+        with self._cond:
+            self._closed = True
+            self._error = self._error or error
+            self._cond.notify_all()
+
+    def stop(self, timeout: float | None = None) -> bool:
+        """
+        close(), then wait for the from_iterable() feeder to let go of its
+        iterable: it exits at its next record (or at once if blocked on a full
+        buffer). Only then is it safe to close the underlying cursor. Returns
+        False if the feeder is still running after `timeout` seconds.
+        """
+        self.close()
+        if self._feeder is not None:
+            self._feeder.join(timeout)
+            return not self._feeder.is_alive()
+        return True
+
+    # ------------------------------------------------------------ consumer
+    def _ready(self) -> bool:
+        if len(self._buf) >= self.max_records or (self._closed and self._buf):
+            return True
+        return bool(self._buf) and \
+            (time.monotonic() - self._buf[0][0]) * 1e3 >= self.max_ms
+
+    def batches(self, idle_timeout: float | None = None) -> Iterator[list]:
+        """
+        Yield lists of ≤ max_records records until close() and the buffer is
+        drained, or until nothing arrives for `idle_timeout` seconds.
+        """
+        while True:
+            with self._cond:
+                idle_deadline = None if idle_timeout is None \
+                    else time.monotonic() + idle_timeout
+                while not self._ready():
+                    if self._closed and not self._buf:
+                        if self._error is not None:
+                            raise self._error
+                        return
+                    now = time.monotonic()
+                    if self._buf:
+                        wait = self._buf[0][0] + self.max_ms / 1e3 - now
+                    elif idle_deadline is not None:
+                        wait = idle_deadline - now
+                        if wait <= 0:
+                            return
+                    else:
+                        wait = None
+                    self._cond.wait(timeout=wait)
+                n = min(len(self._buf), self.max_records)
+                batch = [self._buf.popleft()[1] for _ in range(n)]
+                self.metrics["batches"] += 1
+                self._cond.notify_all()              # wake a blocked producer
+            yield batch
+
+    def frames(self, idle_timeout: float | None = None) -> Iterator[pd.DataFrame]:
+        for batch in self.batches(idle_timeout):
+            yield pd.DataFrame.from_records(batch)
+
+    # ------------------------------------------------------------ pull sources
+    @classmethod
+    def from_iterable(cls, records: Iterable, **kw) -> "MicroBatcher":
+        """Drain `records` (e.g. a Mongo cursor) on a daemon feeder thread."""
+        batcher = cls(**kw)
+
+        def feed():
+            try:
+                for record in records:
+                    if not batcher.put(record):
+                        break
+            except BaseException as e:      # surfaced by batches()
+                batcher.close(e)
+            else:
+                batcher.close()
+
+        batcher._feeder = threading.Thread(target=feed, name="micro-batch-feeder",
+                                           daemon=True)
+        batcher._feeder.start()
+        return batcher
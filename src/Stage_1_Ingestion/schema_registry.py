@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+schema_registry.py – persisted per-source semantic schemas for DataCollector
+
+After a source has been profiled once, its per-column semantic types (the
+"recipes": Integer, Datetime, Currency, …) are stored as JSON keyed by source
+name. Later batches of the same source skip the inference chain. Each column
+gets a cheap conformance check on a sample, then its recipe is applied in a
+single vectorized pass. Columns that fail the check (new columns too) are
+re-inferred, and the registry entry is updated.
+
+    registry = SchemaRegistry("schemas")
+    registry.get("flat:orders.csv")  # {column: {semantic_type, original_dtype, final_dtype}}
+
+Source names are those DataCollector logs under: flat:<file name>,
+sql:<digest of DSN + query>, rest:<host/path>, kafka:<topic>, mqtt:<topic>,
+mongo:<db>.<collection>, gsheet:<sheet key>.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+
+log = logging.getLogger("collector")
+
+DEFAULT_SCHEMA_DIR = Path("schemas")
+SCHEMA_FIELDS = ("semantic_type", "original_dtype", "final_dtype")
+
+
+class SchemaRegistry:
+    def __init__(self, registry_dir: str | Path = DEFAULT_SCHEMA_DIR):
+        self.dir = Path(registry_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._schemas: dict[str, dict] = {}     # in-process copy of the JSON files
+        self._lock = threading.Lock()
+
+    def _path(self, source: str) -> Path:
+        return self.dir / (re.sub(r"[^\w.-]", "_", source) + ".json")
+
+    def _load(self, source: str) -> dict | None:
+        if source not in self._schemas:
+            path = self._path(source)
+            if not path.exists():
+                return None
+            try:
+                self._schemas[source] = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                log.warning(f"Schema registry entry corrupt → re-inferring ({path})")
+                return None
+        return self._schemas[source]
+
+    def get(self, source: str) -> dict[str, dict] | None:
+        """Column recipes recorded for `source`, or None if it was never profiled."""
+        with self._lock:
+            schema = self._load(source)
+            return dict(schema["columns"]) if schema else None
+
+    def version(self, source: str) -> int:
+        """Current schema version of `source` (0 if never profiled)."""
+        with self._lock:
+            schema = self._load(source)
+            return schema["version"] if schema else 0
+
+    def put(self, source: str, report: dict[str, dict]) -> int:
+        """
+        Merge a profiling report into the source's schema (columns missing from
+        this batch keep their recipe). Returns the new schema version.
+        """
+        with self._lock:
+            schema = self._load(source) or {"source": source, "version": 0, "columns": {}}
+            schema["columns"].update(
+                {col: {k: r[k] for k in SCHEMA_FIELDS} for col, r in report.items()})
+            schema["version"] += 1
+            schema["updated"] = time.time()
+            tmp = self._path(source).with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(schema, indent=2))
+            tmp.replace(self._path(source))
+            self._schemas[source] = schema
+            return schema["version"]
+
+    def drop(self, source: str) -> bool:
+        """Forget a source; its next batch is fully re-inferred."""
+        with self._lock:
+            self._schemas.pop(source, None)
+            path = self._path(source)
+            existed = path.exists()
+            path.unlink(missing_ok=True)
+            return existed
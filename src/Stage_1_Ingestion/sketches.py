@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+sketches.py – mergeable column sketches for out-of-core health checks
+
+DataHealthCheck normally needs the whole frame in memory. A HealthSketch
+instead consumes chunks one at a time, with memory independent of the row
+count. Sketches built in different processes (or on different files) can be
+merged with `merge`, and they pickle as plain objects.
+
+    sketch = HealthSketch()
+    for chunk in collector.read_file_iter("big.csv", chunk_rows=250_000):
+        sketch.update(chunk)
+    sketch.stats()                        # same table as fused_column_stats
+    DataHealthCheck.from_sketch(sketch)   # or DataHealthCheck.from_chunks(...)
+
+Per column:
+  · count / nulls / min / max     exact
+  · mean / std / skew             exact up to float rounding (Welford moments,
+                                  merged with the Chan / Pébay pairwise update)
+  · distinct                      HyperLogLog, 2^14 registers: relative standard
+                                  error 1.04 / √m ≈ 0.8 % (≈ 2.4 % at 3σ);
+                                  exact up to 4 096 distinct values
+  · q1 / median / q3              KLL quantile sketch, k = 200: rank error
+                                  within ±1.65 % of n at 99 % confidence
+                                  (error ∝ 1/k); exact until the first compaction
+  · iqr_outliers                  rank queries against the KLL fences, so the
+                                  count is within ±2 × 1.65 % of n
+The health check's collinearity / VIF / imbalance / date / batch detectors
+run on a uniform bottom-k row sample (`sample_rows`), which is mergeable too.
+tests/test_sketches.py asserts the bounds on merged, pickled sketches;
+`python -m src.Stage_1_Ingestion.benchmarks sketch` reports them at scale.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .column_stats import STATS_COLUMNS
+
+HLL_PRECISION = 14
+HLL_EXACT_LIMIT = 4_096       # distinct hashes kept as a set before switching to registers
+KLL_K = 200
+KLL_RANK_ERROR = 0.0165       # k = 200, two-sided, 99 % confidence
+DEFAULT_SAMPLE_ROWS = 100_000
+
+
+# ───────────────────────── HyperLogLog ──────────────────────────
+class HyperLogLog:
+    """
+    Distinct-count sketch over 64-bit hashes (Ertl's improved estimator).
+    Like HLL++'s sparse mode, the first HLL_EXACT_LIMIT distinct hashes are
+    kept as a sorted set, so low-cardinality columns are counted exactly.
+    """
+
+    def __init__(self, p: int = HLL_PRECISION):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+        self.exact: np.ndarray | None = np.empty(0, dtype=np.uint64)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update_hashes(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if self.exact is not None:
+            self.exact = np.union1d(self.exact, hashes)
+            if len(self.exact) <= HLL_EXACT_LIMIT:
+                return
+            hashes, self.exact = self.exact, None
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        # leading zeros of the remaining 64-p bits; >> 11 keeps them exact in float64
+        rest = ((hashes << np.uint64(self.p)) >> np.uint64(11)).astype(np.float64)
+        rank = np.minimum(54 - np.frexp(rest)[1], 64 - self.p + 1)
+        np.maximum.at(self.registers, idx, rank.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        if other.exact is None:
+            np.maximum(self.registers, other.registers, out=self.registers)
+            if self.exact is not None:
+                hashes, self.exact = self.exact, None
+                self.update_hashes(hashes)
+        else:
+            self.update_hashes(other.exact)
+        return self
+
+    def estimate(self) -> float:
+        if self.exact is not None:
+            return float(len(self.exact))
+        m, q = len(self.registers), 64 - self.p
+        hist = np.bincount(self.registers, minlength=q + 2).astype(np.float64)
+        z = m * _hll_tau(1 - hist[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + hist[k])
+        z += m * _hll_sigma(hist[0] / m)
+        return m * m / (2 * math.log(2) * z) if z else 0.0
+
+
+def _hll_sigma(x: float) -> float:
+    if x == 1:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        z_old, z = z, z + x * y
+        y += y
+        if z == z_old:
+            return z
+
+
+def _hll_tau(x: float) -> float:
+    if x in (0, 1):
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        y *= 0.5
+        z_old, z = z, z - (1 - x) ** 2 * y
+        if z == z_old:
+            return z / 3
+
+
+# ───────────────────────── KLL quantiles ─────────────────────────
+class KLLSketch:
+    """
+    Quantile sketch: a stack of compactors, level h holding items of weight
+    2^h. An over-full level is sorted and every other item (random offset)
+    is promoted, so memory stays O(k) however many values are added.
+    """
+
+    def __init__(self, k: int = KLL_K, seed: int | None = None):
+        self.k = k
+        self.n = 0
+        self.min, self.max = math.inf, -math.inf
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add non-null float values."""
+        if not len(values):
+            return
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        if other.n == 0:
+            return self
+        self.n += other.n
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                odd = len(items) % 2
+                promoted = items[:len(items) - odd][self._rng.integers(2)::2]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.levels[h] = items[len(items) - odd:]
+            h += 1
+
+    def _weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lvl), 2 ** h, dtype=np.int64)
+                                  for h, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantiles(self, qs) -> np.ndarray:
+        """Linear-interpolated quantiles (np.nanpercentile's method when exact)."""
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        items, weights = self._weighted()
+        # each item stands for `weight` consecutive ranks → use their centre
+        centres = np.cumsum(weights) - weights + (weights - 1) / 2
+        xp = np.concatenate([[0], centres, [self.n - 1]])
+        fp = np.concatenate([[self.min], items, [self.max]])
+        return np.interp(qs * (self.n - 1), xp, fp)
+
+    def rank(self, value: float, inclusive: bool = False) -> int:
+        """Approximate number of values < value (≤ value if inclusive)."""
+        if self.n == 0:
+            return 0
+        items, weights = self._weighted()
+        pos = np.searchsorted(items, value, "right" if inclusive else "left")
+        return int(weights[:pos].sum())
+
+
+# ───────────────────────── per-column sketch ─────────────────────────
+def _hash_values(values: pd.Series) -> np.ndarray:
+    return pd.util.hash_pandas_object(values, index=False, categorize=True).to_numpy()
+
+
+class ColumnSketch:
+    def __init__(self, numeric: bool, seed: int | None = None):
+        self.numeric = numeric
+        self.count = 0
+        self.nulls = 0
+        self.hll = HyperLogLog()
+        self.kll = KLLSketch(seed=seed) if numeric else None
+        self.mean, self.m2, self.m3 = 0.0, 0.0, 0.0
+
+    def update(self, series: pd.Series) -> None:
+        if self.numeric:
+            values = pd.to_numeric(series, errors="coerce") \
+                .to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = values[~np.isnan(values)]
+            self.nulls += len(values) - len(valid)
+            # float64 hashes, so 3 and 3.0 from differently-typed chunks agree
+            self.hll.update_hashes(_hash_values(pd.Series(valid + 0.0)))
+            self.kll.update(valid)
+            self._add_moments(len(valid), valid)
+        else:
+            valid = series.dropna()
+            self.nulls += len(series) - len(valid)
+            self.hll.update_hashes(_hash_values(valid))
+        self.count += len(valid)
+
+    def _add_moments(self, n_b: int, values: np.ndarray) -> None:
+        if n_b == 0:
+            return
+        mean_b = values.mean()
+        centered = values - mean_b
+        sq = centered * centered
+        self._merge_moments(self.count, n_b, mean_b, sq.sum(), (sq * centered).sum())
+
+    def _merge_moments(self, n_a, n_b, mean_b, m2_b, m3_b) -> None:
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.m3 += m3_b + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2 \
+            + 3 * delta * (n_a * m2_b - n_b * self.m2) / n
+        self.m2 += m2_b + delta ** 2 * n_a * n_b / n
+        self.mean += delta * n_b / n
+
+    def merge(self, other: "ColumnSketch") -> "ColumnSketch":
+        if other.numeric != self.numeric:
+            raise ValueError("Cannot merge a numeric and a non-numeric column sketch")
+        if self.numeric and other.count:
+            self._merge_moments(self.count, other.count, other.mean, other.m2, other.m3)
+            self.kll.merge(other.kll)
+        self.hll.merge(other.hll)
+        self.count += other.count
+        self.nulls += other.nulls
+        return self
+
+    def summary(self) -> dict:
+        n = self.count
+        row = {"count": n, "nulls": self.nulls,
+               "distinct": min(int(round(self.hll.estimate())), n),
+               "iqr_outliers": 0}
+        if not self.numeric:
+            return row
+        q1, median, q3 = self.kll.quantiles([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        m2 = 0.0 if abs(self.m2) < 1e-14 else self.m2
+        m3 = 0.0 if abs(self.m3) < 1e-14 else self.m3
+        # same adjusted Fisher–Pearson skew as DataFrame.skew()
+        skew = np.nan if n < 3 else 0.0 if m2 == 0 else \
+            n * (n - 1) ** 0.5 / (n - 2) * (m3 / m2 ** 1.5)
+        row.update(
+            mean=self.mean if n else np.nan,
+            std=math.sqrt(self.m2 / (n - 1)) if n > 1 else np.nan,
+            skew=skew,
+            min=self.kll.min if n else np.nan, q1=q1, median=median, q3=q3,
+            max=self.kll.max if n else np.nan,
+            iqr_outliers=0 if n == 0 else
+            self.kll.rank(q1 - 1.5 * iqr) + n - self.kll.rank(q3 + 1.5 * iqr, True))
+        return row
+
+
+# ───────────────────────── frame sketch ─────────────────────────
+class HealthSketch:
+    """
+    Column sketches for every column seen so far, plus a uniform bottom-k
+    row sample: every row draws a random key and the `sample_rows` smallest
+    keys are kept, so two samples merge by keeping the smallest keys of both.
+    Pass distinct seeds to sketches built in different processes.
+    """
+
+    def __init__(self, sample_rows: int = DEFAULT_SAMPLE_ROWS, seed: int | None = None):
+        self.sample_rows = sample_rows
+        self.n_rows = 0
+        self.columns: dict[str, ColumnSketch] = {}
+        self.sample = pd.DataFrame()
+        self._keys = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, df: pd.DataFrame) -> "HealthSketch":
+        numeric = set(df.head(0).select_dtypes(include=[np.number]).columns)
+        for col in df.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnSketch(
+                    col in numeric, seed=int(self._rng.integers(2 ** 32)))
+                self.columns[col].nulls = self.n_rows   # absent from earlier chunks
+            self.columns[col].update(df[col])
+        for col in self.columns.keys() - set(df.columns):
+            self.columns[col].nulls += len(df)
+        self.n_rows += len(df)
+        self._add_sample(df.reset_index(drop=True), self._rng.random(len(df)))
+        return self
+
+    def _add_sample(self, rows: pd.DataFrame, keys: np.ndarray) -> None:
+        if len(rows) > self.sample_rows:
+            keep = np.argpartition(keys, self.sample_rows)[:self.sample_rows]
+            rows, keys = rows.iloc[keep], keys[keep]
+        rows = pd.concat([self.sample, rows], ignore_index=True) \
+            if len(self.sample) else rows.reset_index(drop=True)
+        keys = np.concatenate([self._keys, keys])
+        if len(keys) > self.sample_rows:
+            keep = np.sort(np.argpartition(keys, self.sample_rows)[:self.sample_rows])
+            rows, keys = rows.iloc[keep].reset_index(drop=True), keys[keep]
+        self.sample, self._keys = rows, keys
+
+    def merge(self, other: "HealthSketch") -> "HealthSketch":
+        for col, sk in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(sk)
+            else:
+                self.columns[col] = sk
+                sk.nulls += self.n_rows     # column absent from our rows
+        for col in self.columns.keys() - other.columns.keys():
+            self.columns[col].nulls += other.n_rows
+        self.n_rows += other.n_rows
+        self._add_sample(other.sample, other._keys)
+        return self
+
+    def stats(self) -> pd.DataFrame:
+        """Estimated counterpart of fused_column_stats() over every row seen."""
+        rows = {col: sk.summary() for col, sk in self.columns.items()}
+        table = pd.DataFrame.from_dict(rows, orient="index") \
+            .reindex(index=list(self.columns), columns=STATS_COLUMNS)
+        table["dtype"] = self.sample.dtypes.reindex(table.index).astype(str)
+        table["numeric"] = [sk.numeric for sk in self.columns.values()]
+        table["null_pct"] = table["nulls"] / self.n_rows if self.n_rows else np.nan
+        table[["count", "nulls", "distinct", "iqr_outliers"]] = \
+            table[["count", "nulls", "distinct", "iqr_outliers"]].astype("int64")
+        return table
@@ -31,7 +31,6 @@ from scipy.stats import shapiro, normaltest, jarque_bera, probplot
 import statsmodels.api as sm
 from statsmodels.api import OLS, add_constant
 from statsmodels.stats.diagnostic import het_breuschpagan
-from statsmodels.stats.outliers_influence import variance_inflation_factor
 from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 
 from sklearn.decomposition import PCA
@@ -43,6 +42,9 @@ from sklearn.feature_selection import mutual_info_classif, mutual_info_regressio
 import pingouin as pg
 # from pandas_profiling import ProfileReport
 
+from src.Stage_1_Ingestion.collinearity import vif_scores
+from src.Stage_2_EPD_Analysis.associations import AssociationEngine, upper_pairs
+
 
 def hopkins_statistic(X, m=None, random_state=0):
     """Compute Hopkins statistic for cluster tendency."""
@@ -79,6 +81,7 @@ class EDAnalyzer:
         bp_alpha: float = 0.05,
         max_dendro: int = 30,
         sample_size: int = 5000,
+        n_jobs: int = 1,
     ):
         self.df = df.copy()
         self.mode = mode.lower()
@@ -90,6 +93,7 @@ class EDAnalyzer:
         self.norm_alpha = normality_alpha
         self.bp_alpha = bp_alpha
         self.max_dendro = max_dendro
+        self.n_jobs = n_jobs
 
         # sample for heavy tests
         if len(self.df) > sample_size:
@@ -99,24 +103,6 @@ class EDAnalyzer:
 
         self.report = {}
 
-    @staticmethod
-    def _cramers_v(conf):
-        chi2 = stats.chi2_contingency(conf)[0]
-        n = conf.values.sum()
-        r, k = conf.shape
-        return np.sqrt(chi2 / (n * (min(r - 1, k - 1))))
-
-    @staticmethod
-    def _corr_ratio(df, cat, num):
-        arr = df[[cat, num]].dropna()
-        var_tot = arr[num].var()
-        if var_tot == 0 or len(arr) == 0:
-            return 0.0
-        grps = arr.groupby(cat)[num]
-        weighted_var = sum(grps.count()[lvl] * grps.var()[lvl]
-                           for lvl in grps.groups) / len(arr)
-        return max(0.0, 1 - weighted_var / var_tot)
-
     def univariate(self):
         desc = self.df.describe(include="all").T
         desc["missing"] = self.df.isna().sum()
@@ -150,54 +136,60 @@ class EDAnalyzer:
             self.outdir / "normality_tests.csv", index=False)
         self.report["normality"] = norm_res
 
+    def _selected_pairs(self, matrix: pd.DataFrame, thr: float,
+                        upper: bool = True) -> list[tuple]:
+        """Pairs to plot: all in full mode, otherwise |value| ≥ thr (NaN never)."""
+        values = matrix.to_numpy(dtype=float)
+        keep = np.ones(values.shape, bool) if self.mode == "full" \
+            else np.abs(values) >= thr
+        if upper:
+            keep = np.triu(keep, k=1)
+        return [(matrix.index[i], matrix.columns[j], values[i, j])
+                for i, j in zip(*np.nonzero(keep))]
+
     def bivariate(self):
         nums = self.df.select_dtypes("number").columns
         cats = self.df.select_dtypes(["object", "category"]).columns
-        brep = {"num_num": {}, "num_cat": {}, "cat_cat": {}}
+        engine = AssociationEngine(self.df, n_jobs=self.n_jobs)
+        pearson = engine.pearson(nums)
+        eta = engine.correlation_ratio(cats, nums)
+        cramers = engine.cramers_v(cats)
+        brep = {
+            "num_num": upper_pairs(pearson),
+            "num_cat": {(c, n): float(eta.loc[c, n]) for c in cats for n in nums},
+            "cat_cat": upper_pairs(cramers),
+        }
+        self.report["association_matrices"] = {
+            "pearson": pearson, "eta2": eta, "cramers_v": cramers}
 
         # numeric–numeric
-        for i, x in enumerate(nums):
-            for y in nums[i + 1:]:
-                r = self.df[x].corr(self.df[y])
-                brep["num_num"][(x, y)] = r
-                do_plot = (self.mode == "full") or (abs(r) >= self.corr_thr)
-                if do_plot:
-                    plt.figure()
-                    sns.scatterplot(x=x, y=y, data=self.df, s=10)
-                    plt.title(f"{x}↔{y} (pearson r={r:.2f})")
-                    plt.tight_layout()
-                    plt.savefig(self.outdir / f"{x}__{y}__scatter.png")
-                    plt.close()
+        for x, y, r in self._selected_pairs(pearson, self.corr_thr):
+            plt.figure()
+            sns.scatterplot(x=x, y=y, data=self.df, s=10)
+            plt.title(f"{x}↔{y} (pearson r={r:.2f})")
+            plt.tight_layout()
+            plt.savefig(self.outdir / f"{x}__{y}__scatter.png")
+            plt.close()
 
         # numeric–categorical
-        for cat in cats:
-            for num in nums:
-                eta = self._corr_ratio(self.df, cat, num)
-                brep["num_cat"][(cat, num)] = eta
-                do_plot = (self.mode == "full") or (eta >= self.assoc_thr)
-                if do_plot:
-                    plt.figure()
-                    sns.boxplot(x=cat, y=num, data=self.df)
-                    plt.xticks(rotation=45)
-                    plt.title(f"{num} by {cat} (η²={eta:.2f})")
-                    plt.tight_layout()
-                    plt.savefig(self.outdir / f"{cat}__{num}__box.png")
-                    plt.close()
+        for cat, num, e in self._selected_pairs(eta, self.assoc_thr, upper=False):
+            plt.figure()
+            sns.boxplot(x=cat, y=num, data=self.df)
+            plt.xticks(rotation=45)
+            plt.title(f"{num} by {cat} (η²={e:.2f})")
+            plt.tight_layout()
+            plt.savefig(self.outdir / f"{cat}__{num}__box.png")
+            plt.close()
 
         # categorical–categorical
-        for i, a in enumerate(cats):
-            for b in cats[i + 1:]:
-                conf = pd.crosstab(self.df[a], self.df[b])
-                v = self._cramers_v(conf)
-                brep["cat_cat"][(a, b)] = v
-                do_plot = (self.mode == "full") or (v >= self.assoc_thr)
-                if do_plot:
-                    plt.figure(figsize=(6, 5))
-                    sns.heatmap(conf, annot=True, fmt="d")
-                    plt.title(f"Cramér’s V {a}↔{b} = {v:.2f}")
-                    plt.tight_layout()
-                    plt.savefig(self.outdir / f"{a}__{b}__heatmap.png")
-                    plt.close()
+        for a, b, v in self._selected_pairs(cramers, self.assoc_thr):
+            conf = pd.crosstab(self.df[a], self.df[b])
+            plt.figure(figsize=(6, 5))
+            sns.heatmap(conf, annot=True, fmt="d")
+            plt.title(f"Cramér’s V {a}↔{b} = {v:.2f}")
+            plt.tight_layout()
+            plt.savefig(self.outdir / f"{a}__{b}__heatmap.png")
+            plt.close()
 
         self.report["bivariate"] = brep
 
@@ -205,10 +197,10 @@ class EDAnalyzer:
         nums = self.df.select_dtypes("number").columns.dropna()
         X = self.df[nums].dropna()
 
-        # VIF
+        # VIF: diag of the inverse correlation matrix (centred, with intercept)
         vif = pd.DataFrame({
             "feature": nums,
-            "VIF": [variance_inflation_factor(X.values, i) for i in range(X.shape[1])]
+            "VIF": vif_scores(X).to_numpy()
         })
         vif.to_csv(self.outdir / "vif.csv", index=False)
         self.report["vif"] = vif
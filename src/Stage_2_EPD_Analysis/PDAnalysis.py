@@ -31,12 +31,16 @@ from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.inspection import permutation_importance
 
 from scipy.spatial.distance import jensenshannon
-from sklearn.metrics import mutual_info_score
-from itertools import combinations
 from scipy.stats import entropy as kl_entropy
 from scipy.stats import anderson
 from statsmodels.distributions.empirical_distribution import ECDF
 
+from src.Stage_2_EPD_Analysis.associations import AssociationEngine
+from src.Stage_2_EPD_Analysis.bootstrap import MAX_BLOCK_BYTES, bootstrap_ci, column_rng
+from src.Stage_2_EPD_Analysis.dist_fit import FitCache, fit_distribution
+from src.Stage_2_EPD_Analysis.histogram_cache import HistogramCache, jsd, kl, psi
+from src.Stage_2_EPD_Analysis.rank_correlation import RankCorrelation
+
 
 REPORT_DIR = None  # set in main()
 
@@ -51,6 +55,7 @@ class ProbabilisticAnalysis:
         min_dist_count: int = 50,
         entropy_bins: int = 20,
         jobs: int = 1,
+        fit_cache_dir: str | Path | None = None,
     ):
         if not isinstance(df, pd.DataFrame):
             raise TypeError("`df` must be a pandas DataFrame")
@@ -67,6 +72,7 @@ class ProbabilisticAnalysis:
         self.min_dist_count = min_dist_count
         self.entropy_bins = entropy_bins
         self.jobs = jobs
+        self.fit_cache_dir = fit_cache_dir
         self.copula_loglik = None
         self.model_score = None
         self.distributions: dict[str, tuple] = {}
@@ -78,6 +84,8 @@ class ProbabilisticAnalysis:
         self.group_stats: pd.DataFrame | None = None
         self.copula_model = None
         self.perm_importance_: pd.Series | None = None
+        self._assoc: AssociationEngine | None = None
+        self._hist: HistogramCache | None = None
 
     def detect_nonlinearity(x, y):
         # Remove NaNs
@@ -100,59 +108,26 @@ class ProbabilisticAnalysis:
 
     @staticmethod
     def _fit_one_distribution(self, col: str, values: np.ndarray):
-        """Helper for parallel distribution fitting on a single column."""
-
-        candidate_distros = [
-            "norm",        # Normal (Gaussian) — symmetric bell curve
-            "lognorm",     # Log-Normal — positive-skewed data, e.g., income
-            "gamma",       # Gamma — positive-only, skewed data rainfall, time
-            "beta",        # Beta — bounded between 0 and 1, e.g., proportions, probabilities
-            "weibull_min",  # Weibull — versatile, survival/failure analysis
-            "expon",       # Exponential — memoryless events, time between Poisson events
-            "pareto",      # Pareto — long tail distributions wealth, file sizes
-            "t",           # Student's t — ~ normal, but  heavier tails - small samples
-            "cauchy",      # Cauchy — very heavy-tailed, no mean/variance, use with caution
-            "rayleigh",    # Rayleigh — positive values, magnitude of 2D vectors signal noise
-            "triang"       # Triangular — known min/mode/max shape, simple bounded distribution
-        ]
+        """Helper for parallel distribution fitting on a single column (see dist_fit.py)."""
+        best = fit_distribution(values)  # (dist_name, params, aic, ks_stat, ks_p)
+        if best is None:
+            print(f"⚠️ No valid distribution fit found for column '{col}'")
+            return col, None, None
 
-        best = None  # (dist_name, params, aic, ks_stat, ks_p)
-        for name in candidate_distros:
-            dist = getattr(stats, name)
-            try:
-                if name in {"lognorm", "gamma", "expon", "pareto", "rayleigh"}:
-                    if np.any(values <= 0):
-                        continue  # requires strictly positive
-                elif name in {"beta", "triang"}:
-                    if np.any(values < 0) or np.any(values > 1):
-                        continue  # must be bounded [0, 1]
-                params = dist.fit(values)
-                ll = np.sum(dist.logpdf(values, *params))
-                k = len(params)
-                aic = 2 * k - 2 * ll
-                ks_stat, ks_p = stats.kstest(values, name, args=params)
-                candidate = (name, params, aic, ks_stat, ks_p)
-
-                if best is None or candidate[2] < best[2]:  # minimize AIC
-                    best = candidate
-            except Exception:
-                continue
-            # Add Anderson-Darling test for normality as extra info
+        # Add Anderson-Darling statistic of the best fit as extra info
         try:
-            fitted_cdf = dist.cdf
-            ad_stat = self._generic_ad_stat(
-                values, lambda x: fitted_cdf(x, *params))
+            fitted = getattr(stats, best[0])
+            ad_stat = float(self._generic_ad_stat(
+                values, lambda x: fitted.cdf(x, *best[1])))
         except Exception:
             ad_stat = None
-
-        if best is None:
-            print(f"⚠️ No valid distribution fit found for column '{col}'")
-
         return col, best, ad_stat
 
     def fit_all_distributions(self) -> dict[str, tuple]:
         """
-        Fit distributions in parallel.
+        Fit distributions in parallel: screen every candidate on a subsample,
+        refine the best two on the full column. With fit_cache_dir set, fits
+        of columns whose values have not changed are reused from disk.
         In 'auto' mode, only columns with >= min_dist_count non-null values are fitted.
         In 'full' mode, all numeric columns (with at least one non-null) are attempted.
         """
@@ -172,15 +147,34 @@ class ProbabilisticAnalysis:
             if len(self.df[col].dropna()) >= 5
         ]
 
+        # unchanged columns come from the fit cache; only the rest are fitted
+        cache = FitCache(self.fit_cache_dir) if self.fit_cache_dir else None
+        results, misses = {}, []
+        for col, vals in tasks:
+            hit = cache.get(vals) if cache else None
+            if hit is not None:
+                results[col] = hit
+            else:
+                misses.append((col, vals))
+        if cache and tasks:
+            print(f"→ Distribution fits: {len(tasks) - len(misses)} cached, "
+                  f"{len(misses)} to fit")
+
         # parallel execution
-        results = Parallel(n_jobs=self.jobs)(
+        fitted = Parallel(n_jobs=self.jobs)(
             delayed(self._fit_one_distribution)(self, col, vals)
-            for col, vals in tasks
+            for col, vals in misses
         )
+        values = dict(misses)
+        for col, best, ad_stat in fitted:
+            results[col] = (best, ad_stat)
+            if cache:
+                cache.put(values[col], best, ad_stat)
 
         # collect best fits
         dist_out = {}
-        for col, best, ad_stat in results:
+        for col, _ in tasks:
+            best, ad_stat = results[col]
             if best is None:
                 continue
             name, params, aic, ks, pval = best
@@ -237,28 +231,16 @@ class ProbabilisticAnalysis:
         print(f"→ Shannon entropy saved to {REPORT_DIR/'shannon_entropy.csv'}")
         return ent
 
+    def _associations(self) -> AssociationEngine:
+        """Shared engine: object columns are factorized once for every matrix."""
+        if self._assoc is None:
+            self._assoc = AssociationEngine(self.df, n_jobs=self.jobs)
+        return self._assoc
+
     def cramers_v_matrix(self) -> pd.DataFrame:
         """Pairwise Cramér's V for all object columns (categorical ↔ categorical)."""
         obj_cols = self.df.select_dtypes(include='object').columns
-        result = pd.DataFrame(index=obj_cols, columns=obj_cols, dtype=float)
-
-        for col1, col2 in combinations(obj_cols, 2):
-            confusion_matrix = pd.crosstab(self.df[col1], self.df[col2])
-            if confusion_matrix.shape[0] < 2 or confusion_matrix.shape[1] < 2:
-                continue  # skip invalid crosstab
-
-            try:
-                chi2 = stats.chi2_contingency(confusion_matrix)[0]
-                n = confusion_matrix.sum().sum()
-                phi2 = chi2 / n
-                r, k = confusion_matrix.shape
-                v = np.sqrt(phi2 / min(k - 1, r - 1))
-            except ZeroDivisionError:
-                v = 0.0
-
-            result.loc[col1, col2] = result.loc[col2, col1] = v
-
-        np.fill_diagonal(result.values, 1.0)
+        result = self._associations().cramers_v(obj_cols)
         out_path = REPORT_DIR / "cramers_v_matrix.csv"
         result.to_csv(out_path)
         print(f"→ Cramér’s V matrix saved to {out_path}")
@@ -266,48 +248,24 @@ class ProbabilisticAnalysis:
 
     def theils_u_matrix(self) -> pd.DataFrame:
         """Theil's U matrix (asymmetrical) for all categorical pairs."""
-        def theils_u(x, y):
-            s_xy = mutual_info_score(x, y)
-            x_enc = pd.factorize(x.dropna())[0]
-            hx = stats.entropy(np.bincount(x_enc))
-            return s_xy / hx if hx != 0 else 1.0
-
         obj_cols = self.df.select_dtypes(include='object').columns
-        result = pd.DataFrame(index=obj_cols, columns=obj_cols, dtype=float)
-
-        for col1 in obj_cols:
-            for col2 in obj_cols:
-                if col1 == col2:
-                    result.loc[col1, col2] = 1.0
-                else:
-                    result.loc[col1, col2] = theils_u(
-                        self.df[col1], self.df[col2])
-
+        result = self._associations().theils_u(obj_cols)
         result.to_csv(REPORT_DIR / "theils_u_matrix.csv")
         print(
             f"→ Theil’s U matrix saved to {REPORT_DIR/'theils_u_matrix.csv'}")
         return result
 
-    def rank_correlations(self) -> pd.DataFrame:
-        """Kendall's Tau and Spearman correlations for numeric pairs."""
+    def rank_correlations(self, sample_rows: int | None = None) -> pd.DataFrame:
+        """
+        Kendall's Tau and Spearman correlations for numeric pairs, each column
+        ranked once (see rank_correlation.py); `sample_rows` caps tall data
+        with a uniform row sample.
+        """
         num_cols = self.df.select_dtypes(include=np.number).columns
-        tau_df = pd.DataFrame(index=num_cols, columns=num_cols, dtype=float)
-        spear_df = pd.DataFrame(index=num_cols, columns=num_cols, dtype=float)
-
-        for c1, c2 in combinations(num_cols, 2):
-            try:
-                x = self.df[c1].dropna()
-                y = self.df[c2].dropna()
-                idx = x.index.intersection(y.index)
-                tau, _ = stats.kendalltau(x.loc[idx], y.loc[idx])
-                spear, _ = stats.spearmanr(x.loc[idx], y.loc[idx])
-            except Exception:
-                tau, spear = np.nan, np.nan
-            tau_df.loc[c1, c2] = tau_df.loc[c2, c1] = tau
-            spear_df.loc[c1, c2] = spear_df.loc[c2, c1] = spear
-
-        np.fill_diagonal(tau_df.values, 1.0)
-        np.fill_diagonal(spear_df.values, 1.0)
+        engine = RankCorrelation(self.df[num_cols], n_jobs=self.jobs,
+                                 sample_rows=sample_rows)
+        tau_df = engine.kendall()
+        spear_df = engine.spearman()
         tau_df.to_csv(REPORT_DIR / "kendall_tau.csv")
         spear_df.to_csv(REPORT_DIR / "spearman_corr.csv")
         print("→ Kendall’s Tau and Spearman correlation matrices saved.")
@@ -606,48 +564,42 @@ class ProbabilisticAnalysis:
         return 0.5 * (kl_entropy(p, m) + kl_entropy(q, m))
 
     def population_stability_index(self, expected, actual, bins=10):
-        """Compute PSI for drift detection between expected and actual."""
-        expected_perc, _ = np.histogram(expected, bins=bins, density=True)
-        actual_perc, _ = np.histogram(actual, bins=bins, density=True)
-        expected_perc = expected_perc + 1e-9
-        actual_perc = actual_perc + 1e-9
-        return np.sum((expected_perc - actual_perc) * np.log(expected_perc / actual_perc))
-
-    def drift_and_divergence_tests(self) -> pd.DataFrame:
-        num_cols = self.df.select_dtypes(include=np.number).columns.tolist()
+        """Compute PSI for drift detection between expected and actual (shared bin edges)."""
+        edges = np.histogram_bin_edges(np.concatenate([expected, actual]), bins=bins)
+        return psi(np.histogram(expected, bins=edges)[0],
+                   np.histogram(actual, bins=edges)[0])
+
+    def _histograms(self) -> HistogramCache:
+        """Shared histogram cache over the numeric columns (see histogram_cache.py)."""
+        if self._hist is None:
+            num_cols = self.df.select_dtypes(include=np.number).columns
+            self._hist = HistogramCache(self.df[num_cols])
+        return self._hist
+
+    def drift_and_divergence_tests(self, base_frac=0.1, bins=20) -> pd.DataFrame:
+        """
+        JSD, PSI and KL between a base window (first `base_frac` of rows) and
+        the rest, from cached histograms on shared per-column bin edges.
+        """
+        hist = self._histograms()
         results = []
 
-        # For now, use first 10% vs rest as base vs current
-        split_idx = int(0.1 * len(self.df))
-        base = self.df.iloc[:split_idx]
-        current = self.df.iloc[split_idx:]
+        # base = first `base_frac` of rows, current = the rest
+        split_idx = int(base_frac * len(self.df))
+        base, current = (0, split_idx), (split_idx, len(self.df))
+        counts = hist.counts([base, current], bins=bins)
 
-        for col in num_cols:
-            base_vals = base[col].dropna().values
-            curr_vals = current[col].dropna().values
-            if len(base_vals) < 5 or len(curr_vals) < 5:
-                continue
-            try:
-                jsd = self.jensen_shannon_divergence(self,
-                                                     np.histogram(
-                                                         base_vals, bins=20, density=True)[0],
-                                                     np.histogram(
-                                                         curr_vals, bins=20, density=True)[0],
-                                                     )
-                psi = self.population_stability_index(
-                    self, base_vals, curr_vals, bins=20)
-                kl = kl_entropy(
-                    np.histogram(base_vals, bins=20, density=True)[0] + 1e-9,
-                    np.histogram(curr_vals, bins=20, density=True)[0] + 1e-9,
-                )
-                results.append({
-                    "feature": col,
-                    "JSD": jsd,
-                    "PSI": psi,
-                    "KL_divergence": kl
-                })
-            except Exception:
+        for col in hist.columns:
+            base_counts = counts[(col, base, bins)]
+            curr_counts = counts[(col, current, bins)]
+            if base_counts.sum() < 5 or curr_counts.sum() < 5:
                 continue
+            results.append({
+                "feature": col,
+                "JSD": jsd(base_counts, curr_counts),
+                "PSI": psi(base_counts, curr_counts),
+                "KL_divergence": kl(base_counts, curr_counts)
+            })
 
         df_out = pd.DataFrame(results)
         df_out.to_csv(REPORT_DIR / "divergence_tests.csv", index=False)
@@ -655,36 +607,27 @@ class ProbabilisticAnalysis:
             f"→ Drift & divergence tests saved to {REPORT_DIR/'divergence_tests.csv'}")
         return df_out
 
-    def bootstrap_column_ci(self, n_iter=1000, ci_level=95) -> pd.DataFrame:
+    def bootstrap_column_ci(self, n_iter=1000, ci_level=95, seed=0,
+                            weights="multinomial",
+                            max_block_bytes=MAX_BLOCK_BYTES) -> pd.DataFrame:
         """
         For each numeric column, compute bootstrap CI for mean & median.
-        More efficient: avoids repeated percentiles inside loop.
+        Resamples are count vectors over the sorted values, drawn in blocks of
+        at most `max_block_bytes` (see bootstrap.py); columns run in parallel,
+        each with its own RNG seeded from (seed, column name).
         """
         num_cols = self.df.select_dtypes(include=np.number).columns
-        results = []
-        alpha = (100 - ci_level) / 2
-
-        for col in num_cols:
-            vals = self.df[col].dropna().values
-            if len(vals) < 30:
-                continue  # Avoid unstable CI estimates
-
-            # Bootstrap samples
-            samples = np.random.choice(
-                vals, size=(n_iter, len(vals)), replace=True)
-            means = np.mean(samples, axis=1)
-            medians = np.median(samples, axis=1)
-
-            ci_mean = np.percentile(means, [alpha, 100 - alpha])
-            ci_median = np.percentile(medians, [alpha, 100 - alpha])
-
-            results.append({
-                "feature": col,
-                "mean_lower": ci_mean[0],
-                "mean_upper": ci_mean[1],
-                "median_lower": ci_median[0],
-                "median_upper": ci_median[1]
-            })
+        tasks = [
+            (col, self.df[col].dropna().values)
+            for col in num_cols
+            if self.df[col].count() >= 30  # Avoid unstable CI estimates
+        ]
+        cis = Parallel(n_jobs=self.jobs)(
+            delayed(bootstrap_ci)(vals, n_iter, ci_level, column_rng(seed, col),
+                                  weights, max_block_bytes)
+            for col, vals in tasks
+        )
+        results = [{"feature": col, **ci} for (col, _), ci in zip(tasks, cis)]
 
         df_out = pd.DataFrame(results)
         df_out.to_csv(REPORT_DIR / "bootstrap_cis.csv", index=False)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+associations.py – vectorized all-pairs association engine
+
+    engine = AssociationEngine(df, n_jobs=-1)
+    engine.pearson(nums)                 # numeric × numeric, one matrix product
+    engine.correlation_ratio(cats, nums) # η², one grouped sum per categorical
+    engine.cramers_v(cats)               # categorical × categorical
+    engine.theils_u(cats)                # asymmetric, from the same tables
+
+Categorical columns are factorized to integer codes once (NaN → -1) and
+cached, as are their entropies. Every contingency table is a single
+np.bincount over the code pairs and yields Cramér's V and both Theil's U
+directions at once. The η² level sums are one sparse indicator × matrix
+product per categorical (a groupby-sum over all numeric columns at once);
+Σx² needs no grouping, as SS_within = Σx² − Σ_levels sum² / count. Cramér's V uses
+chi2_contingency's statistic, Yates-corrected for 2×2 tables like scipy.
+Tables are computed in parallel over blocks of columns once the work is
+large enough to pay for the workers.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy import sparse
+
+from src.Stage_1_Ingestion.collinearity import centered, correlation_matrix
+
+PARALLEL_MIN_CELLS = 20_000_000     # pairs × rows before fanning out
+DENSE_TABLE_MAX_CELLS = 1 << 22     # larger contingency tables are counted sparsely
+
+
+def factorize(series: pd.Series) -> tuple[np.ndarray, int]:
+    """Integer codes (NaN → -1) and the number of levels."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    return codes.astype(np.int64), len(uniques)
+
+
+def contingency(a: tuple[np.ndarray, int], b: tuple[np.ndarray, int]) -> np.ndarray:
+    """Observed counts of two factorized columns (rows with a NaN dropped)."""
+    (ca, la), (cb, lb) = a, b
+    valid = (ca >= 0) & (cb >= 0)
+    flat = np.bincount(ca[valid] * lb + cb[valid], minlength=la * lb)
+    return flat.reshape(la, lb)
+
+
+def _entropy(counts: np.ndarray) -> float:
+    """Shannon entropy (nats) of a count vector."""
+    p = counts[counts > 0] / counts.sum()
+    return float(-(p * np.log(p)).sum())
+
+
+def _chi2(table: np.ndarray) -> tuple[float, int, int, int]:
+    """chi2_contingency's statistic on the non-empty rows/columns → (chi2, r, k, n)."""
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0].astype(np.float64)
+    r, k = table.shape
+    n = int(table.sum())
+    if r < 2 or k < 2:
+        return 0.0, r, k, n
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / n
+    if r == 2 and k == 2:                       # Yates, as scipy for dof == 1
+        diff = expected - table
+        table = table + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+    return float(((table - expected) ** 2 / expected).sum()), r, k, n
+
+
+def cramers_v_from_table(table: np.ndarray) -> float:
+    chi2, r, k, n = _chi2(table)
+    if min(r, k) < 2:
+        return np.nan
+    return float(np.sqrt(chi2 / (n * min(r - 1, k - 1))))
+
+
+def pair_association(a: tuple[np.ndarray, int], b: tuple[np.ndarray, int],
+                     complete: bool = False) -> tuple[float, float, float, float]:
+    """
+    (Cramér's V, mutual information, H(a), H(b)) over the rows where both
+    columns are present, from ONE contingency table; entropies in nats.
+    Small tables are a dense np.bincount(a*K+b); when la·lb would be too
+    large (id-like columns) only the non-zero cells are counted, and chi²
+    uses Σ O²/E − n, which needs no empty cells.
+    """
+    (ca, la), (cb, lb) = a, b
+    if not complete:
+        valid = (ca >= 0) & (cb >= 0)
+        ca, cb = ca[valid], cb[valid]
+    n = len(ca)
+    if n == 0:
+        return np.nan, 0.0, 0.0, 0.0
+    keys = ca * lb + cb
+    if la * lb <= DENSE_TABLE_MAX_CELLS:
+        table = np.bincount(keys, minlength=la * lb).reshape(la, lb)
+        rows, cols = table.sum(axis=1), table.sum(axis=0)
+        v = cramers_v_from_table(table)
+        observed = table[table > 0]
+        row_i, col_j = np.nonzero(table)
+    else:
+        cells, observed = np.unique(keys, return_counts=True)
+        row_i, col_j = cells // lb, cells % lb
+        rows = np.bincount(row_i, weights=observed, minlength=la)
+        cols = np.bincount(col_j, weights=observed, minlength=lb)
+        r, k = int((rows > 0).sum()), int((cols > 0).sum())
+        if min(r, k) < 2:
+            v = np.nan
+        elif r == 2 and k == 2:                 # tiny: Yates needs the dense 2×2 table
+            table = np.zeros((2, 2))
+            table[np.unique(row_i, return_inverse=True)[1],
+                  np.unique(col_j, return_inverse=True)[1]] = observed
+            v = cramers_v_from_table(table)
+        else:
+            expected = rows[row_i] * cols[col_j] / n
+            chi2 = max(float((observed * observed / expected).sum()) - n, 0.0)
+            v = float(np.sqrt(chi2 / (n * min(r - 1, k - 1))))
+    joint = observed / n
+    mi = float((joint * np.log(joint * n * n / (rows[row_i] * cols[col_j]))).sum())
+    return v, max(mi, 0.0), _entropy(rows), _entropy(cols)
+
+
+def _association_rows(codes: list, complete: list[bool], rows: list[int]) -> list[list]:
+    """pair_association of each column in `rows` against every later column."""
+    return [[pair_association(codes[i], codes[j], complete[i] and complete[j])
+             for j in range(i + 1, len(codes))] for i in rows]
+
+
+class AssociationEngine:
+    def __init__(self, df: pd.DataFrame, n_jobs: int = 1):
+        self.df = df
+        self.n_jobs = n_jobs
+        self._codes: dict[str, tuple[np.ndarray, int]] = {}
+        self._entropies: dict[str, float] = {}
+        self._categorical: dict[tuple, tuple[pd.DataFrame, pd.DataFrame]] = {}
+
+    def codes(self, col: str) -> tuple[np.ndarray, int]:
+        if col not in self._codes:
+            self._codes[col] = factorize(self.df[col])
+        return self._codes[col]
+
+    def _parallel(self, n_pairs: int) -> bool:
+        return self.n_jobs != 1 and n_pairs * len(self.df) >= PARALLEL_MIN_CELLS
+
+    def pearson(self, nums) -> pd.DataFrame:
+        """Pairwise-complete Pearson matrix (same values as DataFrame.corr())."""
+        return correlation_matrix(self.df[list(nums)])
+
+    def correlation_ratio(self, cats, nums) -> pd.DataFrame:
+        """
+        η² = 1 − SS_within / SS_total for every (categorical, numeric) pair,
+        on the rows where both are present; 0 when the numeric is constant.
+        """
+        nums = list(nums)
+        out = pd.DataFrame(0.0, index=list(cats), columns=nums)
+        if not nums or out.empty:
+            return out
+        x, mask = centered(self.df[nums])
+        sq = x * x
+        sq_total = sq.sum(axis=0)
+        for cat in out.index:
+            codes, n_levels = self.codes(cat)
+            valid = codes >= 0
+            # level × row indicator, built directly in CSC (one entry per valid row)
+            groups = sparse.csc_matrix(
+                (np.ones(valid.sum()), codes[valid],
+                 np.concatenate([[0], np.cumsum(valid)])),
+                shape=(n_levels, len(x)))
+            total = groups @ x                             # per-level sums
+            count = groups @ mask if mask is not None else \
+                np.bincount(codes[valid], minlength=n_levels)[:, None]
+            # Σx² over the rows where the categorical is present; x is 0 where missing
+            q = sq_total - sq[~valid].sum(axis=0) if not valid.all() else sq_total
+            with np.errstate(invalid="ignore", divide="ignore"):
+                between = np.where(count > 0, total * total / count, 0.0).sum(axis=0)
+                n = count.sum(axis=0)
+                s_all = total.sum(axis=0)
+                ss_tot = q - s_all * s_all / n
+                eta = np.where((n > 0) & (ss_tot > 0), 1 - (q - between) / ss_tot, 0.0)
+            out.loc[cat] = np.clip(eta, 0.0, 1.0)
+        return out
+
+    def entropy(self, col: str) -> float:
+        """Shannon entropy (nats) of the non-null values, computed once per column."""
+        if col not in self._entropies:
+            codes, n_levels = self.codes(col)
+            self._entropies[col] = _entropy(np.bincount(codes[codes >= 0], minlength=n_levels))
+        return self._entropies[col]
+
+    def categorical(self, cats) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        (Cramér's V, Theil's U) matrices from one contingency table per
+        unordered pair. U[a, b] = I(a; b) / H(a), the share of a's entropy
+        explained by b (1 when a is constant). Rows are dealt round-robin
+        to `n_jobs` blocks so every block gets a similar number of pairs.
+        """
+        cats = list(cats)
+        key = tuple(cats)
+        if key in self._categorical:
+            return self._categorical[key]
+        codes = [self.codes(c) for c in cats]
+        complete = [bool((c >= 0).all()) for c, _ in codes]
+        k = len(cats)
+        if self._parallel(k * (k - 1) // 2):
+            n_blocks = min(k, 4 * effective_n_jobs(self.n_jobs))
+            blocks = [list(range(b, k, n_blocks)) for b in range(n_blocks)]
+            parts = Parallel(n_jobs=self.n_jobs)(
+                delayed(_association_rows)(codes, complete, rows) for rows in blocks)
+            by_row = {i: res for rows, part in zip(blocks, parts)
+                      for i, res in zip(rows, part)}
+        else:
+            by_row = dict(enumerate(_association_rows(codes, complete, range(k))))
+
+        v, u = np.eye(k), np.eye(k)
+        for i in range(k):
+            for j, (vij, mi, h_i, h_j) in enumerate(by_row[i], start=i + 1):
+                if complete[i] and complete[j]:     # same rows → cached entropies
+                    h_i, h_j = self.entropy(cats[i]), self.entropy(cats[j])
+                v[i, j] = v[j, i] = vij
+                u[i, j] = mi / h_i if h_i else 1.0
+                u[j, i] = mi / h_j if h_j else 1.0
+        result = (pd.DataFrame(v, index=cats, columns=cats),
+                  pd.DataFrame(u, index=cats, columns=cats))
+        self._categorical[key] = result
+        return result
+
+    def cramers_v(self, cats) -> pd.DataFrame:
+        """Symmetric Cramér's V matrix (NaN where a column has < 2 observed levels)."""
+        return self.categorical(cats)[0]
+
+    def theils_u(self, cats) -> pd.DataFrame:
+        """Asymmetric Theil's U (uncertainty coefficient) matrix."""
+        return self.categorical(cats)[1]
+
+
+def upper_pairs(matrix: pd.DataFrame) -> dict[tuple, float]:
+    """{(row, col): value} for the strict upper triangle of a square matrix."""
+    i, j = np.triu_indices(len(matrix), k=1)
+    names, values = matrix.index, matrix.to_numpy()
+    return {(names[a], names[b]): float(values[a, b]) for a, b in zip(i, j)}
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+bootstrap.py – memory-bounded bootstrap CIs for means and medians
+
+    rng = column_rng(seed=0, name="amount")
+    ci = bootstrap_ci(values, n_iter=1000, ci_level=95, rng=rng)
+    # {"mean_lower", "mean_upper", "median_lower", "median_upper"}
+
+A column is reduced once to its sorted distinct values u and frequencies f.
+A resample is then a count vector over u rather than n drawn values:
+  · "multinomial"  counts ~ Multinomial(n, f / n) – the classical bootstrap
+  · "poisson"      counts ~ Poisson(f) – independent per value; the
+                   resample size varies around n
+For mostly-distinct columns (> MOSTLY_DISTINCT · n values) the counts are
+over the positions of the sorted column instead: a bincount of n uniform
+indices per resample is cheaper than one binomial draw per value.
+The mean is counts · u / Σcounts (one matrix-vector product per block), and
+the median is a weighted quantile: a searchsorted on the cumulative counts,
+averaging the two middle order statistics like np.median.
+
+Resamples are drawn in blocks whose count and cumulative-count matrices fit
+in MAX_BLOCK_BYTES, so peak memory grows with neither n_iter nor n. When not
+even one count vector fits (16·|u| bytes over the budget), each resample is
+drawn segment by segment: segment totals first (Multinomial(n, ·) or
+Poisson), then the counts within each segment given its total, which is the
+same joint distribution. The mean is accumulated across segments and the two
+middle order statistics are looked up in the segments holding them.
+
+Each column gets its own RNG seeded from (seed, column name), so results are reproducible
+and independent of column order or parallel scheduling.
+"""
+from __future__ import annotations
+
+import zlib
+
+import numpy as np
+
+MAX_BLOCK_BYTES = 64 * 2**20
+MOSTLY_DISTINCT = 0.2      # distinct / n above which sorted positions are resampled
+WEIGHTS = ("multinomial", "poisson")
+
+
+def column_rng(seed: int, name) -> np.random.Generator:
+    """Per-column generator; stable across runs (crc32, not Python's salted hash)."""
+    return np.random.default_rng([seed, zlib.crc32(str(name).encode())])
+
+
+def _resample_counts(rng: np.random.Generator, freq: np.ndarray | None, n: int,
+                     size: int, weights: str) -> np.ndarray:
+    """`size` count vectors over the distinct values (freq None → over n positions)."""
+    if freq is None:
+        if weights == "poisson":
+            return rng.poisson(1.0, size=(size, n))
+        return np.stack([np.bincount(rng.integers(0, n, size=n), minlength=n)
+                         for _ in range(size)])
+    if weights == "poisson":
+        return rng.poisson(freq, size=(size, len(freq)))
+    return rng.multinomial(n, freq / n, size=size)
+
+
+def _weighted_medians(counts: np.ndarray, uniq: np.ndarray) -> np.ndarray:
+    """np.median of each resample, from its counts over the sorted values."""
+    cum = np.cumsum(counts, axis=1)
+    total = cum[:, -1].copy()
+    # offset each row so the flattened cumulative counts stay increasing
+    stride = int(total.max()) + 1
+    offset = np.arange(len(cum), dtype=np.int64) * stride
+    cum += offset[:, None]
+    flat = cum.ravel()
+    m = counts.shape[1]
+
+    def order_stat(k: np.ndarray) -> np.ndarray:
+        pos = np.searchsorted(flat, k + offset, side="right") - offset // stride * m
+        return uniq[pos]
+
+    return (order_stat((total - 1) // 2) + order_stat(total // 2)) / 2.0
+
+
+def _segmented_resample(rng: np.random.Generator, uniq: np.ndarray, freq: np.ndarray,
+                        n: int, weights: str, seg: int) -> tuple[float, float]:
+    """Mean and median of ONE resample, drawn `seg` distinct values at a time."""
+    starts = np.arange(0, len(uniq), seg)
+    seg_freq = np.add.reduceat(freq, starts)
+    totals = rng.poisson(seg_freq) if weights == "poisson" \
+        else rng.multinomial(n, seg_freq / n)
+    total = int(totals.sum())
+    if total == 0:                                  # poisson may draw nothing
+        return np.nan, np.nan
+    ends = np.cumsum(totals)
+    middle = dict.fromkeys({(total - 1) // 2, total // 2})
+    acc = 0.0
+    for s, a in enumerate(starts):
+        t = int(totals[s])
+        if t == 0:
+            continue
+        b = min(a + seg, len(uniq))
+        if seg_freq[s] == b - a:                    # all distinct: bincount of positions
+            counts = np.bincount(rng.integers(0, b - a, size=t), minlength=b - a)
+        else:
+            counts = rng.multinomial(t, freq[a:b] / seg_freq[s])
+        acc += float(counts @ uniq[a:b])
+        first = ends[s] - t
+        for k in middle:
+            if first <= k < ends[s]:
+                middle[k] = uniq[a + np.searchsorted(np.cumsum(counts), k - first,
+                                                     side="right")]
+    return acc / total, float(np.mean(list(middle.values())))
+
+
+def bootstrap_mean_median(values: np.ndarray, n_iter: int = 1000,
+                          rng: np.random.Generator | None = None,
+                          weights: str = "multinomial",
+                          max_block_bytes: int = MAX_BLOCK_BYTES
+                          ) -> tuple[np.ndarray, np.ndarray]:
+    """Bootstrap distributions (n_iter each) of the mean and the median."""
+    if weights not in WEIGHTS:
+        raise ValueError(f"Unknown weights: {weights}")
+    rng = rng if rng is not None else np.random.default_rng()
+    uniq, freq = np.unique(values, return_counts=True)
+    return _resample_stats(uniq, freq, n_iter, rng, weights, max_block_bytes)
+
+
+def _resample_stats(uniq: np.ndarray, freq: np.ndarray, n_iter: int,
+                    rng: np.random.Generator, weights: str,
+                    max_block_bytes: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Resampling part of bootstrap_mean_median, given the sorted distinct values
+    and their frequencies; working memory stays within ~max_block_bytes.
+    """
+    n = int(freq.sum())
+    means = np.empty(n_iter)
+    medians = np.empty(n_iter)
+    if 16 * len(uniq) > max_block_bytes:
+        # one count vector (+ cumsum) is over budget: draws, counts, cumsum and
+        # probabilities of a segment take ~32 bytes per value
+        seg = max(1, max_block_bytes // 32)
+        for i in range(n_iter):
+            means[i], medians[i] = _segmented_resample(rng, uniq, freq, n, weights, seg)
+        return means, medians
+    if len(uniq) > MOSTLY_DISTINCT * n and 16 * n <= max_block_bytes:
+        # per-value draws cost more than index draws: resample sorted positions
+        uniq, freq = np.repeat(uniq, freq), None
+    block = max(1, max_block_bytes // (16 * len(uniq)))   # counts + cumsum
+    for start in range(0, n_iter, block):
+        size = min(block, n_iter - start)
+        counts = _resample_counts(rng, freq, n, size, weights)
+        keep = counts.sum(axis=1) > 0               # poisson may draw nothing
+        stop = start + size
+        means[start:stop] = np.nan
+        medians[start:stop] = np.nan
+        counts = counts[keep]
+        idx = np.arange(start, stop)[keep]
+        means[idx] = (counts @ uniq) / counts.sum(axis=1)
+        medians[idx] = _weighted_medians(counts, uniq)
+    return means, medians
+
+
+def bootstrap_ci(values: np.ndarray, n_iter: int = 1000, ci_level: float = 95,
+                 rng: np.random.Generator | None = None,
+                 weights: str = "multinomial",
+                 max_block_bytes: int = MAX_BLOCK_BYTES) -> dict[str, float]:
+    """Percentile CIs for the mean and the median."""
+    means, medians = bootstrap_mean_median(values, n_iter, rng, weights, max_block_bytes)
+    alpha = (100 - ci_level) / 2
+    ci_mean = np.nanpercentile(means, [alpha, 100 - alpha])
+    ci_median = np.nanpercentile(medians, [alpha, 100 - alpha])
+    return {
+        "mean_lower": ci_mean[0],
+        "mean_upper": ci_mean[1],
+        "median_lower": ci_median[0],
+        "median_upper": ci_median[1],
+    }
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+dist_fit.py – screen-then-refine distribution fitting for ProbabilisticAnalysis
+
+    best = fit_distribution(values)      # (name, params, aic, ks_stat, ks_p) | None
+    cache = FitCache("cache/distributions")
+    hit = cache.get(values)              # (best, ad_stat) or None
+    cache.put(values, best, ad_stat)
+
+Phase 1 (screen) fits every candidate on a fixed-size uniform subsample
+(SCREEN_ROWS). norm, expon, lognorm and rayleigh use closed-form estimators
+(lognorm and rayleigh with loc = 0), so only the other families run
+scipy's numerical MLE, and on the subsample only. Candidates whose screen
+AIC trails the leader by more than HOPELESS_AIC_DELTA are dropped.
+Phase 2 (refine) fits the REFINE_TOP survivors on the full column (MLE
+seeded with the screen estimates; exact closed forms for norm / expon) and
+runs the KS test only for those.
+
+Results are cached on disk by the SHA-256 of the column's values plus the
+fitter settings (FIT_VERSION), so an unchanged column is not refit on the
+next run.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import scipy.stats as stats
+
+CANDIDATES = [
+    "norm",        # Normal (Gaussian) — symmetric bell curve
+    "lognorm",     # Log-Normal — positive-skewed data, e.g., income
+    "gamma",       # Gamma — positive-only, skewed data rainfall, time
+    "beta",        # Beta — bounded between 0 and 1, e.g., proportions, probabilities
+    "weibull_min",  # Weibull — versatile, survival/failure analysis
+    "expon",       # Exponential — memoryless events, time between Poisson events
+    "pareto",      # Pareto — long tail distributions wealth, file sizes
+    "t",           # Student's t — ~ normal, but  heavier tails - small samples
+    "cauchy",      # Cauchy — very heavy-tailed, no mean/variance, use with caution
+    "rayleigh",    # Rayleigh — positive values, magnitude of 2D vectors signal noise
+    "triang"       # Triangular — known min/mode/max shape, simple bounded distribution
+]
+POSITIVE_ONLY = {"lognorm", "gamma", "expon", "pareto", "rayleigh"}
+UNIT_INTERVAL = {"beta", "triang"}
+
+SCREEN_ROWS = 5_000
+REFINE_TOP = 2
+HOPELESS_AIC_DELTA = 100.0
+FIT_VERSION = 1                  # bump when the fitter's results change
+DEFAULT_FIT_CACHE_DIR = Path("cache/distributions")
+
+
+# ─────────────────────────── estimators ───────────────────────────
+def _closed_form(name: str, x: np.ndarray) -> tuple | None:
+    """MLE without an optimizer, where one exists (None otherwise)."""
+    if name == "norm":
+        return (float(x.mean()), float(x.std()))
+    if name == "expon":
+        loc = float(x.min())
+        return (loc, float(x.mean()) - loc)
+    if name == "lognorm":
+        logs = np.log(x)
+        return (float(logs.std()), 0.0, float(np.exp(logs.mean())))
+    if name == "rayleigh":
+        return (0.0, float(np.sqrt((x * x).mean() / 2)))
+    return None
+
+
+def _admissible(name: str, x: np.ndarray) -> bool:
+    if name in POSITIVE_ONLY:
+        return bool(np.all(x > 0))
+    if name in UNIT_INTERVAL:
+        return bool(np.all((x >= 0) & (x <= 1)))
+    return True
+
+
+def _aic(name: str, x: np.ndarray, params: tuple) -> float:
+    ll = np.sum(getattr(stats, name).logpdf(x, *params))
+    return 2 * len(params) - 2 * ll
+
+
+def _mle(name: str, x: np.ndarray, guess: tuple | None = None) -> tuple:
+    """
+    scipy's numerical MLE (from `guess` if given). A free loc can land above
+    the sample minimum (log-likelihood −inf); then refit with loc pinned
+    just below the minimum.
+    """
+    dist = getattr(stats, name)
+    kw = {}
+    if guess is not None:
+        *shapes, loc, scale = guess
+        kw = {"loc": loc, "scale": scale}
+    else:
+        shapes = []
+    params = dist.fit(x, *shapes, **kw)
+    if not np.isfinite(np.sum(dist.logpdf(x, *params))):
+        kw.pop("loc", None)
+        params = dist.fit(x, *shapes, floc=float(x.min() - 1e-3 * x.std()), **kw)
+    return tuple(params)
+
+
+def _screen_fit(name: str, x: np.ndarray) -> tuple:
+    params = _closed_form(name, x)
+    return params if params is not None else _mle(name, x)
+
+
+def _refine_fit(name: str, values: np.ndarray, guess: tuple) -> tuple:
+    """Full-data MLE: exact for norm / expon, else scipy's fit from `guess`."""
+    if name in {"norm", "expon"}:
+        return _closed_form(name, values)
+    return _mle(name, values, guess)
+
+
+def screen(values: np.ndarray, screen_rows: int = SCREEN_ROWS,
+           seed: int = 0) -> list[tuple[str, tuple, float]]:
+    """(name, params, aic) per admissible candidate on a subsample, best first."""
+    x = values
+    if len(values) > screen_rows:
+        rng = np.random.default_rng(seed)
+        x = values[rng.choice(len(values), size=screen_rows, replace=False)]
+    out = []
+    for name in CANDIDATES:
+        if not _admissible(name, values):
+            continue
+        try:
+            params = _screen_fit(name, x)
+            aic = _aic(name, x, params)
+        except Exception:
+            continue
+        if np.isfinite(aic):
+            out.append((name, tuple(params), float(aic)))
+    return sorted(out, key=lambda c: c[2])
+
+
+def fit_distribution(values: np.ndarray, screen_rows: int = SCREEN_ROWS,
+                     top: int = REFINE_TOP) -> tuple | None:
+    """Best fit by full-data AIC → (name, params, aic, ks_stat, ks_p), or None."""
+    screened = screen(values, screen_rows)
+    if not screened:
+        return None
+    lead = screened[0][2]
+    best = None
+    for name, guess, aic in screened[:top]:
+        if aic - lead > HOPELESS_AIC_DELTA:
+            break
+        try:
+            if len(values) <= screen_rows and _closed_form(name, values) is None:
+                params = guess                  # screened on the full column already
+            else:
+                params = _refine_fit(name, values, guess)
+            aic = _aic(name, values, params)
+            ks_stat, ks_p = stats.kstest(values, name, args=params)
+        except Exception:
+            continue
+        if np.isfinite(aic) and (best is None or aic < best[2]):
+            best = (name, params, float(aic), float(ks_stat), float(ks_p))
+    return best
+
+
+# ───────────────────────────── cache ──────────────────────────────
+class FitCache:
+    """
+    One JSON file per column content under `cache_dir`:
+        <cache_dir>/<sha256(values, FIT_VERSION, settings)>.json
+    """
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_FIT_CACHE_DIR,
+                 screen_rows: int = SCREEN_ROWS, top: int = REFINE_TOP):
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.settings = f"v{FIT_VERSION}|{screen_rows}|{top}|{','.join(CANDIDATES)}"
+
+    def key(self, values: np.ndarray) -> str:
+        digest = hashlib.sha256(self.settings.encode())
+        digest.update(str(values.dtype).encode())
+        digest.update(np.ascontiguousarray(values).tobytes())
+        return digest.hexdigest()
+
+    def get(self, values: np.ndarray) -> tuple[tuple | None, float | None] | None:
+        path = self.dir / f"{self.key(values)}.json"
+        if not path.exists():
+            return None
+        entry = json.loads(path.read_text())
+        best = entry["best"]
+        if best is not None:
+            name, params, aic, ks, p = best
+            best = (name, tuple(params), aic, ks, p)
+        return best, entry["anderson_darling"]
+
+    def put(self, values: np.ndarray, best: tuple | None, ad_stat: float | None) -> None:
+        if best is not None:
+            name, params, aic, ks, p = best
+            best = [name, [float(v) for v in params], float(aic), float(ks), float(p)]
+        path = self.dir / f"{self.key(values)}.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"best": best, "anderson_darling": ad_stat}))
+        tmp.replace(path)
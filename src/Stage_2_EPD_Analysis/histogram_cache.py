@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+histogram_cache.py – shared binned histograms for drift & divergence tests
+
+    cache = HistogramCache(df[num_cols])
+    base, curr = (0, split), (split, len(df))
+    counts = cache.counts([base, curr], bins=20)   # {(col, window, bins): counts}
+    psi(counts[("amount", base, 20)], counts[("amount", curr, 20)])
+
+Every column gets ONE set of equal-width edges per bin count, spanning its
+finite values over the whole frame, so all windows of a column are binned
+on the same edges. Bin indices are computed once per bin spec, column by
+column (no float copy of the frame is kept), and only for the row span the
+requested windows cover; they are stored as uint8 (bins ≤ 255) or int16,
+with `bins` marking a missing cell. Counts for any number of row windows
+([start, stop) row ranges) then come from a single np.bincount over
+(window, column, bin), and are cached per (column, window, bins). Windows
+may overlap, so rolling windows reuse the same bin indices.
+
+JSD, PSI and KL are derived from the counts (proportions + EPS), not from
+re-binned raw values.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from scipy.stats import entropy
+
+EPS = 1e-9
+
+
+def _proportions(counts: np.ndarray) -> np.ndarray:
+    return counts / max(counts.sum(), 1) + EPS
+
+
+def jsd(p_counts: np.ndarray, q_counts: np.ndarray) -> float:
+    """Jensen–Shannon divergence (nats) of two histograms on the same edges."""
+    p, q = _proportions(p_counts), _proportions(q_counts)
+    m = 0.5 * (p + q)
+    return float(0.5 * (entropy(p, m) + entropy(q, m)))
+
+
+def psi(expected_counts: np.ndarray, actual_counts: np.ndarray) -> float:
+    """Population stability index Σ (e − a) · ln(e / a) over bin proportions."""
+    e, a = _proportions(expected_counts), _proportions(actual_counts)
+    return float(np.sum((e - a) * np.log(e / a)))
+
+
+def kl(p_counts: np.ndarray, q_counts: np.ndarray) -> float:
+    """KL(p ‖ q) in nats of two histograms on the same edges."""
+    return float(entropy(_proportions(p_counts), _proportions(q_counts)))
+
+
+def _index_dtype(bins: int) -> type:
+    """Smallest integer type holding 0..bins (`bins` = missing)."""
+    if bins <= np.iinfo(np.uint8).max:
+        return np.uint8
+    if bins <= np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
+
+
+class HistogramCache:
+    def __init__(self, df: pd.DataFrame):
+        self.columns = list(df.columns)
+        self.n_rows = len(df)
+        self._df = df
+        self._bin_index: dict[int, tuple[int, int, np.ndarray]] = {}
+        self._edges: dict[int, np.ndarray] = {}
+        self._counts: dict[tuple, np.ndarray] = {}
+
+    def _values(self, c: int, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Column c, rows [start, stop), as float64 with non-finite values → NaN."""
+        x = self._df.iloc[start:stop, c].to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.where(np.isfinite(x), x, np.nan)
+
+    def edges(self, bins: int) -> np.ndarray:
+        """(columns × bins+1) shared edges; np.histogram's range rule per column."""
+        if bins not in self._edges:
+            lo = np.full(len(self.columns), np.nan)
+            hi = lo.copy()
+            for c in range(len(self.columns)):
+                x = self._values(c)
+                if not np.isnan(x).all():
+                    lo[c], hi[c] = np.nanmin(x), np.nanmax(x)
+            flat = lo == hi                             # as np.histogram: ±0.5
+            lo, hi = np.where(flat, lo - 0.5, lo), np.where(flat, hi + 0.5, hi)
+            self._edges[bins] = lo[:, None] + (hi - lo)[:, None] * np.linspace(0, 1, bins + 1)
+        return self._edges[bins]
+
+    def _bins(self, bins: int, start: int, stop: int) -> np.ndarray:
+        """
+        Bin index of every cell in rows [start, stop) × columns, `bins` where
+        missing. The cached span only grows to cover new requests.
+        """
+        cached = self._bin_index.get(bins)
+        if cached is not None and cached[0] <= start and stop <= cached[1]:
+            first, _, idx = cached
+            return idx[start - first:stop - first]
+        lo_row, hi_row = start, stop
+        if cached is not None:
+            lo_row, hi_row = min(start, cached[0]), max(stop, cached[1])
+        edges = self.edges(bins)
+        idx = np.empty((hi_row - lo_row, len(self.columns)), dtype=_index_dtype(bins))
+        for c in range(len(self.columns)):
+            x = self._values(c, lo_row, hi_row)
+            lo, width = edges[c, 0], (edges[c, -1] - edges[c, 0]) / bins
+            with np.errstate(invalid="ignore"):
+                b = np.clip(np.floor((x - lo) / width), 0, bins - 1)
+            b[np.isnan(x)] = bins
+            idx[:, c] = b
+        self._bin_index[bins] = (lo_row, hi_row, idx)
+        return idx[start - lo_row:stop - lo_row]
+
+    def counts(self, windows: list[tuple[int, int]], bins: int = 20) -> dict[tuple, np.ndarray]:
+        """{(column, window, bins): counts} for every column and window."""
+        todo = [w for w in dict.fromkeys(windows)
+                if any((name, w, bins) not in self._counts for name in self.columns)]
+        if todo:
+            spans = [(min(max(a, 0), self.n_rows), min(max(b, 0), self.n_rows))
+                     for a, b in todo]
+            first = min(a for a, _ in spans)
+            idx = self._bins(bins, first, max(max(b for _, b in spans), first))
+            k = len(self.columns)
+            col = np.arange(k, dtype=np.int64)
+            keys = []
+            for w, (start, stop) in enumerate(spans):
+                block = idx[start - first:max(stop, start) - first]
+                valid = block < bins
+                keys.append(((w * k + col) * bins + block)[valid])
+            flat = np.bincount(np.concatenate(keys), minlength=len(todo) * k * bins)
+            table = flat.reshape(len(todo), k, bins)
+            for w, window in enumerate(todo):
+                for c, name in enumerate(self.columns):
+                    self._counts[(name, window, bins)] = table[w, c]
+        return {(name, w, bins): self._counts[(name, w, bins)]
+                for w in windows for name in self.columns}
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+rank_correlation.py – rank-once Spearman and O(n log n) Kendall tau
+
+    engine = RankCorrelation(df[nums], n_jobs=-1, sample_rows=None)
+    engine.spearman()    # Pearson over average ranks, one matrix product
+    engine.kendall()     # tau-b, O(n log n) per pair, parallel over pairs
+
+Every column is ranked once (one sort; NaN → -1). For a pair with missing
+values, the ranks on the shared rows come from the column's ranks in linear
+time, without sorting again. Spearman for pairs of complete columns is one
+matrix product over the rank matrix; other pairs fall back to a per-pair
+Pearson over re-derived ranks. Kendall's tau-b reuses each column's sort
+order and counts discordant pairs with a radix split on the bits of the y
+ranks (log₂(levels) linear passes, y being the column with fewer levels).
+The tie corrections match scipy.stats.kendalltau. `sample_rows` caps very
+tall frames with a seeded uniform row sample.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+
+from src.Stage_1_Ingestion.collinearity import correlation_matrix
+from src.Stage_2_EPD_Analysis.associations import PARALLEL_MIN_CELLS
+
+
+def dense_ranks(values: np.ndarray) -> tuple[np.ndarray, int]:
+    """Dense 0-based ranks (NaN → -1) and the number of distinct values."""
+    ranks = np.full(len(values), -1, dtype=np.int64)
+    valid = ~np.isnan(values)
+    uniques, ranks[valid] = np.unique(values[valid], return_inverse=True)
+    return ranks, len(uniques)
+
+
+def _redense(ranks: np.ndarray, n_levels: int) -> tuple[np.ndarray, int]:
+    """Dense ranks of a subset of rows, without sorting (O(n + levels))."""
+    present = np.bincount(ranks, minlength=n_levels) > 0
+    relabel = np.cumsum(present) - 1
+    return relabel[ranks], int(present.sum())
+
+
+def average_ranks(ranks: np.ndarray, n_levels: int) -> np.ndarray:
+    """scipy.stats.rankdata ('average', 1-based) from dense ranks."""
+    counts = np.bincount(ranks, minlength=n_levels)
+    before = np.cumsum(counts) - counts
+    return (before + (counts + 1) / 2.0)[ranks]
+
+
+def _ties(counts: np.ndarray) -> int:
+    return int((counts * (counts - 1) // 2).sum())
+
+
+def discordant_pairs(y: np.ndarray) -> int:
+    """
+    Pairs i < j with y[i] > y[j], for non-negative integer y. MSD radix
+    split: at each bit, every 0 in a group of equal higher bits is
+    discordant with the 1s before it in that group; the groups are then
+    stably partitioned (0s first) to their computed destinations. One
+    linear pass per bit, so columns with few distinct values are cheap.
+    """
+    n = len(y)
+    if n < 2:
+        return 0
+    seq = y.astype(np.int64)
+    position = np.arange(n)
+    new = np.empty_like(seq)
+    discordant = 0
+    for b in range(int(seq.max()).bit_length() - 1, -1, -1):
+        key = seq >> b                                  # group · 2 + bit
+        bit = key & 1
+        ones_excl = np.cumsum(bit)
+        ones_excl -= bit
+        counts = np.bincount(key, minlength=2)
+        if len(counts) % 2:
+            counts = np.append(counts, 0)
+        zeros, ones = counts[0::2], counts[1::2]
+        ones_before = np.cumsum(ones) - ones            # 1s in earlier groups
+        # Σ_zeros (1s before it) − Σ_groups zeros · (1s in earlier groups);
+        # the k-th 1 overall has exactly k 1s before it
+        n_ones = int(ones.sum())
+        discordant += (int(ones_excl.sum()) - n_ones * (n_ones - 1) // 2
+                       - int(np.dot(zeros, ones_before)))
+        offset = np.empty(len(counts), dtype=np.int64)
+        offset[0::2] = ones_before
+        offset[1::2] = np.cumsum(zeros)
+        dest = np.where(bit, ones_excl, position - ones_excl)
+        dest += offset[key]
+        new[dest] = seq
+        seq, new = new, seq
+    return discordant
+
+
+def kendall_tau_b(rx: np.ndarray, lx: int, ry: np.ndarray, ly: int,
+                  order: np.ndarray | None = None) -> float:
+    """
+    Kendall's tau-b of two dense-ranked, complete columns (scipy's formula).
+    `order` is a cached stable argsort of rx; y should be the column with
+    fewer levels, since the discordance count is one pass per bit of y.
+    """
+    n = len(rx)
+    if n < 2:
+        return np.nan
+    tot = n * (n - 1) // 2
+    x_tie = _ties(np.bincount(rx, minlength=lx))
+    y_tie = _ties(np.bincount(ry, minlength=ly))
+    if x_tie == tot or y_tie == tot:
+        return np.nan
+    if order is None:
+        order = np.argsort(rx, kind="stable")
+    y = ry[order]
+    xy_tie = 0
+    if lx < n:                                          # y ascending within x-ties
+        joint = rx[order] * ly + y
+        within = np.argsort(joint, kind="stable")       # runs per x: nearly sorted
+        joint, y = joint[within], y[within]
+        runs = np.diff(np.flatnonzero(np.r_[True, joint[1:] != joint[:-1], True]))
+        xy_tie = _ties(runs)
+    dis = discordant_pairs(y)
+    con_minus_dis = tot - x_tie - y_tie + xy_tie - 2 * dis
+    tau = con_minus_dis / np.sqrt(tot - x_tie) / np.sqrt(tot - y_tie)
+    return float(min(1.0, max(-1.0, tau)))
+
+
+def _pair_ranks(a: tuple[np.ndarray, int], b: tuple[np.ndarray, int]):
+    """Both columns' dense ranks on their shared non-null rows."""
+    (ra, la), (rb, lb) = a, b
+    valid = (ra >= 0) & (rb >= 0)
+    if valid.all():
+        return a, b
+    return _redense(ra[valid], la), _redense(rb[valid], lb)
+
+
+def _pearson(a: np.ndarray, b: np.ndarray) -> float:
+    a, b = a - a.mean(), b - b.mean()
+    denom = np.sqrt((a * a).sum() * (b * b).sum())
+    return float(np.clip((a * b).sum() / denom, -1.0, 1.0)) if denom > 0 else np.nan
+
+
+def _spearman_pair(a: tuple[np.ndarray, int], b: tuple[np.ndarray, int]) -> float:
+    (ra, la), (rb, lb) = _pair_ranks(a, b)
+    if len(ra) < 2:
+        return np.nan
+    return _pearson(average_ranks(ra, la), average_ranks(rb, lb))
+
+
+def _kendall_pairs(ranks: list, orders: list, pairs: list[tuple[int, int]]) -> list[float]:
+    out = []
+    for i, j in pairs:
+        if orders[i] is not None and orders[j] is not None:
+            if ranks[i][1] < ranks[j][1]:               # fewer levels → y
+                i, j = j, i
+            out.append(kendall_tau_b(*ranks[i], *ranks[j], order=orders[i]))
+        else:
+            (rx, lx), (ry, ly) = _pair_ranks(ranks[i], ranks[j])
+            if lx < ly:
+                (rx, lx), (ry, ly) = (ry, ly), (rx, lx)
+            out.append(kendall_tau_b(rx, lx, ry, ly))
+    return out
+
+
+class RankCorrelation:
+    def __init__(self, df: pd.DataFrame, n_jobs: int = 1,
+                 sample_rows: int | None = None, seed: int = 0):
+        if sample_rows is not None and len(df) > sample_rows:
+            df = df.sample(n=sample_rows, random_state=seed)
+        self.columns = list(df.columns)
+        self.n_rows = len(df)
+        self.n_jobs = n_jobs
+        self.ranks = [dense_ranks(df[c].to_numpy(dtype=np.float64, na_value=np.nan))
+                      for c in self.columns]
+        self.complete = np.array([bool((r >= 0).all()) for r, _ in self.ranks])
+        self._orders: list[np.ndarray | None] | None = None
+
+    def orders(self) -> list[np.ndarray | None]:
+        """Stable argsort of each complete column's ranks (None if it has NaNs)."""
+        if self._orders is None:
+            self._orders = [np.argsort(r, kind="stable") if ok else None
+                            for (r, _), ok in zip(self.ranks, self.complete)]
+        return self._orders
+
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def spearman(self) -> pd.DataFrame:
+        """
+        Spearman's rho, pairwise-complete like scipy.stats.spearmanr on the
+        shared rows; NaN for constant columns, 1 on the diagonal.
+        """
+        k = len(self.columns)
+        rho = np.full((k, k), np.nan)
+        full = np.flatnonzero(self.complete)
+        if len(full):
+            avg = np.column_stack([average_ranks(*self.ranks[i]) for i in full])
+            rho[np.ix_(full, full)] = correlation_matrix(pd.DataFrame(avg)).to_numpy()
+        for i in range(k):
+            for j in range(i + 1, k):
+                if not (self.complete[i] and self.complete[j]):
+                    rho[i, j] = rho[j, i] = _spearman_pair(self.ranks[i], self.ranks[j])
+        np.fill_diagonal(rho, 1.0)
+        return self._frame(rho)
+
+    def kendall(self) -> pd.DataFrame:
+        """Kendall's tau-b for every pair (scipy.stats.kendalltau values)."""
+        k = len(self.columns)
+        pairs = [(i, j) for i in range(k) for j in range(i + 1, k)]
+        if self.n_jobs != 1 and len(pairs) * self.n_rows >= PARALLEL_MIN_CELLS:
+            n_blocks = min(len(pairs), 4 * effective_n_jobs(self.n_jobs))
+            blocks = [pairs[b::n_blocks] for b in range(n_blocks)]
+            parts = Parallel(n_jobs=self.n_jobs)(
+                delayed(_kendall_pairs)(self.ranks, self.orders(), block) for block in blocks)
+            taus = dict(zip((p for block in blocks for p in block),
+                            (t for part in parts for t in part)))
+        else:
+            taus = dict(zip(pairs, _kendall_pairs(self.ranks, self.orders(), pairs)))
+        tau = np.eye(k)
+        for (i, j), t in taus.items():
+            tau[i, j] = tau[j, i] = t
+        return self._frame(tau)
@@ -0,0 +1,12 @@
+import pytest
+
+import src.Stage_1_Ingestion.DataCollector as collector_module
+
+
+@pytest.fixture(autouse=True)
+def report_dir(tmp_path, monkeypatch):
+    """Profiling reports of every test go to its tmp dir, not reports/profiling."""
+    out = tmp_path / "profiling"
+    out.mkdir()
+    monkeypatch.setattr(collector_module, "REPORT_DIR", out)
+    return out
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from sklearn.metrics import mutual_info_score
+
+import src.Stage_2_EPD_Analysis.associations as associations
+from src.Stage_2_EPD_Analysis.associations import (AssociationEngine, factorize,
+                                                   pair_association)
+
+
+def old_cramers_v(a: pd.Series, b: pd.Series) -> float:
+    """EDAnalyzer._cramers_v on a crosstab, as before the engine."""
+    conf = pd.crosstab(a, b)
+    chi2 = stats.chi2_contingency(conf)[0]
+    r, k = conf.shape
+    return float(np.sqrt(chi2 / (conf.values.sum() * min(r - 1, k - 1))))
+
+
+def groupby_eta_squared(df: pd.DataFrame, cat: str, num: str) -> float:
+    """Textbook η² = SS_between / SS_total via groupby, on complete rows."""
+    arr = df[[cat, num]].dropna()
+    x = arr[num]
+    ss_total = ((x - x.mean()) ** 2).sum()
+    if len(arr) == 0 or ss_total == 0:
+        return 0.0
+    grps = arr.groupby(cat)[num]
+    ss_between = (grps.count() * (grps.mean() - x.mean()) ** 2).sum()
+    return float(ss_between / ss_total)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 2_000
+    color = rng.choice(["red", "green", "blue"], n)
+    size = np.where(rng.random(n) < 0.7, color, rng.choice(["red", "green", "blue"], n))
+    df = pd.DataFrame({
+        "color": color,
+        "size": pd.Series(size).map({"red": "S", "green": "M", "blue": "L"}),
+        "flag": rng.choice(["y", "n"], n),                       # 2 levels
+        "yes_no": np.where(rng.random(n) < 0.8, color == "red", rng.random(n) < 0.5)
+                    .astype(str),                                # 2 levels, tied to color
+        "zone": rng.choice(list("abcdefg"), n),
+        "rare": np.where(np.arange(n) < 5, [f"solo{i}" for i in range(n)], "common"),
+        "x": rng.normal(0, 1, n),
+        "constant": np.full(n, 3.0),
+    })
+    df["x"] += df["color"].map({"red": 0.0, "green": 0.5, "blue": 2.0})
+    df["y"] = rng.exponential(1, n) * np.where(df["flag"] == "y", 2, 1)
+    df.loc[rng.random(n) < 0.1, "color"] = None
+    df.loc[rng.random(n) < 0.15, "x"] = np.nan
+    df.loc[rng.random(n) < 0.05, "zone"] = None
+    return df
+
+
+CATS = ["color", "size", "flag", "yes_no", "zone", "rare"]
+NUMS = ["x", "y", "constant"]
+
+
+def test_cramers_v_matches_chi2_contingency(frame):
+    v = AssociationEngine(frame).cramers_v(CATS)
+    for i, a in enumerate(CATS):
+        for b in CATS[i + 1:]:
+            assert v.loc[a, b] == v.loc[b, a]
+            assert v.loc[a, b] == pytest.approx(old_cramers_v(frame[a], frame[b]),
+                                                rel=1e-12, abs=1e-15), (a, b)
+    assert (np.diag(v) == 1).all()
+
+
+def test_two_by_two_tables_are_yates_corrected(frame):
+    v = AssociationEngine(frame).cramers_v(["flag", "yes_no"]).loc["flag", "yes_no"]
+    conf = pd.crosstab(frame["flag"], frame["yes_no"])
+    uncorrected = np.sqrt(stats.chi2_contingency(conf, correction=False)[0] / len(frame))
+    assert v == pytest.approx(old_cramers_v(frame["flag"], frame["yes_no"]), rel=1e-12)
+    assert v < uncorrected
+
+
+def test_single_level_column_has_no_cramers_v(frame):
+    df = frame.assign(only=np.where(frame["color"].isna(), None, "k"))
+    v = AssociationEngine(df).cramers_v(["color", "only"])
+    assert np.isnan(v.loc["color", "only"])
+
+
+def test_correlation_ratio_matches_groupby(frame):
+    eta = AssociationEngine(frame).correlation_ratio(CATS, NUMS)
+    for cat in CATS:
+        for num in NUMS:
+            assert eta.loc[cat, num] == pytest.approx(
+                groupby_eta_squared(frame, cat, num), rel=1e-9, abs=1e-12), (cat, num)
+    assert (eta["constant"] == 0).all()
+    assert eta.loc["color", "x"] > 0.3 and eta.loc["zone", "x"] < 0.01
+
+
+def test_pearson_matches_dataframe_corr(frame):
+    pd.testing.assert_frame_equal(AssociationEngine(frame).pearson(["x", "y"]),
+                                  frame[["x", "y"]].corr(), rtol=1e-12)
+
+
+def dense_and_sparse(a, b, monkeypatch):
+    """pair_association on the dense table, then with every table counted sparsely."""
+    dense = pair_association(a, b)
+    with monkeypatch.context() as m:
+        m.setattr(associations, "DENSE_TABLE_MAX_CELLS", 0)
+        sparse = pair_association(a, b)
+    return dense, sparse
+
+
+@pytest.mark.parametrize("pair", [(a, b) for i, a in enumerate(CATS) for b in CATS[i + 1:]])
+def test_sparse_tables_match_dense(frame, pair, monkeypatch):
+    a, b = (factorize(frame[c]) for c in pair)
+    dense, sparse = dense_and_sparse(a, b, monkeypatch)
+    np.testing.assert_allclose(sparse, dense, rtol=1e-12, atol=1e-15)
+
+
+def test_sparse_two_by_two_is_yates_corrected_without_the_full_table():
+    # two id-like columns whose only complete rows form a 2×2 table: the
+    # la × lb table would be 10¹² cells
+    n = 1_000_000
+    ids = np.arange(n, dtype=np.int64)
+    other = np.full(n, -1, dtype=np.int64)
+    ids[:8] = [0, 1, 0, 1, 0, 1, 0, 1]
+    other[:8] = [0, 0, 1, 1, 0, 1, 1, 1]
+    v, *_ = pair_association((ids, n), (other, n))
+    assert v == pytest.approx(old_cramers_v(pd.Series(ids[:8]), pd.Series(other[:8])),
+                              rel=1e-12)
+
+
+def test_theils_u_matches_mutual_info_score(frame):
+    cats = ["size", "flag", "yes_no", "rare"]           # no NaN: same rows as before
+    u = AssociationEngine(frame).theils_u(cats)
+    for a in cats:
+        h = stats.entropy(np.bincount(pd.factorize(frame[a])[0]))
+        for b in cats:
+            expected = mutual_info_score(frame[a], frame[b]) / h if a != b else 1.0
+            assert u.loc[a, b] == pytest.approx(expected, rel=1e-12, abs=1e-15), (a, b)
@@ -0,0 +1,66 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from scipy.stats import ks_2samp
+
+from src.Stage_2_EPD_Analysis.bootstrap import (_resample_stats, bootstrap_ci,
+                                                bootstrap_mean_median)
+
+N_ITER = 2_000
+
+
+def reference_bootstrap(values: np.ndarray, n_iter: int, seed: int):
+    """The pre-engine implementation: n_iter × n drawn values."""
+    samples = np.random.default_rng(seed).choice(values, size=(n_iter, len(values)))
+    return samples.mean(axis=1), np.median(samples, axis=1)
+
+
+COLUMNS = {
+    "ties": np.random.default_rng(0).integers(0, 40, 600).astype(float),
+    "distinct": np.random.default_rng(1).lognormal(size=600),
+}
+
+
+@pytest.mark.parametrize("column", COLUMNS)
+@pytest.mark.parametrize("max_block_bytes", [2**20, 2_048], ids=["blocks", "segments"])
+def test_matches_the_resampling_bootstrap(column, max_block_bytes):
+    values = COLUMNS[column]
+    means, medians = bootstrap_mean_median(values, N_ITER, np.random.default_rng(7),
+                                           max_block_bytes=max_block_bytes)
+    ref_means, ref_medians = reference_bootstrap(values, N_ITER, seed=8)
+    assert ks_2samp(means, ref_means).pvalue > 1e-3
+    assert ks_2samp(medians, ref_medians).pvalue > 1e-3
+    assert np.isin(medians * 2, np.add.outer(values, values)).all()   # mid order stats
+
+
+def test_segmented_poisson_matches_blocked_poisson():
+    values = COLUMNS["distinct"]
+    blocked = bootstrap_mean_median(values, N_ITER, np.random.default_rng(1),
+                                    weights="poisson")
+    segmented = bootstrap_mean_median(values, N_ITER, np.random.default_rng(2),
+                                      weights="poisson", max_block_bytes=2_048)
+    for a, b in zip(blocked, segmented):
+        assert ks_2samp(a, b).pvalue > 1e-3
+
+
+def test_ci_brackets_the_sample_statistics():
+    values = COLUMNS["distinct"]
+    ci = bootstrap_ci(values, 1_000, rng=np.random.default_rng(3), max_block_bytes=2_048)
+    assert ci["mean_lower"] < values.mean() < ci["mean_upper"]
+    assert ci["median_lower"] < np.median(values) < ci["median_upper"]
+
+
+@pytest.mark.parametrize("weights", ["multinomial", "poisson"])
+def test_working_memory_stays_within_the_block_budget(weights):
+    values = np.random.default_rng(4).normal(size=1_000_000)     # 8 MB, all distinct
+    uniq, freq = np.unique(values, return_counts=True)
+    budget = 256 * 2**10
+    tracemalloc.start()
+    try:
+        means, _ = _resample_stats(uniq, freq, 3, np.random.default_rng(5), weights, budget)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert np.isfinite(means).all()
+    assert peak < 2 * budget            # one resample alone would take 16–32 MB
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+import src.Stage_1_Ingestion.collinearity as col
+from src.Stage_1_Ingestion.collinearity import (correlated_pairs, correlation_matrix,
+                                                vif_scores)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 600
+    a, b, c = rng.normal(size=(3, n))
+    df = pd.DataFrame({"a": a + 5, "b": b * 3 - 2, "c": c,
+                       "ab": 0.7 * a + 0.3 * b + rng.normal(scale=0.2, size=n) + 40,
+                       "flat": 4.0})
+    df.loc[rng.choice(n, 40, replace=False), "c"] = np.nan
+    df.loc[rng.choice(n, 25, replace=False), "ab"] = np.nan
+    return df
+
+
+def test_correlation_matrix_matches_pandas(frame):
+    ours = correlation_matrix(frame)
+    pd.testing.assert_frame_equal(ours, frame.corr(), atol=1e-12)
+
+
+def test_correlated_pairs_match_pandas_thresholding(frame):
+    ref = frame.corr().where(np.triu(np.ones((5, 5), dtype=bool), k=1)).stack()
+    for thresh in (0.0, 0.3, 0.9):
+        expected = {(i, j): r for (i, j), r in ref.items() if abs(r) > thresh}
+        got = {(i, j): r for i, j, r in correlated_pairs(frame, thresh, block_size=2)}
+        assert got.keys() == expected.keys()
+        assert np.allclose([got[k] for k in expected], list(expected.values()))
+
+
+def reference_vif(df: pd.DataFrame) -> np.ndarray:
+    """statsmodels VIF of each column, regression with intercept."""
+    x = sm.add_constant(df.dropna()).to_numpy()
+    return np.array([variance_inflation_factor(x, i) for i in range(1, x.shape[1])])
+
+
+@pytest.mark.parametrize("row_block", [col.ROW_BLOCK, 64])
+def test_vif_matches_statsmodels_with_intercept(frame, monkeypatch, row_block):
+    monkeypatch.setattr(col, "ROW_BLOCK", row_block)
+    cols = ["a", "b", "c", "ab"]
+    np.testing.assert_allclose(vif_scores(frame[cols]).to_numpy(),
+                               reference_vif(frame[cols]), rtol=1e-8)
+    assert vif_scores(frame)["ab"] > 5                  # collinear with a, b
+
+
+def test_vif_ignores_column_offsets(frame):
+    shifted = frame[["a", "b", "c"]] + [1e3, -50, 7]
+    pd.testing.assert_series_equal(vif_scores(shifted), vif_scores(frame[["a", "b", "c"]]),
+                                   rtol=1e-8)
+
+
+def test_constant_column_is_nan(frame):
+    vif = vif_scores(frame)
+    assert np.isnan(vif["flat"])
+    np.testing.assert_allclose(vif.drop("flat").to_numpy(),
+                               vif_scores(frame.drop(columns="flat")).to_numpy())
+
+
+def test_exact_dependence_takes_the_eigen_fallback(monkeypatch):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(size=(300, 3)), columns=["x", "y", "z"])
+    df["s"] = df["x"] + 2 * df["y"]
+    calls = []
+    eigh = np.linalg.eigh
+    monkeypatch.setattr(col.np.linalg, "eigh", lambda m: calls.append(1) or eigh(m))
+    vif = vif_scores(df)
+    assert calls                                        # Cholesky failed → eigh
+    assert np.isinf(vif[["x", "y", "s"]]).all()
+    np.testing.assert_allclose(vif["z"], reference_vif(df[["x", "y", "z"]])[2], rtol=1e-8)
+    assert (reference_vif(df)[[0, 1, 3]] > 1e10).all()   # statsmodels: ~inf too
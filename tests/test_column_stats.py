@@ -0,0 +1,77 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.Stage_1_Ingestion.column_stats import fused_column_stats
+
+DESCRIBE = {"count": "count", "mean": "mean", "std": "std", "min": "min",
+            "q1": "25%", "median": "50%", "q3": "75%", "max": "max"}
+
+
+def old_outliers(series: pd.Series) -> int:
+    """IQR outlier count as the old DataHealthCheck.detect_outliers computed it."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)      # all-NaN column
+        q1, q3 = np.nanpercentile(series.to_numpy(dtype=float, na_value=np.nan), [25, 75])
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    return int(((series < low) | (series > high)).sum())
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 1_001
+    heavy = rng.standard_t(2, n)
+    heavy[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({
+        "normal": rng.normal(10, 2, n),
+        "heavy_nan": heavy,
+        "ints": rng.integers(-5, 5, n),
+        "nullable": pd.array(np.where(rng.random(n) < 0.3, None, rng.integers(0, 50, n)),
+                             dtype="Int64"),
+        "all_nan": np.full(n, np.nan),
+        "single": np.full(n, 3.5),
+        "single_nan": np.where(rng.random(n) < 0.5, np.nan, 7.0),
+        "city": rng.choice(["a", "b", "c", None], n),
+        "cat": pd.Categorical(rng.choice(["x", "y"], n)),
+    })
+
+
+def test_matches_describe_nunique_and_old_outliers(frame):
+    stats = fused_column_stats(frame)
+    num = frame.select_dtypes(include=[np.number])
+    desc = num.describe().T
+    assert stats.index.tolist() == frame.columns.tolist()
+    assert stats["numeric"].tolist() == [c in num.columns for c in frame.columns]
+    for ours, theirs in DESCRIBE.items():
+        np.testing.assert_allclose(stats.loc[num.columns, ours].astype(float),
+                                   desc[theirs].astype(float), rtol=1e-12, equal_nan=True,
+                                   err_msg=ours)
+    np.testing.assert_allclose(stats.loc[num.columns, "skew"].astype(float),
+                               num.skew().astype(float), rtol=1e-9, equal_nan=True)
+    assert stats["distinct"].tolist() == frame.nunique().tolist()
+    assert stats["nulls"].tolist() == frame.isna().sum().tolist()
+    assert stats.loc[num.columns, "iqr_outliers"].tolist() == \
+        [old_outliers(num[c]) for c in num.columns]
+
+
+def test_degenerate_columns(frame):
+    stats = fused_column_stats(frame)
+    all_nan, single = stats.loc["all_nan"], stats.loc["single"]
+    assert all_nan["count"] == 0 and all_nan["distinct"] == 0 and all_nan["null_pct"] == 1
+    assert all_nan[["mean", "std", "min", "q1", "median", "q3", "max"]].isna().all()
+    assert all_nan["iqr_outliers"] == 0
+    assert single["distinct"] == 1 and single["std"] == 0 and single["skew"] == 0
+    assert single["q1"] == single["q3"] == 3.5 and single["iqr_outliers"] == 0
+    assert stats.loc["single_nan", "distinct"] == 1
+
+
+def test_single_row_and_empty_frames():
+    one = fused_column_stats(pd.DataFrame({"x": [2.0], "s": ["a"]}))
+    assert one.loc["x", "median"] == 2.0 and np.isnan(one.loc["x", "std"])
+    assert one.loc["s", "distinct"] == 1
+    empty = fused_column_stats(pd.DataFrame({"x": pd.Series([], dtype=float)}))
+    assert empty.loc["x", "count"] == 0 and np.isnan(empty.loc["x", "null_pct"])
@@ -0,0 +1,92 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.Stage_1_Ingestion.DataCollector as collector_module
+from src.Stage_1_Ingestion.DataCollector import _compact_column, _compact_dtypes
+
+
+@pytest.mark.parametrize("values, dtype", [
+    ([-128, 127], "int8"),
+    ([-129, 0], "int16"),
+    ([0, 32_767], "int16"),
+    ([0, 32_768], "int32"),
+    ([-2**31, 2**31 - 1], "int32"),
+    ([0, 2**31], "int64"),
+    ([-2**63, 2**63 - 1], "int64"),
+])
+def test_integers_take_the_smallest_type_holding_the_range(values, dtype):
+    series = pd.Series(values, dtype="int64")
+    out = _compact_column(series)
+    assert str(out.dtype) == dtype
+    assert out.astype("int64").tolist() == values
+
+
+def test_nullable_integers_keep_their_nulls():
+    series = pd.Series([1, None, -200, 30_000], dtype="Int64")
+    out = _compact_column(series)
+    assert str(out.dtype) == "Int16"
+    pd.testing.assert_series_equal(out.astype("Int64"), series)
+
+
+@pytest.mark.parametrize("values, dtype", [
+    ([0.5, np.nan, np.inf, -np.inf, 0.0], "float32"),   # all exact in float32
+    ([0.5, 0.1], "float64"),                            # 0.1 does not round-trip
+    ([0.5, 1e40], "float64"),                           # overflows float32
+    ([0.5, 1e-50], "float64"),                          # underflows float32
+])
+def test_floats_are_downcast_only_when_exact(values, dtype):
+    series = pd.Series(values)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        out = _compact_column(series)
+    assert str(out.dtype) == dtype
+    np.testing.assert_array_equal(out.to_numpy(dtype=float), series.to_numpy())
+
+
+def test_category_threshold():
+    distinct = [f"v{i}" for i in range(50)]
+    at_ratio = pd.Series(distinct * 2 + [None] * 10)            # 50 of 100 non-null
+    above = pd.Series(distinct * 2 + ["extra"])                 # 51 of 101
+    assert isinstance(_compact_column(at_ratio).dtype, pd.CategoricalDtype)
+    assert _compact_column(above).dtype == object
+    assert str(_compact_column(above, arrow_strings=True).dtype) == "string"
+    pd.testing.assert_series_equal(_compact_column(at_ratio).astype(object), at_ratio)
+
+
+def test_category_cap(monkeypatch):
+    monkeypatch.setattr(collector_module, "COMPACT_MAX_CATEGORIES", 10)
+    few = pd.Series([f"v{i % 10}" for i in range(100)])
+    many = pd.Series([f"v{i % 11}" for i in range(100)])
+    assert isinstance(_compact_column(few).dtype, pd.CategoricalDtype)
+    assert _compact_column(many).dtype == object
+
+
+def test_mixed_objects_and_numeric_false_are_left_alone():
+    mixed = pd.Series(["a", 1, "a", 2.5] * 10, dtype=object)
+    assert _compact_column(mixed) is mixed
+    ints, floats = pd.Series([1, 2, 3]), pd.Series([0.5, 1.5])
+    assert _compact_column(ints, numeric=False).dtype == "int64"
+    assert _compact_column(floats, numeric=False).dtype == "float64"
+
+
+def test_compacted_frame_round_trips():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    df = pd.DataFrame({
+        "small": rng.integers(-100, 100, n),
+        "wide": rng.integers(-2**40, 2**40, n),
+        "nullable": pd.array(np.where(rng.random(n) < 0.2, None, rng.integers(0, 1_000, n)),
+                             dtype="Int64"),
+        "half": rng.integers(0, 64, n) / 2.0,
+        "noisy": rng.random(n),
+        "city": rng.choice(["ab", "cd", None], n),
+        "flag": rng.random(n) < 0.5,
+    })
+    out, report = _compact_dtypes(df)
+    assert set(report) == {"small", "nullable", "half", "city"}
+    assert all(r["bytes_after"] < r["bytes_before"] for r in report.values())
+    for col in df.columns:
+        pd.testing.assert_series_equal(out[col].astype(df[col].dtype), df[col])
@@ -0,0 +1,93 @@
+import multiprocessing as mp
+import time
+
+import numpy as np
+import pytest
+
+from src.Stage_1_Ingestion.detector_pool import run_detectors
+
+SLOW_SECONDS = 3
+has_fork = "fork" in mp.get_all_start_methods()
+BACKENDS = [pytest.param("process", marks=pytest.mark.skipif(not has_fork, reason="no fork")),
+            "thread"]
+
+
+class FakeCheck:
+    """Stand-in for DataHealthCheck: detect_<name>() writes into self.results."""
+
+    def __init__(self, sampled: bool = False):
+        self.sampled = sampled
+        self.results = {}
+
+    def detect_fast(self):
+        self.results["fast"] = "sampled" if self.sampled else "full"
+
+    def detect_slow(self):
+        if not self.sampled:
+            time.sleep(SLOW_SECONDS)
+        self.results["slow"] = "sampled" if self.sampled else "full"
+
+    def detect_alloc(self):
+        block = np.ones(4 * 2**20)                    # 32 MiB
+        self.results["alloc"] = float(block.sum())
+
+    def detect_boom(self):
+        raise ValueError("bad column")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_overrun_is_rerun_on_the_sampled_checker(backend):
+    built = []
+
+    def sampled():
+        built.append(1)
+        return FakeCheck(sampled=True)
+
+    t0 = time.perf_counter()
+    results, timings = run_detectors(FakeCheck(), ["fast", "slow"], n_jobs=2, budget=0.3,
+                                     backend=backend, sampled=sampled)
+    assert time.perf_counter() - t0 < SLOW_SECONDS
+    assert results == {"fast": "full", "slow": "sampled"}
+    assert timings["fast"]["mode"] == "full" and timings["slow"]["mode"] == "sampled"
+    assert timings["slow"]["seconds"] >= 0.3            # includes the abandoned run
+    assert built == [1]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_without_a_fallback_an_overrun_runs_to_completion(backend, monkeypatch):
+    monkeypatch.setattr(FakeCheck, "detect_slow",
+                        lambda self: (time.sleep(0.3), self.results.update(slow="full")))
+    results, timings = run_detectors(FakeCheck(), ["slow"], budget=0.05, backend=backend)
+    assert results == {"slow": "full"} and timings["slow"]["mode"] == "full"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_agree_and_isolate_failures(backend):
+    check = FakeCheck()
+    results, timings = run_detectors(check, ["boom", "fast", "alloc"], n_jobs=1,
+                                     backend=backend)
+    assert results == {"fast": "full", "alloc": float(4 * 2**20)}
+    assert list(timings) == ["boom", "fast", "alloc"]
+    assert timings["boom"]["mode"] == "failed"
+    assert timings["boom"]["error"] == "ValueError: bad column"
+    assert check.results == {}                          # detectors get private dicts
+
+
+@pytest.mark.skipif(not has_fork, reason="no fork")
+def test_process_backend_reports_traced_peak_memory():
+    _, timings = run_detectors(FakeCheck(), ["alloc", "fast"], backend="process")
+    assert timings["alloc"]["peak_mb"] >= 32
+    assert timings["fast"]["peak_mb"] < 1
+    _, untracked = run_detectors(FakeCheck(), ["alloc"], backend="process",
+                                 track_memory=False)
+    assert untracked["alloc"]["peak_mb"] is None
+
+
+def test_thread_backend_reports_no_memory():
+    _, timings = run_detectors(FakeCheck(), ["alloc"], backend="thread")
+    assert timings["alloc"]["peak_mb"] is None
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown backend"):
+        run_detectors(FakeCheck(), ["fast"], backend="gpu")
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+import scipy.stats as stats
+
+from src.Stage_2_EPD_Analysis.dist_fit import (
+    CANDIDATES, SCREEN_ROWS, _admissible, _aic, fit_distribution)
+
+
+def exhaustive_best(values: np.ndarray) -> str:
+    """The pre-screening fitter: scipy MLE of every candidate on all values."""
+    aics = {}
+    for name in CANDIDATES:
+        if not _admissible(name, values):
+            continue
+        try:
+            params = getattr(stats, name).fit(values)
+        except Exception:
+            continue
+        aic = _aic(name, values, params)
+        if np.isfinite(aic):
+            aics[name] = aic
+    return min(aics, key=aics.get)
+
+
+@pytest.mark.parametrize("family, sample", [
+    ("norm", lambda rng, n: rng.normal(5.0, 2.0, n)),
+    ("expon", lambda rng, n: rng.exponential(3.0, n)),
+    ("lognorm", lambda rng, n: rng.lognormal(1.0, 0.6, n)),
+])
+def test_screen_then_refine_matches_exhaustive_family(family, sample):
+    values = sample(np.random.default_rng(7), 2 * SCREEN_ROWS)
+    best = fit_distribution(values)
+    assert best is not None
+    assert best[0] == exhaustive_best(values) == family
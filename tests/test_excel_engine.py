@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+import src.Stage_1_Ingestion.DataCollector as collector_module
+import src.Stage_1_Ingestion.excel_cache as excel_module
+from src.Stage_1_Ingestion.DataCollector import DataCollector
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "book.xlsx"
+    pd.DataFrame({"id": range(10), "amount": [1.5] * 10}).to_excel(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """Record the engine every pd.read_excel call was made with."""
+    seen, read_excel = [], pd.read_excel
+
+    def spy(*args, engine=None, **kw):
+        seen.append(engine)
+        return read_excel(*args, engine=engine, **kw)
+
+    monkeypatch.setattr(collector_module.pd, "read_excel", spy)
+    monkeypatch.setattr(excel_module.pd, "read_excel", spy)
+    return seen
+
+
+def test_read_file_uses_pandas_default_engine(workbook, engines):
+    df = DataCollector(validate=False).read_file(workbook)
+    assert len(df) == 10 and engines == [None]
+
+
+def test_excel_cache_converts_with_default_engine(workbook, engines, tmp_path):
+    collector = DataCollector(validate=False, excel_cache=str(tmp_path / "xl"))
+    collector.read_file(workbook)
+    collector.read_file(workbook)                       # served from Parquet
+    assert engines == [None]
+
+
+def test_engine_is_opt_in(workbook, engines):
+    pytest.importorskip("python_calamine")
+    DataCollector(validate=False).read_file(workbook, engine="calamine")
+    assert engines == ["calamine"]
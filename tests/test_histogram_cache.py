@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.Stage_2_EPD_Analysis.histogram_cache import HistogramCache
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 5_000
+    df = pd.DataFrame({
+        "normal": rng.normal(size=n),
+        "skewed": rng.exponential(size=n),
+        "ints": pd.array(rng.integers(0, 7, n), dtype="Int64"),
+        "constant": np.full(n, 3.0),
+        "empty": np.full(n, np.nan),
+    })
+    df.loc[::11, "normal"] = np.nan
+    df.loc[::13, "skewed"] = np.inf
+    df.loc[::17, "ints"] = pd.NA
+    return df
+
+
+@pytest.mark.parametrize("bins", [20, 255, 300])
+def test_counts_match_np_histogram_on_shared_edges(frame, bins):
+    cache = HistogramCache(frame)
+    windows = [(0, 500), (4_000, 5_000), (250, 1_250)]
+    counts = cache.counts(windows, bins=bins)
+    edges = cache.edges(bins)
+    for c, name in enumerate(frame.columns):
+        values = frame[name].to_numpy(dtype=float, na_value=np.nan)
+        for start, stop in windows:
+            x = values[start:stop]
+            x = x[np.isfinite(x)]
+            expected = np.zeros(bins, dtype=int) if np.isnan(edges[c]).all() \
+                else np.histogram(x, bins=edges[c])[0]
+            np.testing.assert_array_equal(counts[(name, (start, stop), bins)], expected)
+
+
+def test_bin_index_is_compact_and_limited_to_requested_rows(frame):
+    cache = HistogramCache(frame)
+    cache.counts([(1_000, 2_000)], bins=20)
+    first, stop, idx = cache._bin_index[20]
+    assert (first, stop) == (1_000, 2_000)
+    assert idx.dtype == np.uint8 and idx.shape == (1_000, frame.shape[1])
+    cache.counts([(0, 100)], bins=20)                   # span grows on demand
+    assert cache._bin_index[20][:2] == (0, 2_000)
+    cache.counts([(0, 10)], bins=1_000)
+    assert cache._bin_index[1_000][2].dtype == np.int16
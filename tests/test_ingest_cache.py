@@ -0,0 +1,74 @@
+import logging
+import os
+
+import pandas as pd
+import pytest
+
+from src.Stage_1_Ingestion.DataCollector import DataCollector
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"id": [1, 2, 2, 3], "city": ["a", "b", "b", "c"]}).to_csv(path, index=False)
+    return path
+
+
+def audit_lines(caplog) -> list[str]:
+    return [r.getMessage() for r in caplog.records
+            if "sha256=" in r.getMessage() or "duplicates=" in r.getMessage()]
+
+
+def test_cache_hit_logs_the_stored_audit(csv_file, tmp_path, caplog):
+    collector = DataCollector(validate=False, cache=str(tmp_path / "ingest"))
+    with caplog.at_level(logging.INFO, logger="collector"):
+        cold = collector.read_file(str(csv_file))
+        cold_lines, cold_audit = audit_lines(caplog), collector.audit_report
+        caplog.clear()
+        warm = collector.read_file(str(csv_file))
+    assert any("ingest cache hit" in r.getMessage() for r in caplog.records)
+    assert audit_lines(caplog) == cold_lines
+    assert collector.audit_report == cold_audit
+    assert cold_audit["duplicates"] == 1 and cold_audit["rows"] == 4
+    pd.testing.assert_frame_equal(warm, cold, check_dtype=False)
+
+
+def test_invalidate_matches_relative_and_absolute_paths(csv_file, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    collector = DataCollector(validate=False, cache=str(tmp_path / "ingest"))
+    collector.read_file("data.csv")
+    assert collector.invalidate_cache(str(csv_file)) == 1
+    collector.read_file(str(csv_file))
+    assert collector.invalidate_cache(os.path.join(".", "data.csv")) == 1
+    assert collector.invalidate_cache("data.csv") == 0
+
+
+def cache_hit(caplog) -> bool:
+    return any("ingest cache hit" in r.getMessage() for r in caplog.records)
+
+
+def test_validate_mode_is_part_of_the_key(csv_file, tmp_path, caplog):
+    cache = str(tmp_path / "ingest")
+    DataCollector(validate=False, cache=cache).read_file(str(csv_file))
+    with caplog.at_level(logging.INFO, logger="collector"):
+        DataCollector(validate=False, validate_mode="sample", cache=cache).read_file(str(csv_file))
+    assert not cache_hit(caplog)
+
+
+def test_schema_registry_is_part_of_the_key(csv_file, tmp_path, caplog):
+    cache, schemas = str(tmp_path / "ingest"), str(tmp_path / "schemas")
+    DataCollector(validate=False, cache=cache).read_file(str(csv_file))
+    collector = DataCollector(validate=False, cache=cache, schema_registry=schemas)
+    with caplog.at_level(logging.INFO, logger="collector"):
+        collector.read_file(str(csv_file))              # not the registry-less entry
+        assert not cache_hit(caplog)
+        collector.read_file(str(csv_file))              # same registry version
+        assert cache_hit(caplog)
+        caplog.clear()
+
+        registry = collector.schema_registry
+        report = {"city": {"semantic_type": "Categorical", "original_dtype": "object",
+                           "final_dtype": "category"}}
+        registry.put("flat:data.csv", report)           # recipes changed elsewhere
+        collector.read_file(str(csv_file))
+    assert not cache_hit(caplog)
@@ -0,0 +1,145 @@
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from src.Stage_1_Ingestion.DataCollector import DataCollector
+
+TP = ("tx-events", 0)
+
+
+class FakeConsumer:
+    """One-partition in-process broker with KafkaConsumer's poll/commit/seek API."""
+
+    def __init__(self, payloads: list[dict], start: int = 0, idle_polls: int = 0):
+        self.log = [SimpleNamespace(value=json.dumps(p).encode(), offset=i)
+                    for i, p in enumerate(payloads)]
+        self.position = start               # e.g. auto_offset_reset="latest"
+        self.idle_polls = idle_polls        # empty polls before anything arrives
+        self.committed_offset = None
+        self.commits: list[int] = []
+        self.closed = False
+
+    def poll(self, timeout_ms=0, max_records=500):
+        if self.idle_polls:
+            self.idle_polls -= 1
+            return {}
+        records = self.log[self.position:self.position + max_records]
+        self.position += len(records)
+        return {TP: records} if records else {}
+
+    def commit(self):
+        self.committed_offset = self.position
+        self.commits.append(self.position)
+
+    def assignment(self):
+        return {TP}
+
+    def committed(self, tp):
+        return self.committed_offset
+
+    def seek(self, tp, offset):
+        self.position = offset
+
+    def close(self):
+        self.closed = True
+
+
+def payloads(n: int) -> list[dict]:
+    return [{"id": i, "amount": i % 7, "kind": "ab"[i % 2]} for i in range(n)]
+
+
+def test_each_processed_batch_is_committed():
+    consumer = FakeConsumer(payloads(25))
+    collector = DataCollector(validate=False, pii_mask=False)
+    batches = list(collector.read_kafka_iter("tx-events", "fake:9092", batch=10,
+                                             consumer=consumer))
+    assert [len(b) for b in batches] == [10, 10, 5]
+    assert consumer.commits == [10, 20, 25]
+    assert pd.concat(batches)["id"].tolist() == list(range(25))
+    assert all(b.dtypes.equals(batches[0].dtypes) for b in batches)
+    assert collector.audit_report["rows"] == 25          # one aggregated audit
+
+
+def test_max_batches_stops_without_polling_ahead():
+    consumer = FakeConsumer(payloads(25))
+    collector = DataCollector(validate=False, pii_mask=False)
+    batches = list(collector.read_kafka_iter("tx-events", "fake:9092", batch=10,
+                                             max_batches=1, consumer=consumer))
+    assert len(batches) == 1
+    assert consumer.position == consumer.committed_offset == 10
+
+
+def test_failed_batch_rewinds_to_last_commit(monkeypatch):
+    consumer = FakeConsumer(payloads(25))
+    collector = DataCollector(validate=False, pii_mask=False)
+    transform, calls = collector._transform, []
+
+    def flaky(df, *args, **kw):
+        calls.append(len(df))
+        if len(calls) == 2:
+            raise RuntimeError("boom")
+        return transform(df, *args, **kw)
+
+    monkeypatch.setattr(collector, "_transform", flaky)
+    stream = collector.read_kafka_iter("tx-events", "fake:9092", batch=10, consumer=consumer)
+    assert next(stream)["id"].tolist() == list(range(10))
+    with pytest.raises(RuntimeError, match="boom"):
+        next(stream)
+    assert consumer.commits == [10]
+    assert consumer.position == 10                       # batch 2 is re-delivered
+
+    again = list(collector.read_kafka_iter("tx-events", "fake:9092", batch=10,
+                                           consumer=consumer))
+    assert pd.concat(again)["id"].tolist() == list(range(10, 25))
+    assert consumer.commits == [10, 20, 25]
+
+
+def test_read_kafka_on_an_idle_topic_returns_an_empty_frame():
+    consumer = FakeConsumer([])
+    collector = DataCollector(validate=False, pii_mask=False)
+    df = collector.read_kafka("tx-events", "fake:9092", consumer=consumer)
+    assert df.empty and consumer.commits == []
+
+
+def test_read_kafka_keeps_polling_until_timeout():
+    consumer = FakeConsumer(payloads(4), idle_polls=3)
+    collector = DataCollector(validate=False, pii_mask=False)
+    df = collector.read_kafka("tx-events", "fake:9092", timeout=5, consumer=consumer)
+    assert df["id"].tolist() == [0, 1, 2, 3] and consumer.commits == [4]
+
+
+def test_rollback_before_first_commit_honours_latest_reset(monkeypatch):
+    consumer = FakeConsumer(payloads(15), start=5)     # joined after 5 messages
+    collector = DataCollector(validate=False, pii_mask=False)
+    def failing(df, source):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(collector, "_postprocess", failing)
+    with pytest.raises(RuntimeError, match="boom"):
+        collector.read_kafka("tx-events", "fake:9092", batch=4, consumer=consumer,
+                             auto_offset_reset="latest")
+    assert consumer.commits == []
+    assert consumer.position == 5                        # not replayed from 0
+    monkeypatch.undo()
+    df = collector.read_kafka("tx-events", "fake:9092", batch=4, consumer=consumer,
+                              auto_offset_reset="latest")
+    assert df["id"].tolist() == [5, 6, 7, 8]
+
+
+def test_idle_topic_yields_nothing():
+    collector = DataCollector(validate=False, pii_mask=False)
+    assert list(collector.read_kafka_iter("tx-events", "fake:9092",
+                                          consumer=FakeConsumer([]))) == []
+
+
+def test_new_reader_options_rebuild_the_reader():
+    first, second = FakeConsumer(payloads(5)), FakeConsumer(payloads(5))
+    collector = DataCollector(validate=False, pii_mask=False)
+    reader = collector.kafka_reader("tx-events", "fake:9092", consumer=first)
+    assert collector.kafka_reader("tx-events", "fake:9092", consumer=first) is reader
+    rebuilt = collector.kafka_reader("tx-events", "fake:9092", consumer=second,
+                                     max_records=2)
+    assert rebuilt is not reader and first.closed
+    assert rebuilt.consumer is second and rebuilt.max_records == 2
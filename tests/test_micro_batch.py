@@ -0,0 +1,143 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+import src.Stage_1_Ingestion.DataCollector as collector_module
+from src.Stage_1_Ingestion.DataCollector import DataCollector
+from src.Stage_1_Ingestion.micro_batch import MicroBatcher
+
+
+def test_flushes_at_max_records_and_on_close():
+    batcher = MicroBatcher(max_records=4, max_ms=60_000)
+    for i in range(10):
+        batcher.put(i)
+    batcher.close()
+    assert list(batcher.batches()) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_flushes_a_partial_batch_after_max_ms():
+    batcher = MicroBatcher(max_records=100, max_ms=50)
+    batcher.put("a")
+    t0 = time.monotonic()
+    assert next(batcher.batches()) == ["a"]
+    assert 0.04 <= time.monotonic() - t0 < 5
+
+
+def test_idle_timeout_ends_an_open_stream():
+    batcher = MicroBatcher(max_records=2, max_ms=10)
+    assert list(batcher.batches(idle_timeout=0.05)) == []
+
+
+def test_block_overflow_stalls_the_producer_without_loss():
+    batcher = MicroBatcher(max_records=2, max_ms=60_000, capacity=4, overflow="block")
+    def produce():
+        for i in range(10):
+            batcher.put(i)
+        batcher.close()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    time.sleep(0.1)                       # producer fills the buffer and waits
+    assert producer.is_alive() and len(batcher._buf) == 4
+    out = [r for batch in batcher.batches() for r in batch]
+    producer.join(5)
+    assert out == list(range(10))
+    assert batcher.metrics["dropped"] == 0 and batcher.metrics["blocked_seconds"] > 0
+
+
+def test_drop_oldest_keeps_the_newest_records():
+    batcher = MicroBatcher(max_records=2, max_ms=60_000, capacity=4,
+                           overflow="drop_oldest")
+    for i in range(10):
+        assert batcher.put(i)
+    batcher.close()
+    assert [r for batch in batcher.batches() for r in batch] == [6, 7, 8, 9]
+    assert batcher.metrics["dropped"] == 6
+
+
+def test_put_after_close_is_refused():
+    batcher = MicroBatcher()
+    batcher.close()
+    assert not batcher.put(1)
+
+
+def test_feeder_exception_reaches_the_consumer_after_pending_records():
+    def records():
+        yield from range(3)
+        raise ConnectionError("cursor died")
+
+    batcher = MicroBatcher.from_iterable(records(), max_records=2, max_ms=60_000)
+    got = []
+    with pytest.raises(ConnectionError, match="cursor died"):
+        for batch in batcher.batches():
+            got.extend(batch)
+    assert got == [0, 1, 2]
+
+
+def test_stop_joins_the_feeder():
+    pulled = itertools.count()
+    endless = (next(pulled) for _ in itertools.repeat(None))
+    batcher = MicroBatcher.from_iterable(endless, max_records=5, max_ms=60_000,
+                                         capacity=10)
+    assert len(next(batcher.batches())) == 5
+    assert batcher.stop(timeout=5)
+    assert not batcher._feeder.is_alive()
+    n = next(pulled)
+    time.sleep(0.05)
+    assert next(pulled) == n + 1          # nothing pulls from the iterable any more
+
+
+# ─── Mongo: the cursor is closed only after the feeder let go of it ──────────
+class SlowCursor:
+    """Cursor stand-in: each document takes a moment; records use after close()."""
+
+    def __init__(self, n: int):
+        self.docs = iter([{"_id": i, "v": i} for i in range(n)])
+        self.closed = False
+        self.used_after_close = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed:
+            self.used_after_close = True
+            raise StopIteration
+        time.sleep(0.005)
+        if self.closed:
+            self.used_after_close = True
+        return next(self.docs)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeMongoClient:
+    cursor: SlowCursor
+
+    def __init__(self, uri):
+        pass
+
+    def __getitem__(self, name):
+        return self
+
+    def find(self, query, projection, batch_size):
+        return self.cursor
+
+    def close(self):
+        pass
+
+
+def test_mongo_early_exit_closes_the_cursor_after_the_feeder(monkeypatch):
+    cursor = SlowCursor(1_000)
+    FakeMongoClient.cursor = cursor
+    monkeypatch.setattr(collector_module, "MongoClient", FakeMongoClient, raising=False)
+    collector = DataCollector(validate=False, pii_mask=False)
+    frames = collector._mongo_batches("mongodb://x", "db", "c", None, None, 5, 60_000)
+    frame = next(frames)
+    assert "_id" not in frame and len(frame) == 5
+    frames.close()                        # consumer stops early
+    time.sleep(0.05)
+    assert cursor.closed and not cursor.used_after_close
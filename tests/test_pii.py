@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+import src.Stage_1_Ingestion.DataCollector as collector_module
+from src.Stage_1_Ingestion.DataCollector import DataCollector, _mask_pii
+
+
+@pytest.fixture
+def contacts(tmp_path):
+    n = 1_000
+    df = pd.DataFrame({
+        "id": range(n),
+        "note": [f"mail user{i}@example.com" if i % 4 == 0 else "no contact" for i in range(n)],
+        "phone": [f"call 98765{i:05d}" if i % 10 == 0 else "-" for i in range(n)],
+    })
+    path = tmp_path / "contacts.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_mask_pii_counts_and_redacts():
+    df = pd.DataFrame({"a": ["x@y.com hi", "plain", None], "b": [1, 2, 3]})
+    masked, hits = _mask_pii(df)
+    assert hits == {"a": 1}
+    assert masked["a"].tolist()[:2] == ["[email] hi", "plain"]
+
+
+def test_streaming_accumulates_pii_hits_over_chunks(contacts):
+    batch = DataCollector(validate=False)
+    batch.read_file(contacts)
+    stream = DataCollector(validate=False)
+    chunks = list(stream.read_file_iter(contacts, chunk_rows=128))
+    assert len(chunks) == 8
+    assert stream.pii_hits == batch.pii_hits == {"note": 250, "phone": 100}
+    list(stream.read_file_iter(contacts, chunk_rows=300))      # reset per stream
+    assert stream.pii_hits == {"note": 250, "phone": 100}
+
+
+def test_masking_is_serial_by_default(contacts, monkeypatch):
+    seen = []
+    mask = collector_module._mask_pii
+    monkeypatch.setattr(collector_module, "_mask_pii",
+                        lambda df, n_jobs=1: seen.append(n_jobs) or mask(df, n_jobs))
+    DataCollector(validate=False).read_file(contacts)
+    DataCollector(validate=False, pii_n_jobs=4).read_file(contacts)
+    assert seen == [1, 4]
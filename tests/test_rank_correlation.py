@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import src.Stage_2_EPD_Analysis.rank_correlation as rc
+from src.Stage_2_EPD_Analysis.rank_correlation import RankCorrelation, discordant_pairs
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    n = 600
+    base = rng.normal(size=n)
+    df = pd.DataFrame({
+        "x": base,
+        "noisy": base + rng.normal(scale=0.7, size=n),
+        "ties": np.round(base * 2),                     # few levels, many ties
+        "levels": rng.integers(0, 4, n).astype(float),
+        "nan_a": np.where(rng.random(n) < 0.2, np.nan, -base + rng.normal(size=n)),
+        "nan_b": np.where(rng.random(n) < 0.3, np.nan, np.round(base)),
+        "constant": np.full(n, 2.0),
+    })
+    return df
+
+
+def scipy_matrix(df: pd.DataFrame, fn) -> np.ndarray:
+    """Pairwise-complete scipy statistic; NaN when a side is constant."""
+    cols = df.columns
+    out = np.eye(len(cols))
+    for i, a in enumerate(cols):
+        for j in range(i + 1, len(cols)):
+            pair = df[[a, cols[j]]].dropna()
+            x, y = pair.iloc[:, 0].to_numpy(), pair.iloc[:, 1].to_numpy()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                stat = np.nan if np.ptp(x) == 0 or np.ptp(y) == 0 else fn(x, y)[0]
+            out[i, j] = out[j, i] = stat
+    return out
+
+
+def test_spearman_matches_scipy(frame):
+    got = RankCorrelation(frame).spearman().to_numpy()
+    want = scipy_matrix(frame, stats.spearmanr)
+    np.fill_diagonal(want, 1.0)
+    np.testing.assert_allclose(got, want, rtol=0, atol=1e-12, equal_nan=True)
+
+
+def test_kendall_matches_scipy(frame):
+    got = RankCorrelation(frame).kendall().to_numpy()
+    np.testing.assert_allclose(got, scipy_matrix(frame, stats.kendalltau),
+                               rtol=0, atol=1e-12, equal_nan=True)
+
+
+def test_constant_column_is_nan_off_diagonal(frame):
+    rho = RankCorrelation(frame).spearman()
+    tau = RankCorrelation(frame).kendall()
+    others = [c for c in frame.columns if c != "constant"]
+    assert rho.loc["constant", others].isna().all()
+    assert tau.loc["constant", others].isna().all()
+
+
+def test_sample_rows_matches_scipy_on_the_same_sample(frame):
+    engine = RankCorrelation(frame, sample_rows=200, seed=3)
+    assert engine.n_rows == 200
+    sample = frame.sample(n=200, random_state=3)
+    np.testing.assert_allclose(engine.kendall().to_numpy(),
+                               scipy_matrix(sample, stats.kendalltau),
+                               rtol=0, atol=1e-12, equal_nan=True)
+
+
+def test_parallel_kendall_equals_serial(frame, monkeypatch):
+    serial = RankCorrelation(frame).kendall()
+    monkeypatch.setattr(rc, "PARALLEL_MIN_CELLS", 1)
+    parallel = RankCorrelation(frame, n_jobs=2).kendall()
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_discordant_pairs_brute_force():
+    rng = np.random.default_rng(5)
+    for levels in (1, 2, 3, 17, 1_000):
+        y = rng.integers(0, levels, 300)
+        brute = int(sum((y[i] > y[i + 1:]).sum() for i in range(len(y))))
+        assert discordant_pairs(y) == brute
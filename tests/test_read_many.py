@@ -0,0 +1,58 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import src.Stage_1_Ingestion.DataCollector as collector_module
+from src.Stage_1_Ingestion.DataCollector import DataCollector, RowHashAudit
+
+
+def write(tmp_path, name, df):
+    path = tmp_path / name
+    df.to_parquet(path, index=False)
+    return str(path)
+
+
+def test_conflicting_types_are_cast_to_string(tmp_path, caplog):
+    ints = write(tmp_path, "a.parquet", pd.DataFrame({"code": [1, 2, 3], "x": [1, 2, 3]}))
+    strs = write(tmp_path, "b.parquet", pd.DataFrame({"code": ["A7", "B8"], "x": [0.5, 1.5]}))
+    collector = DataCollector(validate=False, pii_mask=False)
+    with caplog.at_level(logging.WARNING, logger="collector"):
+        df = collector.read_many([ints, strs], n_jobs=1)
+    assert len(df) == 5
+    assert df["code"].astype(str).tolist() == ["1", "2", "3", "A7", "B8"]
+    assert df["x"].tolist() == [1.0, 2.0, 3.0, 0.5, 1.5]     # numeric: widened, not cast
+    cast = [r.message for r in caplog.records if "cast to string" in r.message]
+    assert len(cast) == 1 and "code (int64 / string)" in cast[0]
+    assert " x " not in cast[0]
+
+
+def test_unify_schemas_leaves_missing_and_numeric_columns():
+    tables = [pa.table({"a": [1, 2], "b": ["x", "y"]}),
+              pa.table({"a": [1.5], "c": [True]}),
+              pa.table({"b": pa.array([None, None], pa.null()), "c": [1, 0]})]
+    unified = collector_module._unify_schemas(tables, "test")
+    assert unified[0].schema.field("a").type == pa.int64()
+    assert unified[1].schema.field("c").type == pa.string()
+    assert unified[2].schema.field("c").type == pa.string()
+    combined = pa.concat_tables(unified, promote_options="permissive")
+    assert combined.column("c").to_pylist() == [None, None, "true", "1", "0"]
+
+
+def test_parquet_audit_is_sliced_but_matches_whole_frame(tmp_path, monkeypatch):
+    monkeypatch.setattr(collector_module, "AUDIT_SLICE_ROWS", 100)
+    n = 450
+    df = pd.DataFrame({"id": np.arange(n),
+                       "score": pa.array([None if i == 420 else i for i in range(n)],
+                                         pa.int64()).to_pandas(),
+                       "ok": pa.array([None if i == 430 else i % 2 == 0 for i in range(n)],
+                                      pa.bool_()).to_pandas(),
+                       "city": pd.Categorical(np.where(np.arange(n) % 3, "x", "y"))})
+    path = write(tmp_path, "part.parquet", df)
+    table, info = collector_module._read_one_file(path)
+    whole = RowHashAudit.from_frame(pq.read_table(path).to_pandas())
+    assert info["rows"] == n
+    assert info["sha256"] == whole.checksum
+    assert info["fingerprint"] == whole.fingerprint
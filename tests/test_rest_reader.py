@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pytest
+
+from src.Stage_1_Ingestion.DataCollector import DataCollector
+from src.Stage_1_Ingestion.rest_reader import RestPaginator
+
+N_RECORDS = 400
+PAGE = 20
+DELAY = 0.05          # seconds per request
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """
+    offset/limit, page/limit and cursor pagination over ids 0..N_RECORDS-1;
+    every request sleeps DELAY. Offsets in `server.flaky` answer 503 once.
+    """
+
+    def do_GET(self):
+        q = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        limit = int(q.get("limit", PAGE))
+        if "page" in q:
+            start = (int(q["page"]) - 1) * limit
+        else:
+            start = int(q.get("offset") or q.get("cursor") or 0)
+        time.sleep(DELAY)
+        if start in self.server.flaky:
+            self.server.flaky.discard(start)
+            self.send_response(503)
+            self.end_headers()
+            return
+        ids = list(range(start, min(start + limit, N_RECORDS)))
+        stop = start + len(ids)
+        body = json.dumps({"data": [{"id": i, "name": f"u{i}"} for i in ids],
+                           "meta": {"total": N_RECORDS,
+                                    "next": stop if stop < N_RECORDS else None}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAPI)
+    server.daemon_threads = True
+    server.flaky = set()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/items"
+
+
+def ids(frames: list[pd.DataFrame]) -> list[int]:
+    return pd.concat(frames, ignore_index=True)["id"].tolist()
+
+
+@pytest.mark.parametrize("paging", [
+    {"strategy": "offset", "total_path": "meta.total"},
+    {"strategy": "offset"},                               # speculative waves
+    {"strategy": "page", "total_path": "meta.total"},
+    {"strategy": "cursor", "cursor_path": "meta.next"},
+])
+def test_pages_arrive_in_order_without_duplicates(api, paging):
+    pager = RestPaginator(url(api), records_path="data", page_size=PAGE,
+                          concurrency=8, **paging)
+    assert ids(pager.run()) == list(range(N_RECORDS))
+    assert pager.stats["records"] == N_RECORDS
+
+
+def test_concurrency_cuts_wall_time(api):
+    def wall(concurrency: int) -> float:
+        pager = RestPaginator(url(api), records_path="data", page_size=PAGE,
+                              total_path="meta.total", concurrency=concurrency)
+        t0 = time.perf_counter()
+        assert ids(pager.run()) == list(range(N_RECORDS))
+        return time.perf_counter() - t0
+
+    serial = wall(1)
+    assert serial >= (N_RECORDS // PAGE) * DELAY
+    assert wall(8) < serial / 2
+
+
+def test_failed_page_is_retried_in_place(api):
+    api.flaky = {3 * PAGE, 7 * PAGE}
+    pager = RestPaginator(url(api), records_path="data", page_size=PAGE,
+                          total_path="meta.total", concurrency=8, backoff=0.01)
+    assert ids(pager.run()) == list(range(N_RECORDS))
+    assert pager.stats["retries"] == 2
+
+
+def test_read_rest_paginated_end_to_end(api):
+    collector = DataCollector(validate=False, pii_mask=False)
+    df = collector.read_rest_paginated(url(api), records_path="data", page_size=PAGE,
+                                       total_path="meta.total", concurrency=8)
+    assert len(df) == N_RECORDS
+    assert df["id"].tolist() == list(range(N_RECORDS))
@@ -0,0 +1,58 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.Stage_1_Ingestion.DataCollector import DataCollector, _conforms, _profile_columns
+
+
+def recipe_for(series: pd.Series) -> dict:
+    _, report = _profile_columns(series.to_frame("c"))
+    return report["c"]
+
+
+@pytest.mark.parametrize("before, after, expected", [
+    (["x"] * 500, ["x"] * 500, "Constant / Redundant"),
+    ([f"id{i}" for i in range(500)], [f"id{i}" for i in range(500, 1000)], "ID-like Field"),
+    (list("abcd") * 1_000, list("dcba") * 1_000, "Categorical"),
+])
+def test_cardinality_recipes_conform_when_unchanged(before, after, expected):
+    recipe = recipe_for(pd.Series(before, dtype=object))
+    assert recipe["semantic_type"] == expected
+    assert _conforms(pd.Series(after, dtype=object), recipe)
+
+
+@pytest.mark.parametrize("before, after", [
+    (["x"] * 500, ["x"] * 499 + ["y"]),                              # constant → 2 values
+    ([f"id{i}" for i in range(500)], [f"id{i % 250}" for i in range(500)]),  # duplicates
+    ([f"id{i}" for i in range(500)], [f"id{i}" for i in range(499)] + [None]),
+    (list("abcd") * 1_000, [f"v{i}" for i in range(4_000)]),         # categorical → unique
+])
+def test_cardinality_drift_is_detected(before, after):
+    recipe = recipe_for(pd.Series(before, dtype=object))
+    assert not _conforms(pd.Series(after, dtype=object), recipe)
+
+
+def test_large_categorical_drift_is_detected_on_the_sample():
+    rng = np.random.default_rng(0)
+    recipe = recipe_for(pd.Series(rng.choice(list("abc"), 50_000), dtype=object))
+    assert recipe["semantic_type"] == "Categorical"
+    drifted = pd.Series(rng.integers(0, 10**9, 50_000).astype(str), dtype=object)
+    assert not _conforms(drifted, recipe)
+
+
+def test_sql_sources_get_their_own_registry_entries(tmp_path):
+    db = tmp_path / "shop.sqlite"
+    with sqlite3.connect(db) as conn:
+        pd.DataFrame({"id": range(50), "city": ["x", "y"] * 25}).to_sql("orders", conn)
+        pd.DataFrame({"sku": [f"s{i}" for i in range(50)]}).to_sql("items", conn)
+    collector = DataCollector(validate=False, schema_registry=str(tmp_path / "schemas"))
+    dsn = f"sqlite:///{db}"
+    collector.read_sql(dsn, "select id, city from orders")
+    collector.read_sql(dsn, "select sku from items")
+    entries = sorted(p.name for p in (tmp_path / "schemas").iterdir())
+    assert len(entries) == 2 and all(name.startswith("sql_") for name in entries)
+    collector.read_sql(dsn, "select sku from items")          # same query → same entry
+    assert len(list((tmp_path / "schemas").iterdir())) == 2
+    assert all(r["from_registry"] for r in collector.profile_report.values())
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.Stage_1_Ingestion.DataCollector import (_infer_semantic_percell,
+                                                 _infer_semantic_vectorized,
+                                                 _profile_columns)
+
+N = 200
+rng = np.random.default_rng(0)
+
+COLUMNS = {
+    "mixed": pd.Series(["a", 1, 2.5, None, "b"] * 40, dtype=object),
+    "mixed_bool": pd.Series([True, "no", 1, None] * 50, dtype=object),
+    "float_nan": pd.Series(np.where(rng.random(N) < 0.3, np.nan, rng.integers(0, 5, N))),
+    "all_nan": pd.Series([np.nan] * N),
+    "bool": pd.Series([True, False] * (N // 2)),
+    "bool_like": pd.Series(["yes", "no", "True", "0", None] * 40),
+    "bool_like_nan": pd.Series([None if i % 5 == 0 else ["true", "false"][i % 2]
+                                for i in range(N)]),
+    "dates": pd.Series([f"2021-01-{i % 28 + 1:02d}" for i in range(N)]),
+    "dates_unique": pd.Series(pd.date_range("2020", periods=N).astype(str)),
+    "dates_nan": pd.Series([None if i % 7 == 0 else f"2021-01-{i % 28 + 1:02d}"
+                            for i in range(N)]),
+    "numeric_str": pd.Series([str(i % 30) for i in range(N)]),
+    "numeric_90pct": pd.Series(["x" if i % 10 == 0 else str(i % 40) for i in range(N)]),
+    "time": pd.Series([f"10:3{i % 10}" for i in range(N)]),
+    "duration": pd.Series([f"{i % 20} days" for i in range(N)]),
+    "currency": pd.Series([f"${i % 60}.00" for i in range(N)]),
+    "email": pd.Series([f"u{i % 60}@x.com" for i in range(N)]),
+    "url": pd.Series([f"https://a/{i % 60}" for i in range(N)]),
+    "json_str": pd.Series(['{"a": %d}' % (i % 120) for i in range(N)]),
+    "text": pd.Series(["word " * 12 + str(i % 150) for i in range(N)]),
+    "high_card": pd.Series([f"v{i % 150}" for i in range(N)]),
+    "id": pd.Series([f"r{i}" for i in range(N)]),
+    "lists": pd.Series([[1, 2], [3], None, [1, 2]] * 50, dtype=object),
+    "lists_unique": pd.Series([[i] for i in range(N)], dtype=object),
+    "lists_high_card": pd.Series([[i % 150] for i in range(N)], dtype=object),
+    "dicts": pd.Series([{"a": 1}, {"b": 2}, None, {"a": 1}] * 50, dtype=object),
+    "dicts_nested": pd.Series([{"k": [i % 3, {"z": 1}]} for i in range(N)], dtype=object),
+    "sets": pd.Series([{i % 3} for i in range(N)], dtype=object),
+    "nested_mixed": pd.Series([[1], {"a": 1}, "x", 3] * 50, dtype=object),
+}
+
+
+@pytest.mark.parametrize("name", COLUMNS)
+def test_vectorized_matches_percell(name):
+    series = COLUMNS[name]
+    assert _infer_semantic_vectorized(series) == _infer_semantic_percell(series)
+
+
+def test_nested_columns_profile_with_both_engines():
+    df = pd.DataFrame({k: COLUMNS[k] for k in ("lists", "dicts", "nested_mixed")})
+    reports = [_profile_columns(df, engine)[1] for engine in ("vectorized", "percell")]
+    assert reports[0] == reports[1]
+    assert reports[0]["dicts"]["semantic_type"] == "JSON / Dict-like"
+    assert reports[0]["lists"] == {"original_dtype": "object", "semantic_type": "Categorical",
+                                   "converted": False, "final_dtype": "object"}
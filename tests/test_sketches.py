@@ -0,0 +1,37 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.Stage_1_Ingestion.benchmarks import benchmark_sketch_accuracy
+from src.Stage_1_Ingestion.column_stats import fused_column_stats
+from src.Stage_1_Ingestion.sketches import HealthSketch
+
+
+def test_merged_pickled_sketches_stay_within_documented_bounds():
+    # 60k rows in 12 chunks over 3 sketches: enough to force KLL compactions
+    # and HLL registers (columns with > 4 096 distinct values)
+    result = benchmark_sketch_accuracy(n_rows=60_000, n_cols=6, n_chunks=12, n_workers=3)
+    errors, bounds = result["errors"], result["bounds"]
+    for stat, bound in bounds.items():
+        assert errors[stat] <= bound, f"{stat}: {errors[stat]} > {bound}"
+    assert errors["nulls_exact"] and errors["min_max_exact"]
+    assert result["within_bounds"]
+
+
+def test_small_input_is_exact_after_pickled_merge():
+    # fewer values than KLL_K: no compaction, so quartiles are exact too
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"x": rng.normal(size=180), "k": rng.choice(list("abc"), 180)})
+    df.loc[::7, "x"] = np.nan
+    parts = []
+    for seed, rows in enumerate(np.array_split(np.arange(len(df)), 3)):
+        parts.append(pickle.loads(pickle.dumps(HealthSketch(seed=seed).update(df.iloc[rows]))))
+    merged = parts[0].merge(parts[1]).merge(parts[2])
+    est, exact = merged.stats(), fused_column_stats(df)
+    cols = ["count", "nulls", "distinct", "min", "q1", "median", "q3", "max", "iqr_outliers"]
+    pd.testing.assert_frame_equal(est.loc[["x"], cols], exact.loc[["x"], cols],
+                                  check_dtype=False)
+    assert est.loc["k", "distinct"] == 3
+    assert est.loc["x", "mean"] == pytest.approx(exact.loc["x", "mean"], rel=1e-12)
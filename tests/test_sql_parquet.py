@@ -0,0 +1,48 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.Stage_1_Ingestion.DataCollector import DataCollector
+
+
+@pytest.fixture
+def events_db(tmp_path):
+    """3 500 rows: the first 1 000 have 3 levels and small ints, later ones 300+ levels."""
+    n = 3_500
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "qty": np.where(np.arange(n) < 1_000, np.arange(n) % 100, np.arange(n) * 7),
+        "level": [["lo", "mid", "hi"][i % 3] if i < 1_000 else f"lvl{i % 300}" for i in range(n)],
+        "price": rng.normal(100, 5, n).round(2),
+        "note": [None] * 1_000 + [f"note {i}" for i in range(n - 1_000)],
+    })
+    db = tmp_path / "events.sqlite"
+    with sqlite3.connect(db) as conn:
+        df.to_sql("events", conn, index=False)
+    return f"sqlite:///{db}", df
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_sql_to_parquet_round_trip_over_many_chunks(events_db, tmp_path, compact):
+    dsn, expected = events_db
+    out = tmp_path / "events.parquet"
+    collector = DataCollector(validate=False, pii_mask=False, compact=compact)
+    rows = collector.read_sql_to_parquet(dsn, "select * from events order by id",
+                                         str(out), chunksize=1_000)
+    assert rows == len(expected)
+    assert pq.ParquetFile(out).metadata.num_row_groups == 4
+    level = pq.read_schema(out).field("level").type
+    assert pa.types.is_dictionary(level) and level.index_type == pa.int32()
+
+    back = pd.read_parquet(out)
+    assert back["id"].tolist() == expected["id"].tolist()
+    assert back["qty"].tolist() == expected["qty"].tolist()
+    assert back["level"].astype(object).tolist() == expected["level"].tolist()
+    np.testing.assert_allclose(back["price"].to_numpy(dtype=float), expected["price"])
+    assert back["note"].isna().sum() == 1_000
+    assert back["note"].dropna().tolist() == expected["note"].dropna().tolist()
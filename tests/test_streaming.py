@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.Stage_1_Ingestion.DataCollector import DataCollector, RowHashAudit
+
+
+@pytest.fixture
+def drifting_csv(tmp_path):
+    """
+    First 400 rows: clean integers and 3 levels. Later rows: half the
+    `amount` cells are text, and `level` gains values — per-chunk inference
+    would flip amount to a string type and level to object.
+    """
+    rng = np.random.default_rng(0)
+    head = pd.DataFrame({"amount": rng.integers(0, 50, 400).astype(str),
+                         "level": rng.choice(["lo", "mid", "hi"], 400),
+                         "flag": rng.choice(["yes", "no"], 400)})
+    tail = pd.DataFrame({"amount": [str(i % 50) if i % 2 else f"n/a-{i}" for i in range(600)],
+                         "level": [f"lvl{i}" if i % 3 == 0 else "mid" for i in range(600)],
+                         "flag": ["yes", "no", None] * 200})
+    tail = pd.concat([tail, head.iloc[:100]], ignore_index=True)   # exact duplicates
+    path = tmp_path / "drift.csv"
+    pd.concat([head, tail], ignore_index=True).to_csv(path, index=False)
+    return str(path)
+
+
+def test_every_chunk_gets_the_first_chunks_dtypes(drifting_csv):
+    collector = DataCollector(validate=False, pii_mask=False)
+    chunks = list(collector.read_file_iter(drifting_csv, chunk_rows=200))
+    assert len(chunks) == 6
+    first = chunks[0].dtypes
+    assert str(first["amount"]) == "Int64" and str(first["flag"]) == "boolean"
+    assert isinstance(first["level"], pd.CategoricalDtype)
+    for chunk in chunks[1:]:
+        assert str(chunk["amount"].dtype) == "Int64"
+        assert str(chunk["flag"].dtype) == "boolean"
+        cats = chunk["level"].cat.categories
+        assert list(cats[:3]) == list(first["level"].categories)   # codes stay stable
+    assert chunks[-1]["amount"].notna().all()
+    assert chunks[3]["amount"].isna().sum() == 100                 # "n/a-…" coerced
+
+
+def test_stream_audit_counts_duplicates_across_chunks(drifting_csv):
+    collector = DataCollector(validate=False, pii_mask=False)
+    chunks = list(collector.read_file_iter(drifting_csv, chunk_rows=200))
+    combined = pd.concat([c.astype({"level": object}) for c in chunks], ignore_index=True)
+    assert collector.audit_report["rows"] == len(combined) == 1_100
+    assert collector.audit_report["duplicates"] == int(combined.duplicated().sum())
+    assert collector.audit_report["duplicates"] >= 100
+    assert collector.audit_report["sha256"] == RowHashAudit.from_frame(combined).checksum
+
+
+def test_stream_compaction_plan_is_fixed(tmp_path):
+    n = 1_000
+    df = pd.DataFrame({"n": np.r_[np.arange(200) % 100, np.arange(800) + 1_000],
+                       "city": np.where(np.arange(n) % 2, "x", "y")})
+    path = tmp_path / "ints.csv"
+    df.to_csv(path, index=False)
+    collector = DataCollector(validate=False, pii_mask=False, compact=True)
+    chunks = list(collector.read_file_iter(str(path), chunk_rows=200))
+    assert {str(c["n"].dtype) for c in chunks} == {"Int64"}        # no per-chunk downcast
+    assert all(isinstance(c["city"].dtype, pd.CategoricalDtype) for c in chunks)
+    assert pd.concat(chunks)["n"].tolist() == df["n"].tolist()